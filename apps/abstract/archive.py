@@ -0,0 +1,107 @@
+# Archival of soft-deleted rows.
+#
+# Rows soft-deleted before a cutoff are copied into ArchivedRow (together with
+# the reverse relations listed by their policy) and then hard-deleted.
+# Work is done in bounded batches: candidates are walked by primary key
+# (keyset, no OFFSET) and every batch is its own short transaction,
+# so the purge can run next to live traffic.
+
+# Python modules
+import datetime
+from dataclasses import dataclass
+from typing import Iterator
+
+# Django modules
+from django.core import serializers
+from django.db import transaction
+from django.db.models import Model, QuerySet
+from django.utils import timezone
+
+# Project modules
+from apps.abstract.models import ArchivedRow
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    """How soft-deleted rows of one AbstractModel are archived and purged"""
+    model: type[Model]
+    # reverse relations archived and deleted along with the row; deleted
+    # through their own delete() so denormalized counters stay right
+    related: tuple[str, ...] = ()
+    # reverse relations that keep the row in place while they are not empty
+    keep_if: tuple[str, ...] = ()
+    # fields not copied into the archive
+    exclude: tuple[str, ...] = ()
+
+    @property
+    def label(self) -> str:
+        return self.model._meta.label
+
+    def candidates(self, cutoff: datetime.datetime) -> QuerySet:
+        queryset = self.model.all_objects.filter(delete_at__lt=cutoff)
+        for name in self.keep_if:
+            queryset = queryset.filter(**{f'{name}__isnull': True})
+        return queryset
+
+
+def snapshot(instances: list[Model], exclude: tuple[str, ...] = ()) -> list[ArchivedRow]:
+    """ArchivedRow for every instance, fields serialized as for a fixture"""
+    now = timezone.now()
+    rows = []
+    for instance, item in zip(instances, serializers.serialize('python', instances)):
+        data = {name: value for name, value in item['fields'].items() if name not in exclude}
+        rows.append(ArchivedRow(
+            model_label=instance._meta.label,
+            object_id=instance.pk,
+            data=data,
+            deleted_at=getattr(instance, 'delete_at', None),
+            archived_at=now,
+        ))
+    return rows
+
+
+def purge_soft_deleted(
+    policy: ArchivePolicy,
+    cutoff: datetime.datetime,
+    batch_size: int,
+    dry_run: bool = False,
+) -> Iterator[int]:
+    """
+    Archive and hard-delete rows of policy.model soft-deleted before cutoff.
+    Yields the number of rows purged per batch.
+    """
+    queryset = policy.candidates(cutoff)
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1]
+        if dry_run:
+            yield len(batch)
+            continue
+        with transaction.atomic():
+            # re-checked under lock: the row may have been restored meanwhile
+            rows = list(
+                queryset.filter(pk__in=batch).select_for_update(of=('self',)).order_by('pk')
+            )
+            if not rows:
+                continue
+            archived = snapshot(rows, policy.exclude)
+            related = []
+            for name in policy.related:
+                relation = policy.model._meta.get_field(name)
+                related.extend(
+                    relation.related_model._base_manager.filter(
+                        **{f'{relation.field.name}__in': rows}
+                    ).order_by('pk')
+                )
+            archived.extend(snapshot(related))
+            ArchivedRow.objects.bulk_create(archived)
+
+            for instance in related:
+                instance.delete()
+            policy.model.all_objects.filter(pk__in=[row.pk for row in rows]).delete()
+        yield len(rows)
@@ -0,0 +1,106 @@
+# Helpers shared by the benchmark management commands
+# (seed_scale, bench_api, bench_channel_list, ...).
+
+# Python modules
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
+
+# Django modules
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+T = TypeVar("T")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0..100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+@dataclass
+class Measurement:
+    p50_ms: float
+    p95_ms: float
+    queries: int
+    bytes: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def measure(call: Callable[[], object], repeat: int, warmup: int = 1) -> Measurement:
+    """
+    Run `call` warmup + repeat times. `call` returns an HttpResponse
+    (or anything with .content); queries and size come from the last run.
+    """
+    for _ in range(warmup):
+        call()
+
+    timings = []
+    queries = 0
+    size = 0
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = call()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(captured.captured_queries)
+        size = len(getattr(response, "content", b""))
+
+    return Measurement(
+        p50_ms=round(percentile(timings, 50), 2),
+        p95_ms=round(percentile(timings, 95), 2),
+        queries=queries,
+        bytes=size,
+    )
+
+
+def load_baseline(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def write_baseline(path: Path, results: dict[str, Measurement]) -> None:
+    data = {name: result.as_dict() for name, result in results.items()}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(
+    results: dict[str, Measurement],
+    baseline: dict,
+    threshold: float,
+    min_delta_ms: float = 5.0,
+) -> list[str]:
+    """
+    A result regresses when it runs more queries than the baseline, or its
+    p95 is above baseline * (1 + threshold) by more than min_delta_ms
+    (sub-millisecond noise is ignored).
+    """
+    problems = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result.queries > previous["queries"]:
+            problems.append(f"{name}: queries {previous['queries']} -> {result.queries}")
+        limit = previous["p95_ms"] * (1 + threshold)
+        if result.p95_ms > limit and result.p95_ms - previous["p95_ms"] > min_delta_ms:
+            problems.append(f"{name}: p95 {previous['p95_ms']}ms -> {result.p95_ms}ms")
+    return problems
@@ -0,0 +1,21 @@
+# Cache backend capabilities.
+#
+# Data that must be invalidated everywhere at once (resolved users, access
+# sets) is only cached across requests when every worker sees the same
+# cache. The default backend (no CACHES configured) is a per-process
+# LocMemCache: an invalidation made in one worker would not reach the others.
+
+# Django modules
+from django.conf import settings
+
+# backends whose entries are not visible to other worker processes
+PROCESS_LOCAL_BACKENDS = frozenset({
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+})
+
+
+def is_shared_cache(alias: str = "default") -> bool:
+    """True when the cache alias is shared by all worker processes"""
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    return backend is not None and backend not in PROCESS_LOCAL_BACKENDS
@@ -0,0 +1,267 @@
+# Sparse fieldsets and expansion control for read serializers.
+#
+#   ?fields=id,name     - only these top-level fields are built and evaluated
+#   ?expand=members     - expandable relations listed here are rendered as
+#                         nested objects, the others collapse to primary keys;
+#                         without ?expand everything is expanded (as before),
+#                         an empty ?expand= collapses everything
+#
+# The queryset is planned from the fields that remain: nested serializers
+# become select_related/prefetch_related, plain and dotted sources become
+# only() columns. SerializerMethodFields declare what they read in
+# `field_requirements`; a method field without one disables only().
+
+# Python modules
+from dataclasses import dataclass, field as dataclass_field
+from typing import Callable
+
+# Django modules
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+
+# Rest modules
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import Field, SerializerMethodField
+from rest_framework.relations import ManyRelatedField
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
+
+
+@dataclass(frozen=True)
+class Requires:
+    """ORM needs of one serializer field, relative to the serializer's model"""
+    only: tuple[str, ...] = ()
+    select_related: tuple[str, ...] = ()
+    prefetch_related: tuple[str | Prefetch, ...] = ()
+
+
+@dataclass(frozen=True)
+class Collapsed:
+    """Primary-key stand-in for an expandable field and what it reads"""
+    field: Callable[[], Field]
+    requires: Requires | None = None
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    fields: frozenset[str] | None = None   # None - all fields
+    expand: frozenset[str] | None = None   # None - all expandable fields
+
+    def includes(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def expands(self, name: str) -> bool:
+        return self.expand is None or name in self.expand
+
+    @classmethod
+    def from_request(
+        cls,
+        request: Request,
+        serializer_class: type[BaseSerializer],
+        expandable: tuple[str, ...] | None = None,
+    ) -> 'Fieldset':
+        """
+        Parse ?fields= and ?expand= against serializer_class;
+        unknown names raise ValidationError (400).
+        `expandable` overrides the serializer's expandable_fields
+        (e.g. side-loaded sections of a list response).
+        """
+        fields = _parse(request.query_params.get(FIELDS_QUERY_PARAM))
+        expand = _parse(request.query_params.get(EXPAND_QUERY_PARAM))
+        available = set(serializer_class().fields)
+        if expandable is None:
+            expandable = tuple(
+                name for name in getattr(serializer_class, 'expandable_fields', {})
+                if name in available
+            )
+
+        errors = {}
+        if fields:
+            unknown = fields - available
+            if unknown:
+                errors[FIELDS_QUERY_PARAM] = f"Unknown field(s): {', '.join(sorted(unknown))}."
+        if expand:
+            unknown = expand - set(expandable)
+            if unknown:
+                errors[EXPAND_QUERY_PARAM] = (
+                    f"Cannot expand: {', '.join(sorted(unknown))}. "
+                    f"Expandable: {', '.join(expandable) or 'none'}."
+                )
+        if errors:
+            raise ValidationError(errors)
+
+        return cls(fields=fields or None, expand=expand)
+
+
+def fieldset_parameters(expandable: tuple[str, ...] = ()) -> list[OpenApiParameter]:
+    """OpenAPI parameters for ?fields= (and ?expand= when something is expandable)"""
+    parameters = [
+        OpenApiParameter(
+            FIELDS_QUERY_PARAM, OpenApiTypes.STR,
+            description='Comma separated fields to return (default: all)',
+        ),
+    ]
+    if expandable:
+        parameters.append(OpenApiParameter(
+            EXPAND_QUERY_PARAM, OpenApiTypes.STR,
+            description=(
+                f"Relations rendered as objects: {', '.join(expandable)} "
+                "(default: all; the rest collapse to ids)"
+            ),
+        ))
+    return parameters
+
+
+def _parse(raw: str | None) -> frozenset[str] | None:
+    if raw is None:
+        return None
+    return frozenset(part.strip() for part in raw.split(',') if part.strip())
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin: SomeSerializer(data, many=True, fieldset=fieldset)
+    builds only the requested fields, and
+    SomeSerializer.optimize_queryset(queryset, fieldset) loads only what they read.
+    """
+
+    # field name -> what a SerializerMethodField (or other opaque field) reads
+    field_requirements: dict[str, Requires] = {}
+    # field name -> its collapsed form when not listed in ?expand=
+    expandable_fields: dict[str, Collapsed] = {}
+
+    def __init__(self, *args, fieldset: Fieldset | None = None, **kwargs):
+        self.fieldset = fieldset
+        self.collapsed_fields: set[str] = set()
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self) -> dict[str, Field]:
+        fields = super().get_fields()
+        if self.fieldset is None:
+            return fields
+
+        fields = {name: field for name, field in fields.items() if self.fieldset.includes(name)}
+        for name, collapsed in self.expandable_fields.items():
+            if name in fields and not self.fieldset.expands(name):
+                fields[name] = collapsed.field()
+                self.collapsed_fields.add(name)
+        return fields
+
+    def get_requirements(self, name: str) -> Requires | None:
+        if name in self.collapsed_fields:
+            return self.expandable_fields[name].requires
+        return self.field_requirements.get(name)
+
+    @classmethod
+    def optimize_queryset(
+        cls,
+        queryset: QuerySet,
+        fieldset: Fieldset | None = None,
+        keep: tuple[str, ...] = (),
+        related: tuple[str, ...] = (),
+    ) -> QuerySet:
+        """
+        select_related/prefetch_related/only() for the fields this fieldset keeps.
+        `keep` - extra columns the view reads (ordering keys, access checks),
+        `related` - relations the view reads as whole objects (select_related).
+        """
+        plan = _Plan(annotations=set(queryset.query.annotations))
+        plan.collect(cls(fieldset=fieldset), '')
+
+        select_related = [*plan.select_related, *related]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if plan.prefetch_related:
+            queryset = queryset.prefetch_related(*plan.prefetch_related)
+        if not plan.restrict:
+            return queryset
+
+        only = [*plan.only, *keep]
+        # a relation with none of its columns listed is loaded whole;
+        # listing its first hop does that for every model along the path
+        only.extend(path.split('__')[0] for path in related)
+        only.extend(
+            path for path in plan.select_related
+            if not any(name.startswith(f'{path}__') for name in only)
+        )
+        return queryset.only(*only)
+
+
+@dataclass
+class _Plan:
+    annotations: set[str]
+    only: list[str] = dataclass_field(default_factory=list)
+    select_related: list[str] = dataclass_field(default_factory=list)
+    prefetch_related: list[str | Prefetch] = dataclass_field(default_factory=list)
+    restrict: bool = True
+
+    def add(self, requires: Requires, prefix: str) -> None:
+        self.only.extend(prefix + name for name in requires.only)
+        self.select_related.extend(prefix + name for name in requires.select_related)
+        for lookup in requires.prefetch_related:
+            if isinstance(lookup, Prefetch):
+                lookup = Prefetch(prefix + lookup.prefetch_through, queryset=lookup.queryset)
+            else:
+                lookup = prefix + lookup
+            self.prefetch_related.append(lookup)
+
+    def collect(self, serializer: BaseSerializer, prefix: str) -> None:
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        if model is None:
+            self.restrict = False
+            return
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            requires = None
+            if isinstance(serializer, SparseFieldsMixin):
+                requires = serializer.get_requirements(name)
+            if requires is not None:
+                self.add(requires, prefix)
+                continue
+
+            if field.source == '*' or isinstance(field, SerializerMethodField):
+                self.restrict = False
+                continue
+
+            path = '__'.join(field.source_attrs)
+            if isinstance(field, (ListSerializer, ManyRelatedField)):
+                self.prefetch_related.append(prefix + path)
+            elif isinstance(field, BaseSerializer):
+                self.select_related.append(prefix + path)
+                self.collect(field, f'{prefix}{path}__')
+            elif not prefix and path in self.annotations:
+                continue
+            else:
+                related = _related_path(model, field.source_attrs)
+                if related is None:
+                    self.restrict = False
+                    continue
+                self.select_related.extend(prefix + lookup for lookup in related)
+                self.only.append(prefix + path)
+
+
+def _related_path(model: type[Model], attrs: list[str]) -> list[str] | None:
+    """
+    ['team', 'name'] -> ['team']: forward FK hops to select_related before a
+    concrete column; None if the source is not a plain column
+    """
+    related = []
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if index == len(attrs) - 1:
+            return related if field.concrete and not field.many_to_many else None
+        if not field.concrete or not (field.many_to_one or field.one_to_one):
+            return None
+        related.append('__'.join(attrs[:index + 1]))
+        model = field.related_model
+    return None
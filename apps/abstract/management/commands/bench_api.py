@@ -0,0 +1,159 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.abstract.benchmark import (
+    Measurement,
+    find_regressions,
+    load_baseline,
+    measure,
+    write_baseline,
+)
+from apps.assigments.models import Assignments
+from apps.channels.models import Channel
+from apps.messages.models import Message
+from apps.team.models import Team
+from apps.users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the list/detail API endpoints in-process (APIClient) and record "
+        "p50/p95 latency, query count and payload size per endpoint. "
+        "Compares against a JSON baseline and fails on regressions. "
+        "Run on a dataset from seed_scale."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            default="scale-000000@example.com",
+            help="Email of the user making the requests (seed_scale's staff user)",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--baseline",
+            default="benchmarks/api_baseline.json",
+            help="Baseline file, relative to BASE_DIR",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write this run as the new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed p95 slowdown against the baseline (0.25 = +25%%)",
+        )
+        parser.add_argument(
+            "--min-delta",
+            type=float,
+            default=5.0,
+            help="p95 changes below this many ms are treated as noise",
+        )
+        parser.add_argument(
+            "--only",
+            default="",
+            help="Comma separated substrings; run only matching endpoints",
+        )
+
+    def handle(self, *args, **options):
+        user = CustomUser.objects.filter(email=options["user"]).first()
+        if user is None:
+            raise CommandError(f"No user {options['user']!r}; run seed_scale first")
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        endpoints = self.endpoints(user)
+        if options["only"]:
+            wanted = [part for part in options["only"].split(",") if part]
+            endpoints = {
+                name: url for name, url in endpoints.items()
+                if any(part in name for part in wanted)
+            }
+
+        results: dict[str, Measurement] = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for name, url in endpoints.items():
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"{name}: GET {url} returned {response.status_code}")
+                result = measure(lambda: client.get(url), options["repeat"], options["warmup"])
+                results[name] = result
+                self.stdout.write(
+                    f"{name:<28} p50={result.p50_ms:>8.1f}ms p95={result.p95_ms:>8.1f}ms "
+                    f"queries={result.queries:<4} bytes={result.bytes}"
+                )
+
+        path = Path(options["baseline"])
+        if not path.is_absolute():
+            path = Path(settings.BASE_DIR) / path
+
+        if options["update_baseline"]:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            baseline = load_baseline(path)
+            write_baseline(path, {
+                **{name: Measurement(**data) for name, data in baseline.items()},
+                **results,
+            })
+            self.stdout.write(self.style.SUCCESS(f"Baseline written: {path}"))
+            return
+
+        baseline = load_baseline(path)
+        if not baseline:
+            self.stdout.write(self.style.WARNING(
+                f"No baseline at {path}; run with --update-baseline to create one"
+            ))
+            return
+
+        regressions = find_regressions(
+            results, baseline, options["threshold"], options["min_delta"]
+        )
+        if regressions:
+            raise CommandError("Regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
+
+    def endpoints(self, user: CustomUser) -> dict[str, str]:
+        """Name -> URL; ids are picked from the user's first team"""
+        team = Team.objects.filter(team_memberships__user=user).order_by("id").first()
+        if team is None:
+            raise CommandError(f"{user.email} is not a member of any team")
+        channel = Channel.objects.filter(
+            team=team, is_private=False
+        ).order_by("id").first()
+        if channel is None:
+            raise CommandError(f"Team {team.id} has no public channel")
+        message = Message.objects.filter(
+            channel=channel, parent_message__isnull=True, deleted_at__isnull=True
+        ).order_by("-reply_count", "id").first()
+        if message is None:
+            raise CommandError(f"Channel {channel.id} has no messages")
+        assignment = Assignments.objects.filter(team_id=team).order_by("id").first()
+
+        endpoints = {
+            "teams.list": "/api/teams/",
+            "teams.retrieve": f"/api/teams/{team.id}/",
+            "teams.members": f"/api/teams/{team.id}/members/",
+            "teams.search": f"/api/teams/?q={team.name[:4]}",
+            "channels.list": f"/api/channels/?team_id={team.id}",
+            "channels.retrieve": f"/api/channels/{channel.id}/",
+            "messages.list": f"/api/messages/?channel={channel.id}",
+            "messages.retrieve": f"/api/messages/{message.id}/",
+            "messages.thread": f"/api/messages/{message.id}/thread/",
+            "messages.sync": f"/api/messages/sync/?channel={channel.id}",
+            "messages.search": "/api/messages/search/?q=deploy",
+            "messages.unread": "/api/messages/unread/",
+            "assignments.list": "/api/assignment/",
+        }
+        if user.is_staff:
+            endpoints["users.search"] = "/api/users/?search=re"
+        if assignment is not None:
+            endpoints["assignments.retrieve"] = f"/api/assignment/{assignment.id}/"
+        return endpoints
@@ -0,0 +1,84 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.abstract.benchmark import percentile
+from apps.abstract.parsers import FastJSONParser
+from apps.abstract.renderers import FastJSONRenderer, orjson
+from apps.messages.models import Message
+from apps.messages.serializers import MessageSerializer
+from apps.team.models import Team
+from apps.team.serializers import TeamSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare JSON render/parse throughput of DRF's stdlib JSONRenderer/JSONParser "
+        "and FastJSONRenderer/FastJSONParser on MessageSerializer and TeamSerializer "
+        "payloads built from the current database (see seed_scale)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=500, help="Rows in the message payload")
+        parser.add_argument("--teams", type=int, default=50, help="Rows in the team payload")
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                "orjson is not installed: FastJSONRenderer falls back to stdlib json"
+            ))
+
+        messages = list(
+            Message.objects.select_related(
+                "author", "channel__team"
+            ).order_by("id")[:options["messages"]]
+        )
+        teams = list(
+            Team.objects.select_related("owner").prefetch_related(
+                "members"
+            ).order_by("id")[:options["teams"]]
+        )
+        if not messages or not teams:
+            raise CommandError("No messages/teams to serialize; run seed_scale first")
+
+        payloads = {
+            f"MessageSerializer x{len(messages)}": {
+                "message": "Messages",
+                "data": MessageSerializer(messages, many=True).data,
+            },
+            f"TeamSerializer x{len(teams)}": {
+                "message": "Teams",
+                "data": TeamSerializer(teams, many=True).data,
+            },
+        }
+
+        for name, payload in payloads.items():
+            self.stdout.write(name)
+            body = JSONRenderer().render(payload)
+            if FastJSONParser().parse(io.BytesIO(body)) != JSONParser().parse(io.BytesIO(body)):
+                raise CommandError(f"{name}: parsers disagree")
+
+            for label, call in (
+                ("render stdlib", lambda: JSONRenderer().render(payload)),
+                ("render fast", lambda: FastJSONRenderer().render(payload)),
+                ("parse stdlib", lambda: JSONParser().parse(io.BytesIO(body))),
+                ("parse fast", lambda: FastJSONParser().parse(io.BytesIO(body))),
+            ):
+                self.report(label, call, len(body), options["repeat"])
+
+    def report(self, label: str, call, size: int, repeat: int) -> None:
+        call()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+        p50 = percentile(timings, 50)
+        self.stdout.write(
+            f"  {label:<14} p50={p50 * 1000:>8.2f}ms p95={percentile(timings, 95) * 1000:>8.2f}ms "
+            f"{size / p50 / 1024 / 1024:>8.1f} MB/s ({size} bytes)"
+        )
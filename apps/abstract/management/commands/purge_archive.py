@@ -0,0 +1,107 @@
+import datetime
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.abstract.archive import ArchivePolicy, purge_soft_deleted
+from apps.assigments.models import Assignments
+from apps.channels.models import Channel
+from apps.messages.archive import archive_aged_messages, archive_deleted_channel_messages
+from apps.users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+# order matters: channels lose their messages first, users go last
+# (a user is kept while anything still points at them)
+POLICIES = (
+    ArchivePolicy(
+        Channel,
+        related=("channel_memberships",),
+        keep_if=("channel_messages",),
+    ),
+    ArchivePolicy(
+        Assignments,
+        related=("submissions",),
+    ),
+    ArchivePolicy(
+        CustomUser,
+        related=("user_memberships", "channel_memberships"),
+        keep_if=("author_messages", "archived_messages", "owned_teams", "student"),
+        exclude=("password",),
+    ),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move aged threads to the message archive and purge soft-deleted rows "
+        "older than the retention window into ArchivedRow, in bounded batches. "
+        "With --every it keeps running as a scheduler job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.ARCHIVE_SOFT_DELETED_AFTER_DAYS,
+            help="Purge rows soft-deleted more than this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ARCHIVE_BATCH_SIZE,
+            help="Rows (thread roots for messages) per transaction",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches, to throttle the purge",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Count only, change nothing")
+        parser.add_argument(
+            "--every",
+            type=int,
+            default=0,
+            help="Repeat every N seconds (0 - run once)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.run_once(options)
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
+
+    def run_once(self, options) -> None:
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        deleted_before = timezone.now() - datetime.timedelta(days=options["retention_days"])
+        verb = "Would archive" if dry_run else "Archived"
+
+        archived = 0
+        for team_id, count in archive_aged_messages(batch_size, dry_run):
+            archived += count
+            self.pause(options)
+        for count in archive_deleted_channel_messages(deleted_before, batch_size, dry_run):
+            archived += count
+            self.pause(options)
+        self.stdout.write(f"{verb} {archived} messages")
+        logger.info("Messages archived: count=%s dry_run=%s", archived, dry_run)
+
+        for policy in POLICIES:
+            purged = 0
+            for count in purge_soft_deleted(policy, deleted_before, batch_size, dry_run):
+                purged += count
+                self.pause(options)
+            self.stdout.write(f"{verb} {purged} soft-deleted {policy.label} rows")
+            logger.info("Soft-deleted rows purged: model=%s count=%s dry_run=%s", policy.label, purged, dry_run)
+
+        self.stdout.write(self.style.SUCCESS("Archive pass done"))
+
+    def pause(self, options) -> None:
+        if options["pause"]:
+            time.sleep(options["pause"])
@@ -0,0 +1,42 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.abstract.search import SearchKeyMixin
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute search_key of all searchable models in batches "
+        "(after bulk imports or QuerySet.update() of the source columns)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        models = [
+            model for model in apps.get_models()
+            if issubclass(model, SearchKeyMixin)
+        ]
+        for model in models:
+            sources = model.search_key_sources
+            queryset = model._base_manager.only("pk", "search_key", *sources).order_by("pk")
+            last_pk = 0
+            changed = 0
+            while True:
+                batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+                if not batch:
+                    break
+                stale = []
+                for row in batch:
+                    key = row.build_search_key()
+                    if key != row.search_key:
+                        row.search_key = key
+                        stale.append(row)
+                with transaction.atomic():
+                    model._base_manager.bulk_update(stale, ["search_key"])
+                changed += len(stale)
+                last_pk = batch[-1].pk
+            self.stdout.write(f"{model._meta.label}: {changed} search keys updated")
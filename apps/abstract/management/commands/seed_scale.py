@@ -0,0 +1,258 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.abstract.benchmark import batched
+from apps.abstract.search import build_search_key
+from apps.assigments.models import Assignment_Submissions, Assignments
+from apps.channels.models import Channel, ChannelMembership
+from apps.messages.models import ChannelReadState, Message
+from apps.messages.search import get_search_backend
+from apps.team.models import Team, TeamMembership
+from apps.users.models import CustomUser
+
+WORDS = (
+    "deploy review release sprint standup backlog ticket bug fix merge branch "
+    "schedule meeting lunch design api database cache latency report draft "
+    "homework lecture exam grade deadline question answer thanks please update"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large deterministic dataset with bulk_create for benchmarks "
+        "(see bench_api). Use a dedicated database, e.g. DB_NAME=bench.sqlite3."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--teams", type=int, default=50)
+        parser.add_argument("--members-per-team", type=int, default=100)
+        parser.add_argument("--channels-per-team", type=int, default=20)
+        parser.add_argument(
+            "--private-ratio",
+            type=float,
+            default=0.2,
+            help="Share of private channels; half of the team joins each of them",
+        )
+        parser.add_argument("--messages-per-channel", type=int, default=200)
+        parser.add_argument(
+            "--reply-ratio",
+            type=float,
+            default=0.3,
+            help="Share of messages posted as thread replies",
+        )
+        parser.add_argument("--assignments-per-team", type=int, default=10)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument(
+            "--prefix",
+            default="scale",
+            help="Email/name prefix of generated rows",
+        )
+
+    def handle(self, *args, **options):
+        if options["members_per_team"] > options["users"]:
+            raise CommandError("--members-per-team cannot exceed --users")
+        if CustomUser.objects.filter(email__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(
+                f"Rows with prefix {options['prefix']!r} already exist; "
+                "use another --prefix or a fresh database"
+            )
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            users = self.seed_users(options)
+            teams = self.seed_teams(options, users)
+            members = self.seed_team_memberships(options, teams, users)
+            channels = self.seed_channels(options, teams, members)
+            self.seed_read_states(channels, members)
+            self.seed_messages(options, channels, members)
+            self.seed_assignments(options, teams, members)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded; benchmark user: {users[0].email} (staff)"
+        ))
+
+    def bulk_create(self, model, rows: list) -> list:
+        created = []
+        for batch in batched(rows, self.batch_size):
+            created.extend(model.objects.bulk_create(batch))
+        self.stdout.write(f"{model.__name__}: {len(created)}")
+        return created
+
+    def sentence(self, low: int = 3, high: int = 20) -> str:
+        return " ".join(self.rng.choices(WORDS, k=self.rng.randint(low, high)))
+
+    def seed_users(self, options) -> list[CustomUser]:
+        # hashing is deliberately slow: hash once, share it
+        password = make_password("password123")
+        prefix = options["prefix"]
+        users = []
+        for i in range(options["users"]):
+            user = CustomUser(
+                email=f"{prefix}-{i:06d}@example.com",
+                first_name=f"{self.rng.choice(WORDS).title()}{i}",
+                last_name=self.rng.choice(WORDS).title(),
+                password=password,
+                is_staff=i == 0,
+            )
+            user.search_key = user.build_search_key()
+            users.append(user)
+        return self.bulk_create(CustomUser, users)
+
+    def seed_teams(self, options, users: list[CustomUser]) -> list[Team]:
+        teams = []
+        for i in range(options["teams"]):
+            name = f"{options['prefix']} team {i:04d}"
+            teams.append(Team(
+                name=name,
+                description=self.sentence(),
+                # user 0 owns team 0 and is a member everywhere (see below)
+                owner=users[0] if i == 0 else self.rng.choice(users),
+                member_count=options["members_per_team"],
+                search_key=build_search_key(name),
+            ))
+        return self.bulk_create(Team, teams)
+
+    def seed_team_memberships(self, options, teams, users) -> dict[int, list[CustomUser]]:
+        """team id -> members; the benchmark user belongs to every team"""
+        members = {}
+        rows = []
+        for team in teams:
+            sample = [users[0], *self.rng.sample(users[1:], options["members_per_team"] - 1)]
+            members[team.id] = sample
+            rows.extend(
+                TeamMembership(
+                    team=team,
+                    user=user,
+                    role="admin" if index < 2 else "member",
+                )
+                for index, user in enumerate(sample)
+            )
+        self.bulk_create(TeamMembership, rows)
+        return members
+
+    def seed_channels(self, options, teams, members) -> list[Channel]:
+        private_every = round(1 / options["private_ratio"]) if options["private_ratio"] else 0
+        private_size = max(1, options["members_per_team"] // 2)
+        channels = []
+        for team in teams:
+            for i in range(options["channels_per_team"]):
+                name = "general" if i == 0 else f"channel-{i:04d}"
+                is_private = bool(private_every) and i > 0 and i % private_every == 0
+                channels.append(Channel(
+                    team=team,
+                    name=name,
+                    description=self.sentence(),
+                    is_private=is_private,
+                    member_count=private_size if is_private else 0,
+                    search_key=build_search_key(name),
+                ))
+        channels = self.bulk_create(Channel, channels)
+
+        self.bulk_create(ChannelMembership, [
+            ChannelMembership(channel=channel, user=user)
+            for channel in channels if channel.is_private
+            for user in members[channel.team_id][:private_size]
+        ])
+        return channels
+
+    def audience(self, channel: Channel, members) -> list[CustomUser]:
+        team_members = members[channel.team_id]
+        if channel.is_private:
+            return team_members[:channel.member_count]
+        return team_members
+
+    def seed_read_states(self, channels, members) -> None:
+        self.bulk_create(ChannelReadState, [
+            ChannelReadState(user=user, channel=channel)
+            for channel in channels
+            for user in self.audience(channel, members)
+        ])
+
+    def seed_messages(self, options, channels, members) -> None:
+        backend = get_search_backend()
+        per_channel = options["messages_per_channel"]
+        total = 0
+        for channel_batch in batched(channels, max(1, self.batch_size // max(per_channel, 1))):
+            roots = []
+            for channel in channel_batch:
+                audience = self.audience(channel, members)
+                roots.extend(
+                    Message(
+                        channel=channel,
+                        author=self.rng.choice(audience),
+                        content=self.sentence(),
+                    )
+                    for _ in range(round(per_channel * (1 - options["reply_ratio"])))
+                )
+            roots = Message.objects.bulk_create(roots)
+
+            by_channel: dict[int, list[Message]] = {}
+            for message in roots:
+                by_channel.setdefault(message.channel_id, []).append(message)
+
+            replies = []
+            for channel in channel_batch:
+                parents = by_channel.get(channel.id)
+                if not parents:
+                    continue
+                audience = self.audience(channel, members)
+                # skewed: a few long threads, like real chats
+                for _ in range(per_channel - len(parents)):
+                    parent = parents[min(int(self.rng.expovariate(0.2)), len(parents) - 1)]
+                    parent.reply_count += 1
+                    replies.append(Message(
+                        channel=channel,
+                        author=self.rng.choice(audience),
+                        content=self.sentence(),
+                        parent_message=parent,
+                    ))
+            replies = Message.objects.bulk_create(replies)
+            Message.objects.bulk_update(
+                [message for message in roots if message.reply_count],
+                ["reply_count"],
+                batch_size=self.batch_size,
+            )
+            backend.index_messages([*roots, *replies])
+            total += len(roots) + len(replies)
+
+        self.stdout.write(f"Message: {total}")
+
+    def seed_assignments(self, options, teams, members) -> None:
+        today = timezone.localdate()
+        assignments = self.bulk_create(Assignments, [
+            Assignments(
+                team_id=team,
+                title=f"Assignment {i + 1}",
+                description=self.sentence(10, 40),
+                due_data=today + timedelta(days=self.rng.randint(-30, 30)),
+                max_points=self.rng.choice((10, 20, 50, 100)),
+            )
+            for team in teams
+            for i in range(options["assignments_per_team"])
+        ])
+
+        now = timezone.now()
+        rows = []
+        for assignment in assignments:
+            for user in members[assignment.team_id_id]:
+                submitted = self.rng.random() < 0.6
+                rows.append(Assignment_Submissions(
+                    assigment=assignment,
+                    student_id=user,
+                    status="completed" if submitted else "upcoming",
+                    submitted=submitted,
+                    submitted_at=now if submitted else None,
+                    points_awarded=(
+                        self.rng.randint(0, assignment.max_points) if submitted else 0.0
+                    ),
+                ))
+        self.bulk_create(Assignment_Submissions, rows)
@@ -0,0 +1,145 @@
+# Python modules
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+# Django modules
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+# Project modules
+from apps.abstract.pool import request_pool_time
+
+logger = logging.getLogger("apps.requests")
+
+
+class QueryRecorder:
+    """connection.execute_wrapper hook: counts statements and their DB time"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            # parametrized SQL: the same statement per row is the N+1 signature
+            self.statements[sql] += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Per-request query count, DB time, view (serialization) time, render time
+    and response size. Emitted as a Server-Timing header and as structured
+    log fields on the `apps.requests` logger; requests over the query or
+    duplicate-statement thresholds are logged as warnings.
+
+    Views serialize inline, so `app` (view time minus DB time) is where
+    serializer cost shows up; `render` is the JSON encoding of the response.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        recorder = QueryRecorder()
+        request._metrics_view_started = None
+        request._metrics_view_finished = None
+        request._metrics_view_db = 0.0
+
+        pool_time = {}
+        pool_token = request_pool_time.set(pool_time)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                request._metrics_recorder = recorder
+                response = self.get_response(request)
+        finally:
+            request_pool_time.reset(pool_token)
+        finished = time.perf_counter()
+
+        request._metrics_pool_time = pool_time
+        self.report(request, response, recorder, finished - started, finished)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        request._metrics_view_started = time.perf_counter()
+        request._metrics_view_db = request._metrics_recorder.duration
+        return None
+
+    def process_template_response(self, request: HttpRequest, response):
+        # DRF responses are rendered after this hook: the view is done
+        if request._metrics_view_started is not None:
+            request._metrics_view_finished = time.perf_counter()
+            request._metrics_view_db = request._metrics_recorder.duration - request._metrics_view_db
+        return response
+
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        recorder: QueryRecorder,
+        total: float,
+        finished: float,
+    ) -> None:
+        timings = {"total": total}
+        if request._metrics_view_finished is not None:
+            view = request._metrics_view_finished - request._metrics_view_started
+            timings["app"] = max(view - request._metrics_view_db, 0.0)
+            timings["render"] = finished - request._metrics_view_finished
+
+        size = None if response.streaming else len(response.content)
+
+        if settings.REQUEST_METRICS_SERVER_TIMING:
+            parts = [f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"']
+            for name in ("app", "render", "total"):
+                if name in timings:
+                    parts.append(f"{name};dur={timings[name] * 1000:.1f}")
+            # time spent in bounded pools (apps.abstract.pool), e.g. password hashing
+            for name, duration in request._metrics_pool_time.items():
+                parts.append(f"{name};dur={duration * 1000:.1f}")
+            response["Server-Timing"] = ", ".join(parts)
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_ms": round(recorder.duration * 1000, 1),
+            "app_ms": None if "app" not in timings else round(timings["app"] * 1000, 1),
+            "render_ms": None if "render" not in timings else round(timings["render"] * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+            "response_bytes": size,
+        }
+        for name, duration in request._metrics_pool_time.items():
+            fields[f"{name}_ms"] = round(duration * 1000, 1)
+
+        duplicate_sql, duplicates = (recorder.statements.most_common(1) or [("", 0)])[0]
+        suspicious = (
+            recorder.count > settings.REQUEST_METRICS_QUERY_THRESHOLD
+            or duplicates > settings.REQUEST_METRICS_DUPLICATE_THRESHOLD
+        )
+        if suspicious:
+            fields["n_plus_one"] = True
+            fields["duplicate_queries"] = duplicates
+            logger.warning(
+                "Possible N+1: %s %s queries=%s duplicates=%s sql=%s",
+                request.method, request.path, recorder.count, duplicates, duplicate_sql[:200],
+                extra={"metrics": fields},
+            )
+        else:
+            logger.info(
+                "%s %s status=%s queries=%s db_ms=%s total_ms=%s bytes=%s",
+                request.method, request.path, response.status_code,
+                recorder.count, fields["db_ms"], fields["total_ms"], size,
+                extra={"metrics": fields},
+            )
@@ -1,8 +1,42 @@
 from typing import Any
 
-from django.db.models import Model,DateTimeField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import (
+    Model,
+    CharField,
+    BigIntegerField,
+    JSONField,
+    DateTimeField,
+    Index,
+    Manager,
+    Q,
+    QuerySet,
+)
 from django.utils import timezone as django_timezone
 
+# condition of the partial indexes on live rows
+LIVE = Q(delete_at__isnull=True)
+
+
+class SoftDeleteQuerySet(QuerySet):
+
+    def alive(self) -> 'SoftDeleteQuerySet':
+        return self.filter(delete_at__isnull=True)
+
+    def deleted(self) -> 'SoftDeleteQuerySet':
+        return self.filter(delete_at__isnull=False)
+
+
+class SoftDeleteManager(Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Default manager of AbstractModel: soft-deleted rows are excluded.
+    `all_objects` sees everything; related-object access (_base_manager)
+    is not filtered, so a message still resolves its deleted channel.
+    """
+
+    def get_queryset(self) -> SoftDeleteQuerySet:
+        return super().get_queryset().filter(delete_at__isnull=True)
+
 
 class AbstractModel(Model):
     create_at = DateTimeField(
@@ -16,6 +50,12 @@ class AbstractModel(Model):
         blank=True,
         default=None,
     )
+
+    # subclasses redefining `objects` must redefine `all_objects` after it:
+    # the first manager declared is the default one
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
     class Meta:
         abstract = True
     def delete(self, using: Any = None, keep_parents: bool = False) -> None:
@@ -23,4 +63,23 @@ class AbstractModel(Model):
         self.save( update_fields=["delete_at"] )
 
 
+class ArchivedRow(Model):
+    """
+    Snapshot of a purged row (see apps.abstract.archive):
+    model label, original primary key and its serialized fields.
+    """
+    model_label = CharField(max_length=100)
+    object_id = BigIntegerField()
+    data = JSONField(encoder=DjangoJSONEncoder)
+    deleted_at = DateTimeField(null=True, blank=True)
+    archived_at = DateTimeField(default=django_timezone.now)
+
+    class Meta:
+        verbose_name = "Archived Row"
+        verbose_name_plural = "Archived Rows"
+        indexes = [
+            Index(fields=['model_label', 'object_id']),
+        ]
 
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}"
@@ -0,0 +1,187 @@
+# Python modules
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any
+
+# Django modules
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Model, Q, QuerySet
+
+# Rest modules
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor (keyset) pagination over a tuple of ordering fields.
+
+    Rows are addressed by the values of `ordering` instead of an OFFSET,
+    so every page is a bounded index range scan no matter how deep it is.
+        ?after=<cursor>   - rows after the cursor (towards the end)
+        ?before=<cursor>  - rows before the cursor (towards the start)
+        ?limit=<n>        - page size (capped by max_page_size)
+        ?count=true       - also return the total count (extra query)
+
+    Pages are always returned in ascending `ordering` order.
+    The last field of `ordering` must be unique (usually `id`).
+    """
+
+    ordering: tuple[str, ...] = ('id',)
+    page_size = 50
+    max_page_size = 200
+    # 'first' - no cursor starts at the beginning, 'last' - at the end
+    default_position = 'first'
+
+    after_query_param = 'after'
+    before_query_param: str | None = 'before'  # None - forward only
+    limit_query_param = 'limit'
+    count_query_param = 'count'
+
+    def get_ordering(self, request: Request, queryset: QuerySet) -> tuple[str, ...]:
+        """Hook: ordering fields for this request"""
+        return self.ordering
+
+    def use_ordering(self, ordering: tuple[str, ...]) -> None:
+        """
+        Ordering the cursor helpers (encode/decode_cursor, keyset_q) work on;
+        paginate_queryset sets it, pages built by hand (raw SQL) call it first
+        """
+        self._ordering = tuple(ordering)
+
+    def get_limit(self, request: Request) -> int:
+        raw = request.query_params.get(self.limit_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            limit = int(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({self.limit_query_param: 'Must be an integer.'})
+        return max(1, min(limit, self.max_page_size))
+
+    def encode_cursor(self, row: Any) -> str:
+        """Build an opaque cursor from a model instance or a values() dict"""
+        values = []
+        for name in self._ordering:
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str, model: type[Model], param: str) -> list:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self._ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self._ordering, values)
+            ]
+        except (ValueError, TypeError, DjangoValidationError):
+            raise ValidationError({param: 'Invalid cursor.'})
+
+    def keyset_q(self, values: list, forward: bool) -> Q:
+        """
+        Lexicographic (f1, f2, ...) > (v1, v2, ...) predicate (or < when
+        paging backwards), expanded so every branch is index friendly.
+        """
+        lookup = 'gt' if forward else 'lt'
+        conds = Q()
+        for i, name in enumerate(self._ordering):
+            branch = Q(**{f'{name}__{lookup}': values[i]})
+            for prev, value in zip(self._ordering[:i], values[:i]):
+                branch &= Q(**{prev: value})
+            conds |= branch
+        return conds
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: Any = None
+    ) -> list:
+        self.request = request
+        self.use_ordering(self.get_ordering(request, queryset))
+        self.limit = self.get_limit(request)
+        self.total = None
+
+        after = request.query_params.get(self.after_query_param)
+        before = (
+            request.query_params.get(self.before_query_param)
+            if self.before_query_param else None
+        )
+        if after and before:
+            raise ValidationError(
+                {'error': 'Use either `after` or `before`, not both.'}
+            )
+
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true'):
+            self.total = queryset.count()
+
+        self.cursor = None
+        if after:
+            forward = True
+            self.cursor = self.decode_cursor(after, queryset.model, self.after_query_param)
+        elif before:
+            forward = False
+            self.cursor = self.decode_cursor(before, queryset.model, self.before_query_param)
+        else:
+            forward = self.default_position == 'first'
+        if self.cursor is not None:
+            queryset = queryset.filter(self.keyset_q(self.cursor, forward))
+
+        order = list(self._ordering) if forward else [f'-{name}' for name in self._ordering]
+        rows = list(queryset.order_by(*order)[:self.limit + 1])
+
+        self.has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if not forward:
+            rows.reverse()
+
+        self.forward = forward
+        self.rows = rows
+        return rows
+
+    def merge_queryset(self, queryset: QuerySet) -> list:
+        """
+        Merge rows of a second queryset with the same ordering fields
+        (e.g. an archive table) into the page built by paginate_queryset.
+        Cursors stay valid across both: rows are addressed by their values.
+        """
+        if self.total is not None:
+            self.total += queryset.count()
+        if self.cursor is not None:
+            queryset = queryset.filter(self.keyset_q(self.cursor, self.forward))
+
+        order = list(self._ordering) if self.forward else [f'-{name}' for name in self._ordering]
+        extra = list(queryset.order_by(*order)[:self.limit + 1])
+        if not extra:
+            return self.rows
+
+        rows = sorted(
+            [*self.rows, *extra],
+            key=lambda row: tuple(getattr(row, name) for name in self._ordering),
+            reverse=not self.forward,
+        )
+        self.has_more = self.has_more or len(rows) > self.limit
+        rows = rows[:self.limit]
+        if not self.forward:
+            rows.reverse()
+        self.rows = rows
+        return rows
+
+    def get_pagination_data(self) -> dict:
+        """Cursor block to embed into the response envelope"""
+        data = {
+            'limit': self.limit,
+            'has_more': self.has_more,
+            'before': self.encode_cursor(self.rows[0]) if self.rows else None,
+            'after': self.encode_cursor(self.rows[-1]) if self.rows else None,
+        }
+        if self.total is not None:
+            data['count'] = self.total
+        return data
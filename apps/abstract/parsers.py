@@ -0,0 +1,30 @@
+# JSON request parsing through orjson when it is installed,
+# stdlib json (DRF's JSONParser) otherwise.
+
+# Django modules
+from django.conf import settings
+
+# Rest modules
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+# Project modules
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """Drop-in JSONParser backed by orjson (UTF-8 bodies only)"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            # NaN/Infinity are rejected, like JSONParser with STRICT_JSON
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
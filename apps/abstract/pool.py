@@ -0,0 +1,120 @@
+# Bounded worker pools for CPU-heavy work done inside a request.
+#
+# A pool runs at most `workers` tasks at once and admits at most `max_queue`
+# more; past that `run()` fails fast with PoolFull instead of piling up
+# request threads behind the CPU. Callers decide what a full pool means
+# (the login/register views answer 429 + Retry-After).
+#
+# Each pool keeps wait/run latency samples (stats()) and adds its time to
+# the current request's Server-Timing (see RequestMetricsMiddleware).
+
+# Python modules
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextvars import ContextVar
+from typing import Any, Callable
+
+# Project modules
+from apps.abstract.benchmark import percentile
+
+logger = logging.getLogger(__name__)
+
+# pool name -> seconds spent in it by the current request
+request_pool_time: ContextVar[dict[str, float] | None] = ContextVar("request_pool_time", default=None)
+
+
+class PoolFull(Exception):
+    """Backlog full or result not ready in time; retry after `retry_after` seconds"""
+
+    def __init__(self, pool: str, retry_after: int) -> None:
+        super().__init__(f"Pool {pool} is full")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class BoundedPool:
+    """ThreadPoolExecutor with a bounded backlog, latency stats and fail-fast admission"""
+
+    samples = 1000
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queue: int,
+        timeout: float,
+        retry_after: int = 1,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"pool-{name}")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._wait = deque(maxlen=self.samples)
+        self._run = deque(maxlen=self.samples)
+        self.submitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.in_flight = 0
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """func(*args, **kwargs) on a pool thread; PoolFull when the backlog is full"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning("Pool full: pool=%s in_flight=%s", self.name, self.in_flight)
+            raise PoolFull(self.name, self.retry_after)
+
+        queued = time.perf_counter()
+        started = [queued]
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+        def task() -> Any:
+            started[0] = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.in_flight -= 1
+                    self._wait.append(started[0] - queued)
+                    self._run.append(finished - started[0])
+                self._slots.release()
+
+        future = self._executor.submit(task)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            logger.warning("Pool timeout: pool=%s timeout=%s", self.name, self.timeout)
+            raise PoolFull(self.name, self.retry_after)
+        finally:
+            timings = request_pool_time.get()
+            if timings is not None:
+                timings[self.name] = timings.get(self.name, 0.0) + time.perf_counter() - queued
+
+    def stats(self) -> dict:
+        with self._lock:
+            wait, run = list(self._wait), list(self._run)
+            data = {
+                "name": self.name,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+        for label, values in (("wait", wait), ("run", run)):
+            for pct in (50, 95, 99):
+                data[f"{label}_p{pct}_ms"] = round(percentile(values, pct) * 1000, 1) if values else None
+        return data
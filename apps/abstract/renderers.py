@@ -0,0 +1,46 @@
+# JSON rendering through orjson when it is installed.
+#
+# Output matches DRF's JSONRenderer for what serializers produce: compact,
+# UTF-8, datetimes with a 'Z' suffix, Decimals and lazy strings through
+# DRF's encoder, U+2028/U+2029 escaped. Without orjson (or when the client
+# asks for `; indent=N`) rendering falls back to the stdlib json module.
+
+# Python modules
+from typing import Any
+
+# Rest modules
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency, stdlib fallback
+    orjson = None
+
+
+ORJSON_OPTIONS = 0
+if orjson is not None:
+    # int dict keys appear in `included` maps (see build_included)
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_default = JSONEncoder().default
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes; orjson if available, DRF's encoder for other types"""
+    if orjson is None:
+        return JSONRenderer().render(data)
+    rendered = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+    # same as JSONRenderer: keep the output safe to embed in <script>
+    return rendered.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in JSONRenderer backed by orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
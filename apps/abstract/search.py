@@ -0,0 +1,227 @@
+# Directory search (teams, channels, users).
+#
+# Searchable models keep a normalized `search_key` column (lowercase,
+# accents stripped, whitespace collapsed) maintained in save().
+# The backend is picked by DB_ENGINE:
+#   - SQLite: prefix range on the B-tree index of search_key
+#     (search_key >= 'ab' AND search_key < 'ac'), plus optional extra
+#     columns through their Lower() indexes
+#   - PostgreSQL: substring match served by a pg_trgm GIN index on
+#     search_key; terms shorter than a trigram fall back to the prefix range
+#   - any other engine: plain istartswith on search_key (and the extra
+#     columns), no index assumptions
+
+# Python modules
+import logging
+import unicodedata
+from typing import Iterable
+
+# Django modules
+from django.conf import settings
+from django.db.models import CharField, Q, QuerySet
+from django.db.models.functions import Lower
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SEARCH_KEY_MAX_LENGTH = 255
+
+
+def normalize(value: str) -> str:
+    """'  Émile  Zola ' -> 'emile zola'"""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def build_search_key(*values: str | None) -> str:
+    return normalize(' '.join(value for value in values if value))[:SEARCH_KEY_MAX_LENGTH]
+
+
+def search_key_field(db_index: bool = True) -> CharField:
+    """db_index=False for soft-deletable models, which index live rows only"""
+    return CharField(
+        max_length=SEARCH_KEY_MAX_LENGTH,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=db_index,
+        help_text="Normalized search text, maintained on save",
+    )
+
+
+class SearchKeyMixin:
+    """
+    Keeps `search_key` in sync with `search_key_sources` on save().
+    QuerySet.update() bypasses it (see rebuild_search_keys).
+    """
+
+    search_key_sources: tuple[str, ...] = ()
+
+    def build_search_key(self) -> str:
+        return build_search_key(*(getattr(self, name) for name in self.search_key_sources))
+
+    def save(self, *args, **kwargs):
+        self.search_key = self.build_search_key()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.search_key_sources):
+            kwargs['update_fields'] = {*update_fields, 'search_key'}
+        return super().save(*args, **kwargs)
+
+
+def prefix_bounds(prefix: str) -> tuple[str, str]:
+    """'ab' -> ('ab', 'ac'): a range a B-tree index can serve"""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def prefix_q(field: str, prefix: str) -> Q:
+    low, high = prefix_bounds(prefix)
+    return Q(**{
+        f'{field}__gte': low,
+        f'{field}__lt': high,
+        f'{field}__startswith': low,
+    })
+
+
+class BaseDirectorySearch:
+
+    def filter(
+        self,
+        queryset: QuerySet,
+        term: str,
+        extra_fields: Iterable[str] = (),
+    ) -> QuerySet:
+        """
+        Rows whose search_key matches `term`; `extra_fields` are columns
+        with a Lower() index that are prefix-matched as well.
+        """
+        term = normalize(term)
+        if not term:
+            return queryset
+        return self.search(queryset, term, tuple(extra_fields))
+
+    def search(self, queryset: QuerySet, term: str, extra_fields: tuple[str, ...]) -> QuerySet:
+        raise NotImplementedError
+
+    def prefix_search(self, queryset: QuerySet, term: str, extra_fields: tuple[str, ...]) -> QuerySet:
+        conds = prefix_q('search_key', term)
+        aliases = {}
+        for field in extra_fields:
+            alias = f'{field.replace("__", "_")}_lower'
+            aliases[alias] = Lower(field)
+            # extra columns are lowercased only, not accent-stripped
+            conds |= prefix_q(alias, term)
+        return queryset.alias(**aliases).filter(conds)
+
+
+class PrefixDirectorySearch(BaseDirectorySearch):
+    """Prefix match on B-tree indexes (SQLite)"""
+
+    def search(self, queryset: QuerySet, term: str, extra_fields: tuple[str, ...]) -> QuerySet:
+        return self.prefix_search(queryset, term, extra_fields)
+
+
+class TrigramDirectorySearch(BaseDirectorySearch):
+    """Substring match on a pg_trgm GIN index (PostgreSQL)"""
+
+    min_trigram_length = 3
+
+    def search(self, queryset: QuerySet, term: str, extra_fields: tuple[str, ...]) -> QuerySet:
+        if len(term) < self.min_trigram_length:
+            return self.prefix_search(queryset, term, extra_fields)
+        # extra columns are part of search_key on models that use them
+        return queryset.filter(search_key__contains=term)
+
+
+class StartswithDirectorySearch(BaseDirectorySearch):
+    """Plain istartswith, for engines without a dedicated backend"""
+
+    def search(self, queryset: QuerySet, term: str, extra_fields: tuple[str, ...]) -> QuerySet:
+        conds = Q(search_key__istartswith=term)
+        for field in extra_fields:
+            conds |= Q(**{f'{field}__istartswith': term})
+        return queryset.filter(conds)
+
+
+# DB_ENGINE (settings/conf.py) -> directory search backend
+DIRECTORY_SEARCH_BACKENDS = {
+    "django.db.backends.sqlite3": "apps.abstract.search.PrefixDirectorySearch",
+    "django.db.backends.postgresql": "apps.abstract.search.TrigramDirectorySearch",
+    "django.db.backends.postgresql_psycopg2": "apps.abstract.search.TrigramDirectorySearch",
+}
+# any other engine
+FALLBACK_DIRECTORY_SEARCH = "apps.abstract.search.StartswithDirectorySearch"
+
+_backend: BaseDirectorySearch | None = None
+
+
+def get_directory_search() -> BaseDirectorySearch:
+    """Directory search backend for the configured DB_ENGINE, resolved once per process"""
+    global _backend
+    if _backend is None:
+        path = DIRECTORY_SEARCH_BACKENDS.get(settings.DB_ENGINE)
+        if path is None:
+            logger.warning(
+                "No indexed directory search for DB_ENGINE=%s, falling back to istartswith",
+                settings.DB_ENGINE,
+            )
+            path = FALLBACK_DIRECTORY_SEARCH
+        _backend = import_string(path)()
+    return _backend
+
+
+def directory_search(queryset: QuerySet, term: str, extra_fields: Iterable[str] = ()) -> QuerySet:
+    return get_directory_search().filter(queryset, term, extra_fields)
+
+
+# ── Migrations ────────────────────────────────────────────────────────────────
+
+def backfill_search_keys(app_label: str, model_name: str, sources: tuple[str, ...], batch_size: int = 2000):
+    """RunPython callable filling search_key of existing rows in id batches"""
+
+    def backfill(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        last_id = 0
+        while True:
+            batch = list(
+                model.objects.filter(pk__gt=last_id).order_by('pk').only('pk', *sources)[:batch_size]
+            )
+            if not batch:
+                break
+            for row in batch:
+                row.search_key = build_search_key(*(getattr(row, name) for name in sources))
+            model.objects.bulk_update(batch, ['search_key'])
+            last_id = batch[-1].pk
+
+    return backfill
+
+
+def trigram_index(table: str, index_name: str):
+    """RunPython (forward, backward) pair adding a pg_trgm GIN index on PostgreSQL only"""
+
+    def forward(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {table} USING GIN (search_key gin_trgm_ops)"
+        )
+
+    def backward(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    return forward, backward
+
+
+class DirectorySearchAdminMixin:
+    """Admin search through the directory backend instead of icontains scans"""
+
+    directory_search_extra_fields: tuple[str, ...] = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return directory_search(queryset, search_term, self.directory_search_extra_fields), False
@@ -1,3 +1,189 @@
-from django.test import TestCase
+import datetime
+import re
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import skipIf
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.channels.models import Channel, ChannelMembership
+from apps.messages.models import ArchivedMessage, Message
+from apps.team.models import Team, TeamMembership
+from apps.users.models import CustomUser
+from . import search
+from .archive import ArchivePolicy, purge_soft_deleted
+from .models import ArchivedRow
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer, orjson
+
+
+def make_user(name: str) -> CustomUser:
+    return CustomUser.objects.create_user(
+        email=f"{name}@example.com",
+        password="password123",
+        first_name=name,
+        last_name="Test",
+    )
+
+
+def days_ago(days: int) -> datetime.datetime:
+    return timezone.now() - datetime.timedelta(days=days)
+
+
+class PurgeArchiveTests(TestCase):
+    """Soft-deleted rows past the retention window end up in ArchivedRow"""
+
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.bob = make_user("bob")
+        self.team = Team.objects.create(name="Core", owner=self.owner)
+        TeamMembership.objects.create(team=self.team, user=self.bob)
+
+    def soft_delete(self, instance, days: int) -> None:
+        type(instance).all_objects.filter(pk=instance.pk).update(delete_at=days_ago(days))
+
+    def purge(self, *args: str) -> str:
+        out = StringIO()
+        call_command("purge_archive", "--retention-days=30", *args, stdout=out)
+        return out.getvalue()
+
+    def test_channel_with_memberships(self):
+        channel = Channel.objects.create(team=self.team, name="old", is_private=True)
+        membership = ChannelMembership.objects.create(channel=channel, user=self.bob)
+        self.soft_delete(channel, days=40)
+
+        self.purge()
+        self.assertFalse(Channel.all_objects.filter(pk=channel.pk).exists())
+        self.assertFalse(ChannelMembership.objects.filter(pk=membership.pk).exists())
+        archived = ArchivedRow.objects.get(model_label="channels.Channel", object_id=channel.pk)
+        self.assertEqual(archived.data["name"], "old")
+        self.assertTrue(ArchivedRow.objects.filter(
+            model_label="channels.ChannelMembership", object_id=membership.pk
+        ).exists())
+
+    def test_recent_deletions_and_dry_run_are_kept(self):
+        recent = Channel.objects.create(team=self.team, name="recent")
+        old = Channel.objects.create(team=self.team, name="old")
+        self.soft_delete(recent, days=5)
+        self.soft_delete(old, days=40)
+
+        self.assertIn("Would archive 1 soft-deleted channels.Channel rows", self.purge("--dry-run"))
+        self.assertEqual(Channel.all_objects.count(), 2)
+        self.purge()
+        self.assertEqual(list(Channel.all_objects.values_list("name", flat=True)), ["recent"])
+
+    def test_channel_messages_move_to_archive_first(self):
+        channel = Channel.objects.create(team=self.team, name="old")
+        root = Message.objects.create(content="root", author=self.bob, channel=channel)
+        Message.objects.create(content="reply", author=self.owner, channel=channel, parent_message=root)
+        self.soft_delete(channel, days=40)
+
+        self.assertIn("Archived 2 messages", self.purge())
+        self.assertFalse(Message.objects.exists())
+        self.assertEqual(ArchivedMessage.objects.filter(channel_id=channel.pk).count(), 2)
+        self.assertFalse(Channel.all_objects.filter(pk=channel.pk).exists())
+
+    def test_user_kept_while_referenced(self):
+        channel = Channel.objects.create(team=self.team, name="general")
+        carl = make_user("carl")
+        Message.objects.create(content="hi", author=self.bob, channel=channel)
+        self.soft_delete(self.bob, days=40)
+        self.soft_delete(carl, days=40)
+
+        self.purge()
+        self.assertTrue(CustomUser.all_objects.filter(pk=self.bob.pk).exists())
+        self.assertFalse(CustomUser.all_objects.filter(pk=carl.pk).exists())
+        archived = ArchivedRow.objects.get(model_label="users.CustomUser", object_id=carl.pk)
+        self.assertEqual(archived.data["email"], "carl@example.com")
+        self.assertNotIn("password", archived.data)
+
+    def test_batches_walk_every_candidate(self):
+        channels = [Channel.objects.create(team=self.team, name=f"c{n}") for n in range(5)]
+        for channel in channels:
+            self.soft_delete(channel, days=40)
+
+        batches = list(purge_soft_deleted(ArchivePolicy(Channel), days_ago(30), batch_size=2))
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertFalse(Channel.all_objects.exists())
+
+
+@override_settings(DB_ENGINE="django.db.backends.mysql")
+class FallbackDirectorySearchTests(TestCase):
+    """Engines without an indexed backend search with istartswith"""
+
+    def setUp(self):
+        search._backend = None
+        self.addCleanup(setattr, search, "_backend", None)
+        self.owner = make_user("owner")
+        for name in ("Émile Core", "Emission", "Platform"):
+            Team.objects.create(name=name, owner=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_team_search(self):
+        response = self.client.get("/api/teams/?q=EMI")
+        self.assertEqual(response.status_code, 200)
+        names = sorted(team["name"] for team in response.json()["data"])
+        self.assertEqual(names, ["Emission", "Émile Core"])
+        self.assertIsInstance(search.get_directory_search(), search.StartswithDirectorySearch)
+
+
+class RequestMetricsTests(TestCase):
+
+    def setUp(self):
+        self.owner = make_user("owner")
+        Team.objects.create(name="Core", owner=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_server_timing_reports_query_count(self):
+        with self.assertLogs("apps.requests", "INFO") as logs:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/api/teams/")
+        self.assertEqual(response.status_code, 200)
+
+        timing = response["Server-Timing"]
+        match = re.match(r'db;dur=[\d.]+;desc="(\d+) queries"', timing)
+        self.assertIsNotNone(match, timing)
+        self.assertEqual(int(match.group(1)), len(queries))
+        for name in ("app", "render", "total"):
+            self.assertRegex(timing, rf"\b{name};dur=[\d.]+")
+        self.assertEqual(logs.records[-1].metrics["queries"], len(queries))
+
+    @override_settings(REQUEST_METRICS_SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        response = self.client.get("/api/teams/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+@skipIf(orjson is None, "orjson is not installed")
+class FastJSONTests(SimpleTestCase):
+    """orjson output and parsing match DRF's stdlib JSONRenderer/JSONParser"""
+
+    data = {
+        "at": datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+        "naive": datetime.datetime(2026, 1, 2, 3, 4, 5),
+        "day": datetime.date(2026, 1, 2),
+        "price": Decimal("12.50"),
+        "text": "naïve \u2028 line",
+        "included": {1: {"id": 1}},
+        "items": [None, True, 1.5],
+    }
+
+    def test_render_matches_stdlib(self):
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parse_round_trip_matches_stdlib(self):
+        rendered = FastJSONRenderer().render(self.data)
+        parsed = FastJSONParser().parse(BytesIO(rendered))
+        self.assertEqual(parsed, JSONParser().parse(BytesIO(rendered)))
+        self.assertEqual(parsed["at"], "2026-01-02T03:04:05.123456Z")
+        self.assertEqual(parsed["price"], 12.5)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assigments', '0004_submission_file'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignments',
+            index=models.Index(condition=models.Q(('delete_at__isnull', True)), fields=['team_id', '-id'], name='assignments_live_team_idx'),
+        ),
+    ]
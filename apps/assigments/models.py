@@ -9,10 +9,10 @@ from django.db.models import (
     FloatField,
     BooleanField,
     DateField,
-    FileField
-    
+    FileField,
+    Index,
 )
-from apps.abstract.models import AbstractModel
+from apps.abstract.models import AbstractModel, LIVE
 
 from apps.team.models import Team
 from apps.users.models import CustomUser
@@ -34,6 +34,12 @@ class Assignments(AbstractModel):
         help_text='Points'
     )
 
+    class Meta:
+        indexes = [
+            # team's live assignments, newest first (list ?team_id=)
+            Index(fields=['team_id', '-id'], condition=LIVE, name='assignments_live_team_idx'),
+        ]
+
     def __str__(self):
         return f'Assigments - team:{self.team_id},title:{self.title}'
     
@@ -1,6 +1,6 @@
 from rest_framework.permissions import BasePermission
 from .models import Assignments
-from apps.team.models import Team
+from apps.channels.access import get_access
 
 
 class IsTeamOwner(BasePermission):
@@ -11,18 +11,15 @@ class IsTeamOwner(BasePermission):
     def has_permission(self, request, view):
         if view.action == 'create':
             team_id = request.data.get('team_id') 
-            if team_id:
-                try:
-                    team = Team.objects.get(id=team_id)
-                    return team.owner == request.user
-                except Team.DoesNotExist:
-                    return False
-            return False
+            try:
+                return get_access(request).is_team_owner(int(team_id))
+            except (TypeError, ValueError):
+                return False
         return True
 
     def has_object_permission(self, request, view, obj):
         if isinstance(obj, Assignments):
-            return obj.team_id.owner == request.user
+            return get_access(request).is_team_owner(obj.team_id_id)
         return False
 
 
@@ -36,5 +33,5 @@ class IsTeamMember(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         if isinstance(obj, Assignments):
-            return obj.team_id.members.filter(id=request.user.id).exists()
+            return get_access(request).is_team_member(obj.team_id_id)
         return False
\ No newline at end of file
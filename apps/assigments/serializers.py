@@ -13,12 +13,16 @@ from .models import (
     Assignments,
     Assignment_Submissions
 )
+from apps.abstract.fieldsets import Requires, SparseFieldsMixin
 
 
-class AssigmentsSerialzers(ModelSerializer):
+class AssigmentsSerialzers(SparseFieldsMixin, ModelSerializer):
     """
-    Serializers Assigments
+    Serializers Assigments, supports ?fields=
     """
+    field_requirements = {
+        'team_info': Requires(select_related=('team_id',), only=('team_id__name',)),
+    }
 
     team_info = SerializerMethodField()
 
@@ -37,6 +37,7 @@ from .models import (
     Assignment_Submissions
 )
 from .permissions import IsTeamOwner, IsTeamMember
+from apps.abstract.fieldsets import Fieldset, fieldset_parameters
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,7 @@ logger = logging.getLogger(__name__)
     list=extend_schema(
         summary='List all assignments',
         tags=['Assignments'],
+        parameters=fieldset_parameters(),
         responses={
             200: OpenApiResponse(
                 response=AssigmentsSerialzers(many=True),
@@ -55,6 +57,7 @@ logger = logging.getLogger(__name__)
     retrieve=extend_schema(
         summary='Retrieve assignments by team ID',
         tags=['Assignments'],
+        parameters=fieldset_parameters(),
         responses={
             200: OpenApiResponse(response=AssigmentsSerialzers, description='Assignment found'),
             404: OpenApiResponse(description='Assignment not found'),
@@ -87,6 +90,8 @@ class AssigmentsViewSet(ViewSet):
     """
 
     permission_classes = [IsAuthenticated]
+    # read actions that only need the user id and staff flags (AUTH_STATELESS_READS)
+    stateless_auth_actions = ('list', 'retrieve')
 
     def get_permissions(self):
         if self.action in ['create', 'partial_update']:
@@ -96,6 +101,7 @@ class AssigmentsViewSet(ViewSet):
                 return [IsAuthenticated(), IsTeamMember()]
         elif self.action == 'submissions' or self.action == 'grade':
             return [IsAuthenticated(), IsTeamOwner()]
+        return super().get_permissions()
 
     def get_assigment_or_404(
         self, 
@@ -107,6 +113,8 @@ class AssigmentsViewSet(ViewSet):
         """Helper: returns (assignment, None) or (None, 404 Response)"""
         try:
             assignment = Assignments.objects.get(pk=pk)
+            # object permissions (owner/admin/member) via apps.channels.access
+            self.check_object_permissions(self.request, assignment)
             return assignment, None
         except Assignments.DoesNotExist:
             logger.warning('Assignment not found: id=%s', pk)
@@ -122,6 +130,7 @@ class AssigmentsViewSet(ViewSet):
         """
         List of Assigmnets
         """
+        fieldset = Fieldset.from_request(request, AssigmentsSerialzers)
         queryset = Assignments.objects.all().order_by('-id')
         
         # Filtering by team_id if provided
@@ -130,8 +139,9 @@ class AssigmentsViewSet(ViewSet):
             queryset = queryset.filter(team_id=team_id)
         
         serializer = AssigmentsSerialzers(
-            queryset,
-            many=True
+            AssigmentsSerialzers.optimize_queryset(queryset, fieldset),
+            many=True,
+            fieldset=fieldset
         )
         logger.info(
             'List of assigments : %s',
@@ -153,6 +163,7 @@ class AssigmentsViewSet(ViewSet):
         """
         Assigments by team_id
         """
+        fieldset = Fieldset.from_request(request, AssigmentsSerialzers)
         try:
             assignment, error = self.get_assigment_or_404(pk)
 
@@ -160,7 +171,8 @@ class AssigmentsViewSet(ViewSet):
                 return error
             
             serializer = AssigmentsSerialzers(
-                assignment
+                assignment,
+                fieldset=fieldset
             )
             logger.info(
                 'Assigments by team_id:%s',
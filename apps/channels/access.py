@@ -0,0 +1,178 @@
+# Channel/team access resolution.
+#
+# Everything a permission check needs about a user (team ids, admin team
+# ids, owned team ids, private channel ids) is loaded once, memoized on the
+# request and, with a shared cache backend, cached across requests under a
+# per-user version key. Membership/ownership changes bump the version (see
+# signals below), so a stale entry is never read again and simply expires.
+# A per-process cache would keep other workers' entries alive after a bump,
+# so without a shared backend access is loaded once per request.
+
+# Python modules
+import logging
+from dataclasses import dataclass
+
+# Django modules
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+
+# Project modules
+from apps.abstract.cache import is_shared_cache
+from apps.team.models import Team, TeamMembership
+from .models import Channel, ChannelMembership
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ATTR = "_user_access"
+
+
+@dataclass(frozen=True)
+class UserAccess:
+    user_id: int
+    is_staff: bool
+    team_ids: frozenset[int]
+    admin_team_ids: frozenset[int]
+    owned_team_ids: frozenset[int]
+    private_channel_ids: frozenset[int]
+
+    def is_team_member(self, team_id: int) -> bool:
+        return team_id in self.team_ids
+
+    @property
+    def visible_team_ids(self) -> frozenset[int]:
+        """Teams whose public channels the user sees: memberships and owned teams"""
+        return self.team_ids | self.owned_team_ids
+
+    def is_team_member_or_owner(self, team_id: int) -> bool:
+        return team_id in self.team_ids or team_id in self.owned_team_ids
+
+    def is_team_owner(self, team_id: int) -> bool:
+        return team_id in self.owned_team_ids
+
+    def is_team_admin(self, team_id: int) -> bool:
+        """Owner or member with the admin role"""
+        return team_id in self.owned_team_ids or team_id in self.admin_team_ids
+
+    def is_channel_member(self, channel_id: int) -> bool:
+        return channel_id in self.private_channel_ids
+
+    def can_access_channel(self, channel: Channel) -> bool:
+        """Team members and owners see public channels, private ones need a channel membership"""
+        if channel.delete_at is not None or not self.is_team_member_or_owner(channel.team_id):
+            return False
+        return not channel.is_private or channel.id in self.private_channel_ids
+
+    def channel_q(self, prefix: str = "") -> Q:
+        """
+        Q over Channel (or a relation via prefix, e.g. 'channel__') for accessible
+        live channels; relations are not filtered by the soft-delete manager
+        """
+        return Q(**{f"{prefix}team_id__in": self.visible_team_ids, f"{prefix}delete_at__isnull": True}) & (
+            Q(**{f"{prefix}is_private": False})
+            | Q(**{f"{prefix}id__in": self.private_channel_ids})
+        )
+
+
+def _version_key(user_id: int) -> str:
+    return f"access:version:{user_id}"
+
+
+def _get_version(user_id: int) -> int:
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = 1
+        cache.add(_version_key(user_id), version, None)
+    return version
+
+
+def invalidate_user(user_id: int) -> None:
+    """Bump the user's version; cached access built before is never read again"""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 2, None)
+
+
+def load_user_access(user) -> UserAccess:
+    """Three small indexed queries, no caching"""
+    team_ids = set()
+    admin_team_ids = set()
+    for team_id, role in TeamMembership.objects.filter(
+        user_id=user.id
+    ).values_list("team_id", "role"):
+        team_ids.add(team_id)
+        if role == "admin":
+            admin_team_ids.add(team_id)
+
+    access = UserAccess(
+        user_id=user.id,
+        is_staff=bool(user.is_staff or user.is_superuser),
+        team_ids=frozenset(team_ids),
+        admin_team_ids=frozenset(admin_team_ids),
+        owned_team_ids=frozenset(
+            Team.objects.filter(owner_id=user.id).values_list("id", flat=True)
+        ),
+        private_channel_ids=frozenset(
+            ChannelMembership.objects.filter(
+                user_id=user.id
+            ).values_list("channel_id", flat=True)
+        ),
+    )
+    logger.debug(
+        "Access loaded: user=%s teams=%s private_channels=%s",
+        user.id, len(access.team_ids), len(access.private_channel_ids)
+    )
+    return access
+
+
+def get_user_access(user) -> UserAccess:
+    """Cached across requests on a shared cache; use get_access(request) inside a request"""
+    if not is_shared_cache():
+        return load_user_access(user)
+    key = f"access:{user.id}:{_get_version(user.id)}"
+    access = cache.get(key)
+    if access is None:
+        access = load_user_access(user)
+        cache.set(key, access, settings.ACCESS_CACHE_TIMEOUT)
+    return access
+
+
+def get_access(request) -> UserAccess:
+    """Memoized on the request: permissions, views and serializers share one lookup"""
+    access = getattr(request, REQUEST_ATTR, None)
+    if access is None or access.user_id != request.user.id:
+        access = get_user_access(request.user)
+        setattr(request, REQUEST_ATTR, access)
+    return access
+
+
+# ── Invalidation ──────────────────────────────────────────────────────────────
+
+def _membership_changed(sender, instance, **kwargs) -> None:
+    invalidate_user(instance.user_id)
+
+
+def _team_owner_captured(sender, instance: Team, **kwargs) -> None:
+    instance._previous_owner_id = None
+    if instance.pk:
+        instance._previous_owner_id = Team.objects.filter(
+            pk=instance.pk
+        ).values_list("owner_id", flat=True).first()
+
+
+def _team_changed(sender, instance: Team, **kwargs) -> None:
+    invalidate_user(instance.owner_id)
+    previous = getattr(instance, "_previous_owner_id", None)
+    if previous and previous != instance.owner_id:
+        invalidate_user(previous)
+
+
+def connect_signals() -> None:
+    for model in (TeamMembership, ChannelMembership):
+        post_save.connect(_membership_changed, sender=model, dispatch_uid=f"access_{model.__name__}_save")
+        post_delete.connect(_membership_changed, sender=model, dispatch_uid=f"access_{model.__name__}_delete")
+    pre_save.connect(_team_owner_captured, sender=Team, dispatch_uid="access_team_pre_save")
+    post_save.connect(_team_changed, sender=Team, dispatch_uid="access_team_save")
+    post_delete.connect(_team_changed, sender=Team, dispatch_uid="access_team_delete")
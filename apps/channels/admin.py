@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Channel, ChannelMembership
+from apps.abstract.search import DirectorySearchAdminMixin
 
 #1. Create an inline class for participants
 class ChannelMembershipInline(admin.TabularInline):
@@ -9,7 +10,7 @@ class ChannelMembershipInline(admin.TabularInline):
     # autocomplete_fields = ['user'] # Very useful if there are many users
 
 @admin.register(Channel)
-class ChannelAdmin(admin.ModelAdmin):
+class ChannelAdmin(DirectorySearchAdminMixin, admin.ModelAdmin):
     list_display = [
         'id',
         'name',
@@ -18,7 +19,7 @@ class ChannelAdmin(admin.ModelAdmin):
         'create_at',
     ]
     list_filter = ['is_private', 'team']
-    search_fields = ['name', 'description', 'team__name']
+    search_fields = ['name']
     readonly_fields = ['create_at', 'update_at']
     
     fieldsets = (
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ChannelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.channels'
+
+    def ready(self):
+        from .access import connect_signals
+        connect_signals()
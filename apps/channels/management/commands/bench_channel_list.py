@@ -0,0 +1,92 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.abstract.benchmark import measure
+from apps.channels.models import Channel, ChannelMembership
+from apps.channels.views import ChannelViewSet
+from apps.team.models import Team, TeamMembership
+from apps.users.models import CustomUser
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark GET /api/channels/?team_id= on a generated team. "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--channels", type=int, default=1000)
+        parser.add_argument("--members", type=int, default=50, help="Team members")
+        parser.add_argument(
+            "--private-ratio",
+            type=float,
+            default=0.2,
+            help="Share of private channels (the user is a member of half of them)",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, options) -> tuple[CustomUser, Team]:
+        users = CustomUser.objects.bulk_create([
+            CustomUser(
+                email=f"bench-channels-{i}@example.invalid",
+                first_name="Bench",
+                last_name=str(i),
+            )
+            for i in range(options["members"])
+        ])
+        user = users[0]
+        team = Team.objects.create(name="bench-channels", owner=user)
+        TeamMembership.objects.bulk_create([
+            TeamMembership(team=team, user=member) for member in users
+        ])
+
+        private_every = round(1 / options["private_ratio"]) if options["private_ratio"] else 0
+        channels = Channel.objects.bulk_create([
+            Channel(
+                team=team,
+                name=f"channel-{i:05d}",
+                is_private=bool(private_every) and i % private_every == 0,
+            )
+            for i in range(options["channels"])
+        ])
+        private = [channel for channel in channels if channel.is_private]
+        ChannelMembership.objects.bulk_create([
+            ChannelMembership(channel=channel, user=member)
+            for index, channel in enumerate(private)
+            for member in (users if index % 2 == 0 else users[1:])
+        ])
+        return user, team
+
+    def run(self, options):
+        user, team = self.seed(options)
+        factory = APIRequestFactory()
+        view = ChannelViewSet.as_view({"get": "list"})
+
+        for label, query in (
+            ("list", f"team_id={team.id}"),
+            ("list ?include=members", f"team_id={team.id}&include=members"),
+        ):
+            def call():
+                request = factory.get(f"/api/channels/?{query}")
+                force_authenticate(request, user=user)
+                return view(request).render()
+
+            result = measure(call, options["repeat"], warmup=0)
+            rows = call().data["count"]
+            self.stdout.write(
+                f"{label:<24} rows={rows} queries={result.queries} "
+                f"median={result.p50_ms:.1f}ms p95={result.p95_ms:.1f}ms"
+            )
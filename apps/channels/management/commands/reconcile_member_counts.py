@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from apps.channels.models import Channel, ChannelMembership
+from apps.team.models import Team, TeamMembership
+
+
+def _actual_count(membership_model, field: str):
+    """COUNT of memberships of the outer row, 0 when there are none"""
+    members = membership_model.objects.filter(
+        **{field: OuterRef("pk")}
+    ).order_by().values(field).annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(members), Value(0))
+
+
+class Command(BaseCommand):
+    help = (
+        "Repair drift of the denormalized Team.member_count and "
+        "Channel.member_count counters (one bulk UPDATE per model)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows have drifted",
+        )
+
+    def handle(self, *args, **options):
+        targets = (
+            (Team, TeamMembership, "team"),
+            (Channel, ChannelMembership, "channel"),
+        )
+        with transaction.atomic():
+            for model, membership_model, field in targets:
+                actual = _actual_count(membership_model, field)
+                # soft-deleted channels keep their counters too
+                drifted = model._base_manager.alias(actual=actual).exclude(
+                    member_count=actual
+                )
+                if options["dry_run"]:
+                    repaired = drifted.count()
+                else:
+                    repaired = drifted.update(member_count=actual)
+                self.stdout.write(
+                    f"{model._meta.verbose_name_plural}: {repaired} drifted"
+                    + ("" if options["dry_run"] else " (repaired)")
+                )
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:34
+
+from django.db import migrations, models
+
+
+def backfill_member_count(apps, schema_editor):
+    Channel = apps.get_model('channels', 'Channel')
+    ChannelMembership = apps.get_model('channels', 'ChannelMembership')
+    members = ChannelMembership.objects.filter(
+        channel=models.OuterRef('pk')
+    ).order_by().values('channel').annotate(
+        total=models.Count('id')
+    ).values('total')
+    Channel.objects.update(
+        member_count=models.functions.Coalesce(models.Subquery(members), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('channels', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='channel',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_member_count, migrations.RunPython.noop),
+    ]
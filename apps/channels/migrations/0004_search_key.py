@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+from apps.abstract.search import backfill_search_keys, trigram_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('channels', '0003_member_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='channel',
+            name='search_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Normalized search text, maintained on save', max_length=255),
+        ),
+        migrations.RunPython(
+            backfill_search_keys('channels', 'Channel', ('name',)),
+            migrations.RunPython.noop,
+        ),
+        # PostgreSQL only: substring search through pg_trgm
+        migrations.RunPython(*trigram_index('channels_channel', 'channels_channel_search_key_trgm')),
+    ]
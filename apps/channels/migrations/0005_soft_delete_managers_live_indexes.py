@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('channels', '0004_search_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='channel',
+            name='channels_ch_team_id_33e535_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='channel',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='channel',
+            name='search_key',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized search text, maintained on save', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='channel',
+            index=models.Index(condition=models.Q(('delete_at__isnull', True)), fields=['search_key'], name='channels_live_search_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='channel',
+            constraint=models.UniqueConstraint(condition=models.Q(('delete_at__isnull', True)), fields=('team', 'name'), name='channels_live_team_name_uniq'),
+        ),
+    ]
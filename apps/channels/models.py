@@ -9,14 +9,53 @@ from django.db.models import (
     BooleanField,
     CASCADE,
     Index,
-    ManyToManyField
+    ManyToManyField,
+    Q,
+    Exists,
+    OuterRef,
+    Case,
+    When,
+    IntegerField,
+    PositiveIntegerField,
+    F,
+    UniqueConstraint,
 )
+from django.db import transaction
 # Project imports
-from apps.abstract.models import AbstractModel
+from apps.abstract.models import AbstractModel, LIVE, SoftDeleteManager, SoftDeleteQuerySet
 from apps.users.models import CustomUser
 from apps.team.models import Team
+from apps.abstract.search import SearchKeyMixin, search_key_field
 
-class  Channel(AbstractModel):
+
+class ChannelQuerySet(SoftDeleteQuerySet):
+
+    def visible_to(self, user_id: int) -> 'ChannelQuerySet':
+        """Public channels plus private ones the user is a member of (EXISTS, no join/DISTINCT)"""
+        return self.filter(
+            Q(is_private=False) | Exists(
+                ChannelMembership.objects.filter(
+                    channel_id=OuterRef('pk'),
+                    user_id=user_id,
+                )
+            )
+        )
+
+    def with_member_counts(self) -> 'ChannelQuerySet':
+        """
+        Annotate `members_total` from the denormalized counters:
+        channel members if private, team members otherwise
+        """
+        return self.annotate(
+            members_total=Case(
+                When(is_private=True, then=F('member_count')),
+                default=F('team__member_count'),
+                output_field=IntegerField(),
+            )
+        )
+
+
+class  Channel(SearchKeyMixin, AbstractModel):
     """
     Model representing a channel within a team
     Channels can be public (all team members) or private(selected members only) 
@@ -56,6 +95,17 @@ class  Channel(AbstractModel):
         help_text="Members with access (for private channels only)"
     )
 
+    #denormalized number of ChannelMembership rows, kept in sync by ChannelMembership
+    member_count = PositiveIntegerField(
+        default=0
+    )
+
+    search_key_sources = ('name',)
+    search_key = search_key_field(db_index=False)
+
+    objects = SoftDeleteManager.from_queryset(ChannelQuerySet)()
+    all_objects = ChannelQuerySet.as_manager()
+
     def __str__(self):
         """
         String representation of the Channel model.
@@ -66,12 +116,20 @@ class  Channel(AbstractModel):
     class Meta:
         verbose_name = "Channel"
         verbose_name_plural = "Channels"
-        unique_together = ('team', 'name')
         ordering = ['team', 'name']
+        constraints = [
+            # a deleted channel's name can be reused; also the live
+            # (team, name) index behind the channel list
+            UniqueConstraint(
+                fields=['team', 'name'],
+                condition=LIVE,
+                name='channels_live_team_name_uniq',
+            ),
+        ]
         indexes = [
             Index(fields=['team']),
-            Index(fields=['team', 'name']),
             Index(fields=['is_private']),
+            Index(fields=['search_key'], condition=LIVE, name='channels_live_search_key_idx'),
         ]
 
 
@@ -101,6 +159,27 @@ class ChannelMembership(Model):
         auto_now_add=True
     )
 
+    def save(self, *args, **kwargs):
+        """Save membership; a new one bumps channel's member_count atomically"""
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Channel.all_objects.filter(pk=self.channel_id).update(
+                member_count=F('member_count') + 1
+            )
+
+    def delete(self, *args, **kwargs):
+        """Delete membership and decrement channel's member_count in one transaction"""
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Channel.all_objects.filter(
+                pk=self.channel_id,
+                member_count__gt=0,
+            ).update(member_count=F('member_count') - 1)
+        return result
+
     def __str__(self):
         """
         String representation of the ChannelMembership model
@@ -5,6 +5,7 @@ from rest_framework.views import APIView
 
 #Project modules
 from apps.channels.models import Channel
+from apps.channels.access import get_access
 
 
 class IsTeamMember(BasePermission):
@@ -26,8 +27,8 @@ class IsTeamMember(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        # Check if user is member of the team
-        return obj.team.members.filter(id=request.user.id).exists()
+        # Check if user is member (or owner) of the team
+        return get_access(request).is_team_member_or_owner(obj.team_id)
     
 
 class IsChannelMember(BasePermission):
@@ -44,9 +45,11 @@ class IsChannelMember(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
         
-        #Public channel: check team membership
+        access = get_access(request)
+
+        #Public channel: check team membership (owners included)
         if not obj.is_private:
-            return obj.team.members.filter(id=request.user.id).exists()
+            return access.is_team_member_or_owner(obj.team_id)
 
         # Private channel: check channel membership
-        return obj.members.filter(id=request.user.id).exists()
\ No newline at end of file
+        return access.is_channel_member(obj.id)
@@ -1,6 +1,10 @@
 # Python import 
 import logging
 
+# Django import
+from django.db import transaction
+from django.db.models import Prefetch
+
 # Rest modules
 from rest_framework.serializers import (
     ModelSerializer,
@@ -8,6 +12,7 @@ from rest_framework.serializers import (
     ValidationError, 
     CharField,
     BooleanField,
+    IntegerField,
     PrimaryKeyRelatedField
 )
 
@@ -16,14 +21,31 @@ from .models import Channel, ChannelMembership
 from apps.team.models import Team
 from apps.users.models import CustomUser
 from apps.users.serializers import UserListSerializer
+from apps.messages import unread
+from apps.abstract.fieldsets import Collapsed, Requires, SparseFieldsMixin
 
 logger = logging.getLogger(__name__)
 
-class ChannelSerializer(ModelSerializer):
+class ChannelSerializer(SparseFieldsMixin, ModelSerializer):
     """
-    Read-only serializer for Channel
+    Read-only serializer for Channel, supports ?fields= / ?expand=members
     Used in: list, retrieve
     """
+    field_requirements = {
+        'team_name': Requires(select_related=('team',), only=('team__name',)),
+        'members_count': Requires(
+            select_related=('team',),
+            only=('is_private', 'member_count', 'team__member_count'),
+        ),
+    }
+    expandable_fields = {
+        'members': Collapsed(
+            lambda: PrimaryKeyRelatedField(many=True, read_only=True),
+            Requires(prefetch_related=(
+                Prefetch('members', queryset=CustomUser.objects.only('id')),
+            )),
+        ),
+    }
 
     team_name = SerializerMethodField()
     members_count = SerializerMethodField()
@@ -50,12 +72,61 @@ class ChannelSerializer(ModelSerializer):
     
     def get_members_count(self, obj: Channel) -> int:
         """Get count of private channel members"""
+        # denormalized counters, no COUNT per row
         if obj.is_private:
-            return obj.members.count()
+            return obj.member_count
         # For public channels, count all team members
-        return obj.team.members.count()
+        return obj.team.member_count
     
 
+class ChannelListSerializer(SparseFieldsMixin, ModelSerializer):
+    """
+    Channel directory row without the member list, supports ?fields=;
+    members_count comes from Channel.objects.with_member_counts().
+    Used in: list
+    """
+
+    team_name = CharField(source='team.name', read_only=True)
+    members_count = IntegerField(source='members_total', read_only=True)
+
+    class Meta:
+        model = Channel
+        fields = [
+            'id',
+            'name',
+            'description',
+            'team',
+            'team_name',
+            'is_private',
+            'members_count',
+            'create_at',
+            'update_at',
+        ]
+
+
+class ChannelSummarySerializer(ModelSerializer):
+    """
+    Compact serializer for Channel without the member list.
+    Used in: side-loaded channels of message lists
+    """
+
+    team_name = SerializerMethodField()
+
+    class Meta:
+        model = Channel
+        fields = [
+            'id',
+            'name',
+            'team',
+            'team_name',
+            'is_private',
+        ]
+
+    def get_team_name(self, obj: Channel) -> str:
+        """Get team name"""
+        return obj.team.name
+
+
 class CreateChannelSerializer(ModelSerializer):
     """
     Serializer for creating a Channel
@@ -122,7 +193,9 @@ class CreateChannelSerializer(ModelSerializer):
     def create(self, validated_data):
         """Create channel"""
         request = self.context.get('request')
-        channel = Channel.objects.create(**validated_data)
+        with transaction.atomic():
+            channel = Channel.objects.create(**validated_data)
+            unread.seed_channel(channel)
 
         logger.info(
             'Channel created: id=%s name=%s team%s by user=%s',
@@ -187,9 +260,14 @@ class UpdateChannelSerializer(ModelSerializer):
         """Update channel"""
         instance.name = validated_data.get('name', instance.name)
         instance.description = validated_data.get('description', instance.description)
+        was_private = instance.is_private
         instance.is_private = validated_data.get('is_private', instance.is_private)
 
-        instance.save(update_fields=['name', 'description', 'is_private'])
+        with transaction.atomic():
+            instance.save(update_fields=['name', 'description', 'is_private'])
+            if instance.is_private != was_private:
+                # audience changed: team members <-> channel members
+                unread.seed_channel(instance)
 
         logger.info(
             'Channel updated: id=%s name=%s',
@@ -264,7 +342,9 @@ class AddChannelMemberSerializer(ModelSerializer):
     
     def create(self, validated_data):
         """Create channel membership. """
-        membership = ChannelMembership.objects.create(**validated_data)
+        with transaction.atomic():
+            membership = ChannelMembership.objects.create(**validated_data)
+            unread.seed_channel_member(membership.channel_id, membership.user_id)
 
         logger.info(
             'Channel member added: channel=%s user=%s',
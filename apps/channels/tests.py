@@ -1,3 +1,198 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.team.models import Team, TeamMembership
+from apps.users.models import CustomUser
+from .access import get_access, get_user_access
+from .models import Channel, ChannelMembership
+
+
+def make_user(name: str) -> CustomUser:
+    return CustomUser.objects.create_user(
+        email=f"{name}@example.com",
+        password="password123",
+        first_name=name,
+        last_name="Test",
+    )
+
+
+class ChannelOwnerTests(TestCase):
+
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_owner_lists_channels_of_own_team(self):
+        response = self.client.post("/api/teams/", {"name": "Core"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        team = Team.objects.get(name="Core")
+        self.assertFalse(TeamMembership.objects.filter(team=team, user=self.owner).exists())
+
+        response = self.client.post(
+            "/api/channels/", {"team": team.id, "name": "general"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(f"/api/channels/?team_id={team.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([channel["name"] for channel in response.json()["data"]], ["general"])
+
+    def test_owner_manages_own_channel(self):
+        response = self.client.post("/api/teams/", {"name": "Core"}, format="json")
+        team = Team.objects.get(name="Core")
+        channel_id = self.client.post(
+            "/api/channels/", {"team": team.id, "name": "general"}, format="json"
+        ).json()["data"]["id"]
+        url = f"/api/channels/{channel_id}/"
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        response = self.client.patch(url, {"description": "Everything"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["description"], "Everything")
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(Channel.objects.filter(pk=channel_id).exists())
+
+    def test_owner_manages_private_channel_members(self):
+        team = Team.objects.create(name="Core", owner=self.owner)
+        bob = make_user("bob")
+        TeamMembership.objects.create(team=team, user=bob)
+        private = Channel.objects.create(team=team, name="secret", is_private=True)
+        url = f"/api/channels/{private.id}/members/"
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.post(url, {"user": bob.id}, format="json").status_code, 201)
+        self.assertEqual(self.client.delete(url, {"user_id": bob.id}, format="json").status_code, 204)
+
+    def test_outsider_is_refused(self):
+        team = Team.objects.create(name="Core", owner=self.owner)
+        Channel.objects.create(team=team, name="general")
+        outsider = APIClient()
+        outsider.force_authenticate(make_user("outsider"))
+
+        response = outsider.get(f"/api/channels/?team_id={team.id}")
+        self.assertEqual(response.status_code, 404)
+
+
+class AccessInvalidationTests(TestCase):
+    """Membership and ownership changes apply to the user's next request"""
+
+    # queries of a repeated lookup: no cache across requests by default
+    repeat_lookup_queries = 3
+
+    def setUp(self):
+        cache.clear()
+        self.owner = make_user("owner")
+        self.bob = make_user("bob")
+        self.team = Team.objects.create(name="Core", owner=self.owner)
+        self.channel = Channel.objects.create(team=self.team, name="general")
+        self.private = Channel.objects.create(team=self.team, name="secret", is_private=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.bob)
+
+    def list_status(self) -> int:
+        return self.client.get(f"/api/channels/?team_id={self.team.id}").status_code
+
+    def test_repeated_lookup(self):
+        get_user_access(self.bob)
+        with self.assertNumQueries(self.repeat_lookup_queries):
+            get_user_access(self.bob)
+
+    def test_memoized_per_request(self):
+        request = APIRequestFactory().get("/api/channels/")
+        request.user = self.bob
+        access = get_access(request)
+        with self.assertNumQueries(0):
+            self.assertIs(get_access(request), access)
+
+    def test_joining_and_leaving_team(self):
+        self.assertEqual(self.list_status(), 404)
+        membership = TeamMembership.objects.create(team=self.team, user=self.bob)
+        self.assertEqual(self.list_status(), 200)
+        membership.delete()
+        self.assertEqual(self.list_status(), 404)
+
+    def test_joining_and_leaving_private_channel(self):
+        TeamMembership.objects.create(team=self.team, user=self.bob)
+        url = f"/api/channels/{self.private.id}/"
+        self.assertEqual(self.client.get(url).status_code, 404)
+        membership = ChannelMembership.objects.create(channel=self.private, user=self.bob)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        membership.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_ownership_transfer(self):
+        self.assertEqual(self.list_status(), 404)
+        self.team.owner = self.bob
+        self.team.save()
+        self.assertEqual(self.list_status(), 200)
+
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.list_status(), 404)
+
+
+class SharedCacheAccessInvalidationTests(AccessInvalidationTests):
+    """Same changes with access cached across requests"""
+
+    repeat_lookup_queries = 0
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location,
+        }})
+        shared.enable()
+        self.addCleanup(shared.disable)
+        super().setUp()
+
+
+class MemberCountTests(TestCase):
+
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.team = Team.objects.create(name="Core", owner=self.owner)
+        self.public = Channel.objects.create(team=self.team, name="general")
+        self.private = Channel.objects.create(team=self.team, name="secret", is_private=True)
+        self.users = [make_user(f"user{n}") for n in range(3)]
+        for user in self.users:
+            TeamMembership.objects.create(team=self.team, user=user)
+        ChannelMembership.objects.create(channel=self.private, user=self.users[0])
+
+    def counts(self) -> dict[str, int]:
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+        response = client.get(f"/api/channels/?team_id={self.team.id}")
+        self.assertEqual(response.status_code, 200)
+        return {channel["name"]: channel["members_count"] for channel in response.json()["data"]}
+
+    def test_membership_create_and_delete(self):
+        membership = ChannelMembership.objects.create(channel=self.private, user=self.users[1])
+        self.private.refresh_from_db()
+        self.assertEqual(self.private.member_count, 2)
+
+        membership.delete()
+        self.private.refresh_from_db()
+        self.assertEqual(self.private.member_count, 1)
+
+    def test_public_channels_count_the_team(self):
+        self.assertEqual(self.counts(), {"general": 3, "secret": 1})
+
+    def test_reconcile_repairs_drift(self):
+        Team.objects.filter(pk=self.team.pk).update(member_count=10)
+        Channel.all_objects.filter(pk=self.private.pk).update(member_count=0)
+
+        out = StringIO()
+        call_command("reconcile_member_counts", "--dry-run", stdout=out)
+        self.assertIn("1 drifted", out.getvalue())
+        self.assertEqual(self.counts(), {"general": 10, "secret": 0})
+
+        call_command("reconcile_member_counts", stdout=StringIO())
+        self.assertEqual(self.counts(), {"general": 3, "secret": 1})
@@ -1,6 +1,9 @@
 # Python modules
 import logging
 
+# Django modules
+from django.db import transaction
+
 # Rest modules
 from rest_framework.response import Response
 from rest_framework.request import Request
@@ -18,6 +21,7 @@ from rest_framework.permissions import IsAuthenticated
 # Project modules
 from .serializers import (
     ChannelSerializer,
+    ChannelListSerializer,
     CreateChannelSerializer,
     UpdateChannelSerializer,
     ChannelMembershipSerializer,
@@ -25,6 +29,10 @@ from .serializers import (
 )
 from .models import Channel, ChannelMembership
 from .permissions import IsTeamMember, IsChannelMember
+from .access import get_access
+from apps.abstract.search import directory_search
+from apps.abstract.fieldsets import Fieldset
+from apps.messages import unread
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +40,9 @@ logger = logging.getLogger(__name__)
 class ChannelViewSet(ViewSet):
     """
     Channel endpoints:
-        GET    /api/channels/?team_id={id}  - list channels in team
+        GET    /api/channels/?team_id={id}  - list channels in team (?q=, ?include=members, ?fields=)
         POST   /api/channels/               - create channel
-        GET    /api/channels/{id}/          - retrieve channel
+        GET    /api/channels/{id}/          - retrieve channel (?fields=, ?expand=members)
         PATCH  /api/channels/{id}/          - update channel
         DELETE /api/channels/{id}/          - delete channel
         GET    /api/channels/{id}/members/  - list members (private only)
@@ -43,11 +51,15 @@ class ChannelViewSet(ViewSet):
     """
     
     permission_classes = [IsAuthenticated, IsTeamMember]
+    # read actions that only need the user id and staff flags (AUTH_STATELESS_READS)
+    stateless_auth_actions = ("list", "retrieve")
     
     def get_channel_or_404(self, pk: int) -> tuple[Channel | None, Response | None]:
         """Helper: returns (channel, None) or (None, 404 Response)"""
         try:
             channel = Channel.objects.select_related('team').get(pk=pk)
+            # object permissions (owner/admin/member) via apps.channels.access
+            self.check_object_permissions(self.request, channel)
             return channel, None
         except Channel.DoesNotExist:
             logger.warning('Channel not found: id=%s', pk)
@@ -78,33 +90,52 @@ class ChannelViewSet(ViewSet):
                 status=HTTP_400_BAD_REQUEST
             )
         
-        # Get channels - public ones + private ones where user is member
-        queryset = Channel.objects.filter(team_id=team_id).select_related('team')
-        
-        # Filter: show public channels OR private channels where user is member
         user = request.user
-        public_channels = queryset.filter(is_private=False)
-        private_channels = queryset.filter(
-            is_private=True,
-            members=user
-        )
-        
-        all_channels = (public_channels | private_channels).distinct().order_by('name')
-        
-        serializer = ChannelSerializer(all_channels, many=True)
-        
+        if not get_access(request).is_team_member_or_owner(team_id):
+            logger.warning(
+                'Channels list denied (not team member): team=%s user=%s',
+                team_id,
+                user.id
+            )
+            return Response(
+                {'error': 'You do not have access to this team.'},
+                status=HTTP_404_NOT_FOUND
+            )
+
+        # Member lists only on request: ?include=members
+        if 'members' in request.query_params.get('include', '').split(','):
+            serializer_class = ChannelSerializer
+        else:
+            serializer_class = ChannelListSerializer
+        fieldset = Fieldset.from_request(request, serializer_class)
+
+        # Public channels + private ones where user is member, one query
+        queryset = Channel.objects.filter(
+            team_id=team_id,
+        ).visible_to(user.id).with_member_counts().order_by('name')
+
+        # ?q= name search through the indexed directory search
+        search = request.query_params.get('q')
+        if search:
+            queryset = directory_search(queryset, search)
+
+        queryset = serializer_class.optimize_queryset(queryset, fieldset)
+        serializer = serializer_class(queryset, many=True, fieldset=fieldset)
+
+        data = serializer.data
+
         logger.info(
             'Channels listed: team=%s user=%s count=%s',
             team_id,
             user.id,
-            all_channels.count()
+            len(data)
         )
         
         return Response(
             {
                 'message': 'List of channels',
-                'count': all_channels.count(),
-                'data': serializer.data,
+                'count': len(data),
+                'data': data,
             },
             status=HTTP_200_OK
         )
@@ -114,19 +145,20 @@ class ChannelViewSet(ViewSet):
         GET /api/channels/{id}/
         Retrieve one channel.
         """
+        fieldset = Fieldset.from_request(request, ChannelSerializer)
         channel, error = self.get_channel_or_404(pk)
         if error:
             return error
         
         # Check permission: public OR user is member
         if channel.is_private:
-            if not channel.members.filter(id=request.user.id).exists():
+            if not get_access(request).is_channel_member(channel.id):
                 return Response(
                     {'error': 'You do not have access to this private channel.'},
                     status=HTTP_404_NOT_FOUND
                 )
         
-        serializer = ChannelSerializer(channel)
+        serializer = ChannelSerializer(channel, fieldset=fieldset)
         
         logger.info(
             'Channel retrieved: id=%s by user=%s',
@@ -363,7 +395,9 @@ class ChannelViewSet(ViewSet):
                 status=HTTP_404_NOT_FOUND
             )
         
-        membership.delete()
+        with transaction.atomic():
+            membership.delete()
+            unread.drop_channel_member(channel.id, membership.user_id)
         
         logger.info(
             'Channel member removed: channel=%s user=%s',
@@ -0,0 +1,157 @@
+# Message archival: whole threads untouched past the team's retention horizon
+# (Team.message_retention_days, default settings.MESSAGES_ARCHIVE_AFTER_DAYS)
+# are moved from Message to ArchivedMessage; MessageViewSet reads the archive
+# as a fallback. A thread moves only when every message in it was last updated
+# before the cutoff, so a late reply keeps the whole thread hot.
+#
+# Roots are walked by id in bounded batches, each batch is one short
+# transaction that re-checks the thread under lock before moving it.
+
+# Python modules
+import datetime
+from typing import Iterator
+
+# Django modules
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# Project modules
+from apps.channels.models import Channel
+from apps.team.models import Team
+from .models import Message, ArchivedMessage
+from .search import get_search_backend
+
+# Nothing younger than this is archived, whatever the retention says:
+# history pages newer than now - ARCHIVE_MIN_AGE never need the archive.
+ARCHIVE_MIN_AGE = datetime.timedelta(days=1)
+
+
+def may_be_archived(moment: datetime.datetime) -> bool:
+    """False when no archived message can be as new as `moment`"""
+    return moment < timezone.now() - ARCHIVE_MIN_AGE
+
+
+def message_cutoff(retention_days: int | None, now: datetime.datetime) -> datetime.datetime | None:
+    """Archive threads last touched before this moment; None - keep forever"""
+    if retention_days is None:
+        retention_days = settings.MESSAGES_ARCHIVE_AFTER_DAYS
+    if not retention_days:
+        return None
+    return now - max(datetime.timedelta(days=retention_days), ARCHIVE_MIN_AGE)
+
+
+def _chunks(ids: list[int], size: int) -> Iterator[list[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def stale_threads(root_ids: list[int], cutoff: datetime.datetime, chunk_size: int) -> list[int]:
+    """
+    Ids of every message in the threads of root_ids whose messages were all
+    last updated before cutoff (roots are assumed to be)
+    """
+    root_of = {pk: pk for pk in root_ids}
+    hot = set()
+    frontier = list(root_ids)
+    while frontier:
+        children = []
+        for chunk in _chunks(frontier, chunk_size):
+            children.extend(
+                Message.objects.filter(parent_message_id__in=chunk)
+                .values_list('id', 'parent_message_id', 'updated_at')
+            )
+        frontier = []
+        for pk, parent_id, updated_at in children:
+            root_of[pk] = root_of[parent_id]
+            if updated_at >= cutoff:
+                hot.add(root_of[pk])
+            frontier.append(pk)
+    return [pk for pk, root in root_of.items() if root not in hot]
+
+
+def _move(ids: list[int], cutoff: datetime.datetime, chunk_size: int) -> bool:
+    """Copy the messages to the archive and delete them; False if touched meanwhile"""
+    messages = []
+    for chunk in _chunks(ids, chunk_size):
+        messages.extend(Message.objects.filter(id__in=chunk).select_for_update())
+    if len(messages) != len(ids) or any(message.updated_at >= cutoff for message in messages):
+        return False
+    id_set = set(ids)
+    for chunk in _chunks(ids, chunk_size):
+        replies = Message.objects.filter(parent_message_id__in=chunk).values_list('id', flat=True)
+        if any(pk not in id_set for pk in replies):
+            return False
+
+    now = timezone.now()
+    fields = [field.attname for field in Message._meta.concrete_fields]
+    ArchivedMessage.objects.bulk_create(
+        [
+            ArchivedMessage(archived_at=now, **{name: getattr(message, name) for name in fields})
+            for message in messages
+        ],
+        batch_size=chunk_size,
+    )
+    get_search_backend().remove_messages(ids)
+    for chunk in _chunks(ids, chunk_size):
+        Message.objects.filter(id__in=chunk).delete()
+    return True
+
+
+def archive_threads(
+    scope: Q,
+    cutoff: datetime.datetime,
+    batch_size: int,
+    dry_run: bool = False,
+) -> Iterator[int]:
+    """
+    Move stale threads of the messages matching `scope` to ArchivedMessage.
+    Yields the number of messages archived per batch of roots.
+    """
+    roots = Message.objects.filter(scope, parent_message__isnull=True, updated_at__lt=cutoff)
+    last_id = 0
+    while True:
+        batch = list(
+            roots.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not batch:
+            return
+        last_id = batch[-1]
+        ids = stale_threads(batch, cutoff, batch_size)
+        if not ids:
+            continue
+        if not dry_run:
+            with transaction.atomic():
+                # touched since the scan: left for the next run
+                if not _move(ids, cutoff, batch_size):
+                    continue
+        yield len(ids)
+
+
+def archive_aged_messages(
+    batch_size: int,
+    dry_run: bool = False,
+) -> Iterator[tuple[int, int]]:
+    """Archive every team past its horizon; yields (team id, messages archived) per batch"""
+    now = timezone.now()
+    for team_id, retention_days in Team.objects.order_by('id').values_list('id', 'message_retention_days'):
+        cutoff = message_cutoff(retention_days, now)
+        if cutoff is None:
+            continue
+        scope = Q(channel_id__in=Channel.all_objects.filter(team_id=team_id).values('id'))
+        for count in archive_threads(scope, cutoff, batch_size, dry_run):
+            yield team_id, count
+
+
+def archive_deleted_channel_messages(
+    deleted_before: datetime.datetime,
+    batch_size: int,
+    dry_run: bool = False,
+) -> Iterator[int]:
+    """
+    Archive all messages of channels soft-deleted before `deleted_before`,
+    so the channels themselves can be purged
+    """
+    scope = Q(channel_id__in=Channel.all_objects.filter(delete_at__lt=deleted_before).values('id'))
+    return archive_threads(scope, timezone.now(), batch_size, dry_run)
@@ -0,0 +1,61 @@
+# Python modules
+import logging
+from collections import Counter
+
+# Django modules
+from django.db import transaction
+
+# Project modules
+from .models import Message
+from .realtime.broker import get_broker
+from .search import get_search_backend
+from . import unread
+
+logger = logging.getLogger(__name__)
+
+
+def _publish(kind: str, channel_id: int, data: dict) -> None:
+    """Fan the event out to subscribers once the transaction commits"""
+    event = {
+        "type": f"message.{kind}",
+        "channel": channel_id,
+        "data": data,
+    }
+    transaction.on_commit(lambda: get_broker().publish(channel_id, event))
+
+
+def message_created(message: Message) -> None:
+    """Called after a message is created"""
+    messages_created([message])
+
+
+def messages_created(messages: list[Message]) -> None:
+    """
+    Called after messages are created (one or a bulk batch):
+    one index call, one unread UPDATE per (channel, author)
+    """
+    from .serializers import MessageListSerializer
+    get_search_backend().index_messages(messages)
+    senders = Counter((m.channel_id, m.author_id) for m in messages)
+    for (channel_id, author_id), amount in senders.items():
+        unread.increment_unread(channel_id, author_id, amount)
+    for message in messages:
+        _publish("created", message.channel_id, MessageListSerializer(message).data)
+
+
+def message_updated(message: Message) -> None:
+    """Called after a message is edited"""
+    from .serializers import MessageListSerializer
+    get_search_backend().index_messages([message])
+    _publish("updated", message.channel_id, MessageListSerializer(message).data)
+
+
+def message_deleted(message: Message) -> None:
+    """Called after a message is soft deleted, in the same transaction"""
+    get_search_backend().remove_messages([message.id])
+    unread.decrement_unread(message.channel_id, message.id, message.author_id)
+    _publish(
+        "deleted",
+        message.channel_id,
+        {"id": message.id, "parent_message": message.parent_message_id},
+    )
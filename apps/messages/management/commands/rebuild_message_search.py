@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.messages.models import Message
+from apps.messages.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the message full-text search index in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Messages indexed per transaction",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        backend = get_search_backend()
+        backend.clear()
+
+        queryset = Message.objects.filter(
+            deleted_at__isnull=True
+        ).only("id", "channel_id", "content").order_by("id")
+
+        last_id = 0
+        total = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                backend.index_messages(batch)
+            last_id = batch[-1].id
+            total += len(batch)
+            self.stdout.write(f"Indexed {total} messages (last id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt: {total} messages"))
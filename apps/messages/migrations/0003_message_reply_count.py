@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:21
+
+from django.db import migrations, models
+
+
+def backfill_reply_count(apps, schema_editor):
+    Message = apps.get_model('messages_app', 'Message')
+    replies = Message.objects.filter(
+        parent_message=models.OuterRef('pk')
+    ).order_by().values('parent_message').annotate(
+        total=models.Count('id')
+    ).values('total')
+    parents = Message.objects.filter(
+        parent_message__isnull=False
+    ).values('parent_message')
+    Message.objects.filter(pk__in=parents).update(
+        reply_count=models.Subquery(replies)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0002_alter_message_author_alter_message_channel_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reply_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS messages_app_message_fts "
+            "USING fts5(content, channel_id UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE IF NOT EXISTS messages_app_message_search ("
+            "message_id bigint PRIMARY KEY "
+            "REFERENCES messages_app_message (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "channel_id integer NOT NULL, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS messages_app_message_search_document_gin "
+            "ON messages_app_message_search USING GIN (document)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS messages_app_message_search_channel_idx "
+            "ON messages_app_message_search (channel_id)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS messages_app_message_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP TABLE IF EXISTS messages_app_message_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0004_message_deleted_at'),
+    ]
+
+    operations = [
+        # Populate with: python manage.py rebuild_message_search
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
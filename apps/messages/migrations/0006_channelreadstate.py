@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def seed_read_states(apps, schema_editor):
+    """Existing audiences start with everything read"""
+    Channel = apps.get_model('channels', 'Channel')
+    ChannelMembership = apps.get_model('channels', 'ChannelMembership')
+    TeamMembership = apps.get_model('team', 'TeamMembership')
+    Message = apps.get_model('messages_app', 'Message')
+    ChannelReadState = apps.get_model('messages_app', 'ChannelReadState')
+
+    last_ids = dict(
+        Message.objects.order_by().values('channel_id').annotate(
+            last_id=models.Max('id')
+        ).values_list('channel_id', 'last_id')
+    )
+    batch = []
+    for channel in Channel.objects.filter(delete_at__isnull=True).iterator():
+        if channel.is_private:
+            user_ids = ChannelMembership.objects.filter(
+                channel_id=channel.id
+            ).values_list('user_id', flat=True)
+        else:
+            user_ids = TeamMembership.objects.filter(
+                team_id=channel.team_id
+            ).values_list('user_id', flat=True)
+        for user_id in user_ids:
+            batch.append(ChannelReadState(
+                user_id=user_id,
+                channel_id=channel.id,
+                last_read_message_id=last_ids.get(channel.id),
+            ))
+        if len(batch) >= 1000:
+            ChannelReadState.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    ChannelReadState.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('channels', '0002_initial'),
+        ('team', '0002_initial'),
+        ('messages_app', '0005_message_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChannelReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.BigIntegerField(blank=True, null=True)),
+                ('unread_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('channel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_states', to='channels.channel')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='channel_read_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Channel Read State',
+                'verbose_name_plural': 'Channel Read States',
+                'unique_together': {('user', 'channel')},
+            },
+        ),
+        migrations.RunPython(seed_read_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('channels', '0005_soft_delete_managers_live_indexes'),
+        ('messages_app', '0006_channelreadstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMessage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('reply_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, default=None, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('author', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_messages', to=settings.AUTH_USER_MODEL)),
+                ('channel', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_messages', to='channels.channel')),
+                ('parent_message', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='replies', to='messages_app.archivedmessage')),
+            ],
+            options={
+                'verbose_name': 'Archived Message',
+                'verbose_name_plural': 'Archived Messages',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['channel', '-created_at'], name='messages_ap_channel_8fdc82_idx'), models.Index(fields=['author'], name='messages_ap_author__e0a8d6_idx'), models.Index(fields=['parent_message'], name='messages_ap_parent__08f2e9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def seed_owner_read_states(apps, schema_editor):
+    """Team owners join the audience of their public channels, everything read"""
+    Channel = apps.get_model('channels', 'Channel')
+    Message = apps.get_model('messages_app', 'Message')
+    ChannelReadState = apps.get_model('messages_app', 'ChannelReadState')
+
+    last_ids = dict(
+        Message.objects.order_by().values('channel_id').annotate(
+            last_id=models.Max('id')
+        ).values_list('channel_id', 'last_id')
+    )
+    batch = []
+    channels = Channel.objects.filter(
+        delete_at__isnull=True,
+        is_private=False,
+    ).values_list('id', 'team__owner_id')
+    for channel_id, owner_id in channels.iterator():
+        batch.append(ChannelReadState(
+            user_id=owner_id,
+            channel_id=channel_id,
+            last_read_message_id=last_ids.get(channel_id),
+        ))
+        if len(batch) >= 1000:
+            ChannelReadState.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    ChannelReadState.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messages_app', '0007_archivedmessage'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_owner_read_states, migrations.RunPython.noop),
+    ]
@@ -6,9 +6,15 @@ from django.db.models import (
     AutoField, # Auto-increment integer primary key.
     ForeignKey,
     CASCADE, #If parent is deleted → delete children automatically. 
+    DO_NOTHING,
     Index, #“Make search faster.”
     DateTimeField,
+    PositiveIntegerField,
+    BigIntegerField,
+    F,
 )
+from django.db import transaction
+from django.utils import timezone as django_timezone
 #Project import 
 from apps.users.models import CustomUser
 from apps.channels.models import Channel
@@ -36,8 +42,13 @@ class Message(Model):
         related_name='replies' #Creates reverse access.
     )
 
+    #denormalized number of replies, kept in sync on reply create/delete
+    reply_count = PositiveIntegerField(default=0)
+
     created_at = DateTimeField(auto_now_add=True) #Set once when created.
     updated_at = DateTimeField(auto_now=True) #Updates automatically every save.
+    #soft delete: the row stays as a tombstone so clients can sync deletions
+    deleted_at = DateTimeField(null=True, blank=True, default=None)
 
     class Meta:
         verbose_name = "Message"
@@ -47,4 +58,119 @@ class Message(Model):
             Index(fields=['channel', '-created_at']),
             Index(fields=['author']),
             Index(fields=['parent_message']),
-        ]
\ No newline at end of file
+            Index(fields=['channel', 'updated_at']), #delta sync
+        ]
+
+    def save(self, *args, **kwargs):
+        """Save message; a new reply bumps parent's reply_count atomically"""
+        if not (self._state.adding and self.parent_message_id):
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Message.objects.filter(
+                pk=self.parent_message_id
+            ).update(
+                reply_count=F('reply_count') + 1,
+                updated_at=django_timezone.now(),
+            )
+
+    def delete(self, *args, **kwargs) -> None:
+        """
+        Soft delete: set deleted_at (and updated_at, so delta sync sees it)
+        and keep parent's reply_count in the same transaction
+        """
+        if self.deleted_at is not None:
+            return
+        with transaction.atomic():
+            self.deleted_at = django_timezone.now()
+            self.save(update_fields=['deleted_at', 'updated_at'])
+            if self.parent_message_id:
+                Message.objects.filter(
+                    pk=self.parent_message_id,
+                    reply_count__gt=0,
+                ).update(
+                    reply_count=F('reply_count') - 1,
+                    updated_at=django_timezone.now(),
+                )
+
+
+class ChannelReadState(Model):
+    """
+    Read position of a user in a channel plus a materialized unread counter.
+    One row per (user, channel) in the channel's audience;
+    new messages bump unread_count of the whole audience with one UPDATE.
+    """
+    user = ForeignKey(
+        CustomUser,
+        on_delete=CASCADE,
+        related_name='channel_read_states'
+    )
+    channel = ForeignKey(
+        Channel,
+        on_delete=CASCADE,
+        related_name='read_states'
+    )
+    #plain id, not a FK: deleting/archiving messages must not touch read states
+    last_read_message_id = BigIntegerField(null=True, blank=True)
+    unread_count = PositiveIntegerField(default=0)
+    updated_at = DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} in #{self.channel_id}: {self.unread_count} unread"
+
+    class Meta:
+        verbose_name = "Channel Read State"
+        verbose_name_plural = "Channel Read States"
+        #(user, channel) serves the badge query, the channel FK index
+        #serves the audience UPDATE on new messages
+        unique_together = ('user', 'channel')
+
+
+class ArchivedMessage(Model):
+    """
+    Cold storage for whole threads untouched past the team's retention
+    (see apps.messages.archive). Same ids and field names as Message, so
+    the read serializers and the history keyset work on both tables.
+    FKs are not enforced: the referenced rows may be purged later.
+    """
+    id = BigIntegerField(primary_key=True)
+    content = TextField()
+    author = ForeignKey(
+        CustomUser,
+        on_delete=DO_NOTHING,
+        db_constraint=False,
+        related_name='archived_messages'
+    )
+    channel = ForeignKey(
+        Channel,
+        on_delete=DO_NOTHING,
+        db_constraint=False,
+        related_name='archived_messages'
+    )
+    parent_message = ForeignKey(
+        'self',
+        on_delete=DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='replies'
+    )
+    reply_count = PositiveIntegerField(default=0)
+    created_at = DateTimeField()
+    updated_at = DateTimeField()
+    deleted_at = DateTimeField(null=True, blank=True, default=None)
+    archived_at = DateTimeField(default=django_timezone.now)
+
+    class Meta:
+        verbose_name = "Archived Message"
+        verbose_name_plural = "Archived Messages"
+        ordering = ['created_at']
+        indexes = [
+            Index(fields=['channel', '-created_at']),
+            Index(fields=['author']),
+            Index(fields=['parent_message']),
+        ]
+
+    def __str__(self):
+        return f"Archived message {self.id} in #{self.channel_id}"
@@ -0,0 +1,109 @@
+# Python modules
+import datetime
+import sys
+
+# Django modules
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# Rest modules
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+# Project modules
+from apps.abstract.pagination import KeysetPagination
+from .archive import may_be_archived
+
+
+class MessageCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for message history on (channel_id, created_at, id).
+    Without a cursor the newest page is returned;
+    `?before=` pages into older history, `?after=` fetches newer messages.
+    """
+
+    ordering = ('channel_id', 'created_at', 'id')
+    page_size = 50
+    max_page_size = 200
+    default_position = 'last'
+
+    def get_ordering(self, request: Request, queryset: QuerySet) -> tuple[str, ...]:
+        """
+        Inside one channel channel_id is constant,
+        so the keyset collapses to (created_at, id) on the
+        (channel, -created_at) index.
+        """
+        if request.query_params.get('channel'):
+            return ('created_at', 'id')
+        return self.ordering
+
+    def may_reach_archive(self) -> bool:
+        """
+        Whether archived messages can fall into this channel page: the archive
+        only holds messages older than ARCHIVE_MIN_AGE (apps.messages.archive),
+        so pages of recent history skip the archive query.
+        """
+        if self.forward:
+            return self.cursor is not None and may_be_archived(self.cursor[0])
+        return not self.has_more or not self.rows or may_be_archived(self.rows[0].created_at)
+
+
+class MessageSyncPagination(KeysetPagination):
+    """
+    Forward-only keyset over (updated_at, id) on the (channel, updated_at) index.
+    `?since=` takes the watermark of the previous sync or an ISO timestamp.
+
+    updated_at is set when the row is saved, not when its transaction
+    commits, so a slow write can appear later with an older updated_at.
+    The watermark therefore stops at the last row older than
+    MESSAGES_SYNC_SETTLE_SECONDS: newer rows are sent now and again on the
+    next sync (clients dedupe by id and updated_at). A write whose
+    transaction outlives the settle window can still be missed.
+    """
+
+    ordering = ('updated_at', 'id')
+    page_size = 200
+    max_page_size = 1000
+    default_position = 'first'
+
+    after_query_param = 'since'
+    before_query_param = None
+
+    def decode_cursor(self, cursor: str, model: type[Model], param: str) -> list:
+        try:
+            moment = parse_datetime(cursor)
+        except ValueError:
+            raise ValidationError({param: 'Invalid timestamp.'})
+        if moment is not None:
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment, datetime.timezone.utc)
+            # plain timestamp: everything strictly after it
+            return [moment, sys.maxsize]
+        return super().decode_cursor(cursor, model, param)
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        rows = super().paginate_queryset(queryset, request, view)
+        horizon = timezone.now() - datetime.timedelta(seconds=settings.MESSAGES_SYNC_SETTLE_SECONDS)
+        # rows are ascending: the settled ones are a prefix
+        self.settled = [row for row in rows if row.updated_at <= horizon]
+        if len(self.settled) < len(rows):
+            # caught up to the unsettled tail: sync again later, not right away
+            self.has_more = False
+        return rows
+
+    def get_watermark(self) -> str | None:
+        """Watermark for the next sync: last settled row seen, or the one we got"""
+        if self.settled:
+            return self.encode_cursor(self.settled[-1])
+        return self.request.query_params.get(self.after_query_param)
+
+
+class ThreadPagination(KeysetPagination):
+    """Replies of a thread, oldest first, keyset on (created_at, id)"""
+
+    ordering = ('created_at', 'id')
+    page_size = 50
+    max_page_size = 200
+    default_position = 'first'
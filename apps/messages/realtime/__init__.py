@@ -0,0 +1,3 @@
+from .consumer import websocket_application, WEBSOCKET_PATH
+
+__all__ = ["websocket_application", "WEBSOCKET_PATH"]
@@ -0,0 +1,137 @@
+# Python modules
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Any
+
+# Django modules
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "apps.messages.realtime.broker.LocalBackend"
+
+
+class Subscription:
+    """
+    Outbox of one WebSocket connection.
+    Bound to the event loop that created it, `put` is safe from any thread.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = False
+
+    def put(self, event: dict) -> None:
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # slow client: drop and let it resync over HTTP
+            self.lagged = True
+
+
+class BaseBackend:
+    """
+    Transport between Broker instances (one Broker per worker process).
+    A backend fans an event out to every attached Broker, which in turn
+    delivers it to its local subscribers.
+    """
+
+    def attach(self, broker: "Broker") -> None:
+        raise NotImplementedError
+
+    def detach(self, broker: "Broker") -> None:
+        raise NotImplementedError
+
+    def publish(self, channel_id: int, event: dict) -> None:
+        raise NotImplementedError
+
+
+class LocalBackend(BaseBackend):
+    """
+    In-process stand-in backend.
+    Several Brokers attached to one LocalBackend behave like several
+    workers sharing a pub/sub server, which is enough for local testing.
+    """
+
+    def __init__(self):
+        self._brokers: set["Broker"] = set()
+        self._lock = threading.Lock()
+
+    def attach(self, broker: "Broker") -> None:
+        with self._lock:
+            self._brokers.add(broker)
+
+    def detach(self, broker: "Broker") -> None:
+        with self._lock:
+            self._brokers.discard(broker)
+
+    def publish(self, channel_id: int, event: dict) -> None:
+        with self._lock:
+            brokers = list(self._brokers)
+        for broker in brokers:
+            broker.deliver(channel_id, event)
+
+
+class Broker:
+    """Per-process registry of channel subscriptions"""
+
+    def __init__(self, backend: BaseBackend):
+        self.backend = backend
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        backend.attach(self)
+
+    def subscribe(self, channel_id: int, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers[channel_id].add(subscription)
+
+    def unsubscribe(self, channel_id: int, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[channel_id]
+
+    def unsubscribe_all(self, subscription: Subscription) -> None:
+        with self._lock:
+            for channel_id in [
+                key for key, subs in self._subscribers.items() if subscription in subs
+            ]:
+                self._subscribers[channel_id].discard(subscription)
+                if not self._subscribers[channel_id]:
+                    del self._subscribers[channel_id]
+
+    def publish(self, channel_id: int, event: dict) -> None:
+        self.backend.publish(channel_id, event)
+
+    def deliver(self, channel_id: int, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel_id, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+
+_broker: Broker | None = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> Broker:
+    """Process-wide broker on the backend from settings.MESSAGES_BROKER_BACKEND"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, "MESSAGES_BROKER_BACKEND", DEFAULT_BACKEND)
+                backend: Any = import_string(path)()
+                _broker = Broker(backend)
+                logger.info("Message broker started: backend=%s", path)
+    return _broker
@@ -0,0 +1,166 @@
+# Python modules
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qs
+
+# Django modules
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+
+# Rest modules
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+# Project modules
+from apps.users.models import CustomUser
+from apps.channels.models import Channel
+from apps.channels.access import get_user_access
+from .broker import Subscription, get_broker
+
+logger = logging.getLogger(__name__)
+
+WEBSOCKET_PATH = "/ws/messages/"
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+
+
+def _resolve_user(raw_token: str) -> CustomUser | None:
+    """Validate an access token and load its active user"""
+    close_old_connections()
+    try:
+        token = AccessToken(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+        return CustomUser.objects.filter(pk=user_id, is_active=True).first()
+    except (TokenError, KeyError):
+        return None
+    finally:
+        close_old_connections()
+
+
+def _can_subscribe(user: CustomUser, channel_id: int) -> bool:
+    """Same rule as the message endpoints (see apps.channels.access)"""
+    close_old_connections()
+    try:
+        access = get_user_access(user)
+        return Channel.objects.filter(
+            access.channel_q(),
+            pk=channel_id,
+        ).exists()
+    finally:
+        close_old_connections()
+
+
+def _get_token(scope: dict) -> str | None:
+    query = parse_qs(scope.get("query_string", b"").decode())
+    if query.get("token"):
+        return query["token"][0]
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0] in jwt_settings.AUTH_HEADER_TYPES:
+                return parts[1]
+    return None
+
+
+async def _send_json(send, payload: dict) -> None:
+    await send({
+        "type": "websocket.send",
+        "text": json.dumps(payload, cls=DjangoJSONEncoder),
+    })
+
+
+async def websocket_application(scope: dict, receive, send) -> None:
+    """
+    WS /ws/messages/?token=<access token>
+
+    Client frames:
+        {"action": "subscribe", "channel": <id>}
+        {"action": "unsubscribe", "channel": <id>}
+    Server frames:
+        {"type": "subscribed" | "unsubscribed" | "error", ...}
+        {"type": "message.created" | "message.updated" | "message.deleted",
+         "channel": <id>, "data": {...}}
+        {"type": "resync"} - events were dropped, refetch over HTTP
+    """
+    event = await receive()
+    if event["type"] != "websocket.connect":
+        return
+
+    if scope["path"] != WEBSOCKET_PATH:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_FOUND})
+        return
+
+    token = _get_token(scope)
+    user = await sync_to_async(_resolve_user)(token) if token else None
+    if user is None:
+        await send({"type": "websocket.close", "code": CLOSE_UNAUTHORIZED})
+        return
+
+    await send({"type": "websocket.accept"})
+    logger.info("WebSocket connected: user=%s", user.id)
+
+    broker = get_broker()
+    subscription = Subscription()
+    receiving = asyncio.ensure_future(receive())
+    outgoing = asyncio.ensure_future(subscription.queue.get())
+
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {receiving, outgoing},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if outgoing in done:
+                await _send_json(send, outgoing.result())
+                if subscription.lagged:
+                    subscription.lagged = False
+                    await _send_json(send, {"type": "resync"})
+                outgoing = asyncio.ensure_future(subscription.queue.get())
+
+            if receiving in done:
+                event = receiving.result()
+                if event["type"] == "websocket.disconnect":
+                    break
+                await _handle_frame(event, user, broker, subscription, send)
+                receiving = asyncio.ensure_future(receive())
+    finally:
+        receiving.cancel()
+        outgoing.cancel()
+        broker.unsubscribe_all(subscription)
+        logger.info("WebSocket disconnected: user=%s", user.id)
+
+
+async def _handle_frame(event: dict, user, broker, subscription, send) -> None:
+    try:
+        frame = json.loads(event.get("text") or "")
+        action = frame["action"]
+        channel_id = int(frame["channel"])
+    except (ValueError, TypeError, KeyError):
+        await _send_json(send, {"type": "error", "error": "Invalid frame."})
+        return
+
+    if action == "subscribe":
+        if not await sync_to_async(_can_subscribe)(user, channel_id):
+            logger.warning(
+                "WebSocket subscribe denied: user=%s channel=%s",
+                user.id,
+                channel_id,
+            )
+            await _send_json(send, {
+                "type": "error",
+                "channel": channel_id,
+                "error": "You have no access to this channel.",
+            })
+            return
+        broker.subscribe(channel_id, subscription)
+        await _send_json(send, {"type": "subscribed", "channel": channel_id})
+    elif action == "unsubscribe":
+        broker.unsubscribe(channel_id, subscription)
+        await _send_json(send, {"type": "unsubscribed", "channel": channel_id})
+    else:
+        await _send_json(send, {"type": "error", "error": "Unknown action."})
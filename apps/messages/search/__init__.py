@@ -0,0 +1,40 @@
+# Python modules
+import logging
+
+# Django modules
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Project modules
+from .base import BaseSearchBackend, SearchHit
+
+logger = logging.getLogger(__name__)
+
+# DB_ENGINE (settings/conf.py) -> search backend
+SEARCH_BACKENDS = {
+    "django.db.backends.sqlite3": "apps.messages.search.sqlite.SQLiteSearchBackend",
+    "django.db.backends.postgresql": "apps.messages.search.postgres.PostgresSearchBackend",
+    "django.db.backends.postgresql_psycopg2": "apps.messages.search.postgres.PostgresSearchBackend",
+}
+# any other engine: no index, icontains scan
+FALLBACK_SEARCH_BACKEND = "apps.messages.search.fallback.ScanSearchBackend"
+
+_backend: BaseSearchBackend | None = None
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """Message search backend for the configured DB_ENGINE, resolved once per process"""
+    global _backend
+    if _backend is None:
+        path = SEARCH_BACKENDS.get(settings.DB_ENGINE)
+        if path is None:
+            logger.warning(
+                "No full-text message search for DB_ENGINE=%s, falling back to a scan",
+                settings.DB_ENGINE,
+            )
+            path = FALLBACK_SEARCH_BACKEND
+        _backend = import_string(path)()
+    return _backend
+
+
+__all__ = ["BaseSearchBackend", "SearchHit", "get_search_backend"]
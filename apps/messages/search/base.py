@@ -0,0 +1,67 @@
+# Python modules
+import re
+from dataclasses import dataclass
+from typing import Iterable, Protocol
+
+# Django modules
+from django.utils.html import escape
+
+# Markers put around matches by the database, swapped for <mark> after escaping
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class Indexable(Protocol):
+    id: int
+    channel_id: int
+    content: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    message_id: int
+    rank: float
+    snippet: str
+
+
+class BaseSearchBackend:
+    """
+    Full-text index over Message.content.
+    Every method runs on the default connection, so index writes
+    share the transaction of the message write that caused them.
+    """
+
+    def index_messages(self, messages: Iterable[Indexable]) -> None:
+        """Insert or replace index entries"""
+        raise NotImplementedError
+
+    def remove_messages(self, message_ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def search(
+        self,
+        query: str,
+        channel_ids: list[int],
+        limit: int,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        """Best match first; only messages in channel_ids"""
+        raise NotImplementedError
+
+    @staticmethod
+    def tokenize(query: str) -> list[str]:
+        return TOKEN_RE.findall(query)
+
+    @staticmethod
+    def highlight(raw: str) -> str:
+        """HTML-escape a snippet and turn the raw markers into <mark> tags"""
+        return escape(raw).replace(
+            HIGHLIGHT_START, "<mark>"
+        ).replace(
+            HIGHLIGHT_STOP, "</mark>"
+        )
@@ -0,0 +1,77 @@
+# Python modules
+from typing import Iterable
+
+# Project modules
+from .base import (
+    BaseSearchBackend,
+    Indexable,
+    SearchHit,
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+)
+
+SNIPPET_CONTEXT = 60
+
+
+class ScanSearchBackend(BaseSearchBackend):
+    """
+    Backend for databases without a full-text backend here: no index,
+    search scans Message.content with icontains (every token must match),
+    newest first; all hits rank 0.
+    """
+
+    def index_messages(self, messages: Iterable[Indexable]) -> None:
+        pass
+
+    def remove_messages(self, message_ids: Iterable[int]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def search(
+        self,
+        query: str,
+        channel_ids: list[int],
+        limit: int,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        # Project modules
+        from apps.messages.models import Message
+
+        tokens = self.tokenize(query)
+        if not tokens or not channel_ids:
+            return []
+
+        queryset = Message.objects.filter(
+            channel_id__in=channel_ids,
+            deleted_at__isnull=True,
+        )
+        for token in tokens:
+            queryset = queryset.filter(content__icontains=token)
+        rows = queryset.order_by("-id").values_list("id", "content")[offset:offset + limit]
+        return [
+            SearchHit(
+                message_id=message_id,
+                rank=0.0,
+                snippet=self.highlight(self.snippet(content, tokens[0])),
+            )
+            for message_id, content in rows
+        ]
+
+    @staticmethod
+    def snippet(content: str, token: str) -> str:
+        """Text around the first match of token, match wrapped in the raw markers"""
+        start = content.lower().find(token.lower())
+        if start < 0:
+            return content[:SNIPPET_CONTEXT * 2]
+        stop = start + len(token)
+        before = max(start - SNIPPET_CONTEXT, 0)
+        after = stop + SNIPPET_CONTEXT
+        return (
+            ("…" if before else "")
+            + content[before:start]
+            + HIGHLIGHT_START + content[start:stop] + HIGHLIGHT_STOP
+            + content[stop:after]
+            + ("…" if after < len(content) else "")
+        )
@@ -0,0 +1,93 @@
+# Python modules
+from typing import Iterable
+
+# Django modules
+from django.conf import settings
+from django.db import connection
+
+# Project modules
+from .base import (
+    BaseSearchBackend,
+    Indexable,
+    SearchHit,
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+)
+
+SEARCH_TABLE = "messages_app_message_search"
+MESSAGE_TABLE = "messages_app_message"
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL backend: one tsvector row per message in a side table
+    with a GIN index; ranking is ts_rank, snippets come from ts_headline.
+    """
+
+    @property
+    def config(self) -> str:
+        return getattr(settings, "MESSAGES_SEARCH_CONFIG", "english")
+
+    def index_messages(self, messages: Iterable[Indexable]) -> None:
+        rows = [(m.id, m.channel_id, self.config, m.content) for m in messages]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (message_id, channel_id, document) "
+                f"VALUES (%s, %s, to_tsvector(%s::regconfig, %s)) "
+                f"ON CONFLICT (message_id) DO UPDATE "
+                f"SET channel_id = EXCLUDED.channel_id, document = EXCLUDED.document",
+                rows,
+            )
+
+    def remove_messages(self, message_ids: Iterable[int]) -> None:
+        ids = list(message_ids)
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE message_id = ANY(%s)",
+                [ids],
+            )
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {SEARCH_TABLE}")
+
+    def search(
+        self,
+        query: str,
+        channel_ids: list[int],
+        limit: int,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        if not self.tokenize(query) or not channel_ids:
+            return []
+
+        headline_options = (
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+            f"MaxWords=24, MinWords=8, MaxFragments=1"
+        )
+        sql = (
+            f"SELECT s.message_id, ts_rank(s.document, q) AS rank, "
+            f"ts_headline(%s::regconfig, m.content, q, %s) "
+            f"FROM {SEARCH_TABLE} s "
+            f"JOIN {MESSAGE_TABLE} m ON m.id = s.message_id, "
+            f"websearch_to_tsquery(%s::regconfig, %s) q "
+            f"WHERE s.document @@ q AND s.channel_id = ANY(%s) "
+            f"ORDER BY rank DESC, s.message_id DESC LIMIT %s OFFSET %s"
+        )
+        params = [
+            self.config, headline_options,
+            self.config, query,
+            list(channel_ids), limit, offset,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        return [
+            SearchHit(message_id=row[0], rank=row[1], snippet=self.highlight(row[2]))
+            for row in rows
+        ]
@@ -0,0 +1,87 @@
+# Python modules
+from typing import Iterable
+
+# Django modules
+from django.db import connection
+
+# Project modules
+from .base import (
+    BaseSearchBackend,
+    Indexable,
+    SearchHit,
+    HIGHLIGHT_START,
+    HIGHLIGHT_STOP,
+)
+
+FTS_TABLE = "messages_app_message_fts"
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 backend.
+    rowid of the FTS table is the message id, channel_id is stored
+    UNINDEXED for scoping; ranking is bm25 (lower is better).
+    """
+
+    def index_messages(self, messages: Iterable[Indexable]) -> None:
+        rows = [(m.id, m.content, m.channel_id) for m in messages]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                [(row[0],) for row in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, content, channel_id) VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def remove_messages(self, message_ids: Iterable[int]) -> None:
+        ids = [(message_id,) for message_id in message_ids]
+        if not ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", ids)
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def build_match(self, query: str) -> str:
+        """Quote every token (no FTS syntax from users), prefix-match the last"""
+        tokens = self.tokenize(query)
+        if not tokens:
+            return ""
+        quoted = [f'"{token}"' for token in tokens]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def search(
+        self,
+        query: str,
+        channel_ids: list[int],
+        limit: int,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        match = self.build_match(query)
+        if not match or not channel_ids:
+            return []
+
+        placeholders = ", ".join(["%s"] * len(channel_ids))
+        sql = (
+            f"SELECT rowid, bm25({FTS_TABLE}) AS rank, "
+            f"snippet({FTS_TABLE}, 0, %s, %s, '…', 16) "
+            f"FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND channel_id IN ({placeholders}) "
+            f"ORDER BY rank LIMIT %s OFFSET %s"
+        )
+        params = [HIGHLIGHT_START, HIGHLIGHT_STOP, match, *channel_ids, limit, offset]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        return [
+            SearchHit(message_id=row[0], rank=-row[1], snippet=self.highlight(row[2]))
+            for row in rows
+        ]
@@ -1,41 +1,173 @@
 # Python imports
 import logging
+from collections import Counter
+
+# Django imports
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
 # DRF imports
 from rest_framework.serializers import (
+    Serializer,
     ModelSerializer,
+    ListField,
+    DictField,
     SerializerMethodField,
     ValidationError,
     CharField,
+    IntegerField,
     PrimaryKeyRelatedField,
 )
 
 # Project imports
 from .models import Message
+from . import hooks
 from apps.users.serializers import UserListSerializer
 from apps.channels.models import Channel
-from apps.channels.serializers import ChannelSerializer
+from apps.channels.access import get_access
+from apps.channels.serializers import ChannelSerializer, ChannelSummarySerializer
+from apps.abstract.fieldsets import Collapsed, SparseFieldsMixin
 
 logger = logging.getLogger(__name__)
 
 
-class MessageSerializer(ModelSerializer):
+class MessageSerializer(SparseFieldsMixin, ModelSerializer):
     """
-    Read-only serializer for Message.
+    Read-only serializer for Message, supports ?fields= / ?expand=author,channel
     Used in: list, retrieve
     """
+    expandable_fields = {
+        'author': Collapsed(lambda: PrimaryKeyRelatedField(read_only=True)),
+        'channel': Collapsed(lambda: PrimaryKeyRelatedField(read_only=True)),
+    }
 
     author = UserListSerializer(read_only=True)
     channel = ChannelSerializer(read_only=True)
 
-    replies_count = SerializerMethodField()
+    # denormalized counter, no per-row COUNT query
+    replies_count = IntegerField(source="reply_count", read_only=True)
 
     class Meta:
         model = Message
-        fields = "__all__"
+        fields = [
+            "id",
+            "content",
+            "author",
+            "channel",
+            "parent_message",
+            "replies_count",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class MessageListSerializer(SparseFieldsMixin, ModelSerializer):
+    """
+    Compact serializer for Message: author and channel are ids only,
+    their details are side-loaded once per response (see build_included).
+    Supports ?fields=.
+    Used in: list
+    """
+
+    replies_count = IntegerField(source="reply_count", read_only=True)
+
+    class Meta:
+        model = Message
+        fields = [
+            "id",
+            "content",
+            "author",
+            "channel",
+            "parent_message",
+            "replies_count",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class ThreadMessageSerializer(MessageListSerializer):
+    """
+    Reply inside a thread with its depth below the root.
+    Used in: thread
+    """
+
+    depth = SerializerMethodField()
+
+    class Meta(MessageListSerializer.Meta):
+        fields = MessageListSerializer.Meta.fields + ["depth"]
 
-    def get_replies_count(self, obj):
-        return obj.replies.count()
+    def get_depth(self, obj: Message) -> int:
+        return getattr(obj, "depth", 1)
+
+
+class MessageSyncSerializer(MessageListSerializer):
+    """
+    Delta sync row: live messages as in the list,
+    soft-deleted ones as tombstones without content.
+    Used in: sync
+    """
+
+    class Meta(MessageListSerializer.Meta):
+        fields = MessageListSerializer.Meta.fields + ["deleted_at"]
+
+    def to_representation(self, instance: Message) -> dict:
+        if instance.deleted_at is None:
+            return super().to_representation(instance)
+        return {
+            "id": instance.id,
+            "channel": instance.channel_id,
+            "parent_message": instance.parent_message_id,
+            "deleted_at": self.fields["deleted_at"].to_representation(instance.deleted_at),
+            "updated_at": self.fields["updated_at"].to_representation(instance.updated_at),
+        }
+
+
+INCLUDED_SECTIONS = {"author": "authors", "channel": "channels"}
+
+
+def build_included(
+    messages: list[Message],
+    include_members: bool = False,
+    expand: frozenset[str] | None = None,
+) -> dict:
+    """
+    Deduplicated channels and authors referenced by a page of messages,
+    keyed by id. Channel member lists are only added on request.
+    `expand` - sections to build ("author", "channel"), None - all.
+    """
+    authors = {}
+    channels = {}
+    for message in messages:
+        if expand is None or "author" in expand:
+            authors.setdefault(message.author_id, message.author)
+        if expand is None or "channel" in expand:
+            channels.setdefault(message.channel_id, message.channel)
+
+    if not channels:
+        channel_data = []
+    elif include_members:
+        channel_qs = Channel.objects.filter(
+            pk__in=channels.keys()
+        ).with_member_counts().select_related("team").prefetch_related("members")
+        channel_data = ChannelSerializer(channel_qs, many=True).data
+    else:
+        channel_data = ChannelSummarySerializer(channels.values(), many=True).data
+
+    included = {
+        "channels": {item["id"]: item for item in channel_data},
+        "authors": {
+            item["id"]: item
+            for item in UserListSerializer(authors.values(), many=True).data
+        },
+    }
+    if expand is None:
+        return included
+    return {
+        section: included[section]
+        for name, section in INCLUDED_SECTIONS.items() if name in expand
+    }
 
 
 class CreateMessageSerializer(ModelSerializer):
@@ -49,7 +181,7 @@ class CreateMessageSerializer(ModelSerializer):
     channel = PrimaryKeyRelatedField(queryset=Channel.objects.all())
 
     parent_message = PrimaryKeyRelatedField(
-        queryset=Message.objects.all(),
+        queryset=Message.objects.filter(deleted_at__isnull=True),
         required=False,
         allow_null=True,
     )
@@ -76,10 +208,10 @@ class CreateMessageSerializer(ModelSerializer):
         if not user or not user.is_authenticated:
             raise ValidationError("Authentication error")
 
-        # 2) Permission check (user must be in team)
-        if not channel.team.members.filter(id=user.id).exists():
+        # 2) Permission check (user must be in team, and in the channel if private)
+        if not get_access(request).can_access_channel(channel):
             logger.warning(
-                "Message create denied (not team member): user=%s channel=%s team=%s",
+                "Message create denied (no channel access): user=%s channel=%s team=%s",
                 user.id,
                 channel.id,
                 channel.team_id,
@@ -104,10 +236,12 @@ class CreateMessageSerializer(ModelSerializer):
     def create(self, validation_data: dict) -> Message:
         request = self.context.get("request")
 
-        message = Message.objects.create(
-            author = request.user,
-            **validation_data
-        )
+        with transaction.atomic():
+            message = Message.objects.create(
+                author = request.user,
+                **validation_data
+            )
+            hooks.message_created(message)
 
         logger.info(
             "message created: id=%s channel=%s author=%s parent=%s",
@@ -115,7 +249,110 @@ class CreateMessageSerializer(ModelSerializer):
         )
 
         return message
-    
+
+
+class BulkMessageItemSerializer(Serializer):
+    """
+    One item of a bulk create; shape only, access is checked per batch.
+    Used in: bulk
+    """
+
+    content = CharField(min_length=1, trim_whitespace=True)
+    channel = IntegerField(min_value=1)
+    parent_message = IntegerField(min_value=1, required=False, allow_null=True)
+
+
+class BulkCreateMessageSerializer(Serializer):
+    """
+    Bulk create of messages for integrations and imports.
+    Access is checked once per distinct channel, parents are loaded in one
+    query and valid items are inserted with one bulk_create.
+    save() returns per-item results in request order.
+    Used in: bulk
+    """
+
+    messages = ListField(child=DictField(), allow_empty=False)
+
+    def validate_messages(self, value: list) -> list:
+        limit = settings.MESSAGES_BULK_MAX_ITEMS
+        if len(value) > limit:
+            raise ValidationError(f"At most {limit} messages per request.")
+        return value
+
+    def _accessible_channel_ids(self, channel_ids: set[int]) -> set[int]:
+        access = get_access(self.context["request"])
+        return set(Channel.objects.filter(
+            access.channel_q(),
+            pk__in=channel_ids,
+        ).values_list("id", flat=True))
+
+    def create(self, validated_data: dict) -> list[dict]:
+        user = self.context["request"].user
+        results: list[dict] = []
+        items: list[tuple[int, dict]] = []
+
+        for index, raw in enumerate(validated_data["messages"]):
+            item = BulkMessageItemSerializer(data=raw)
+            if item.is_valid():
+                items.append((index, item.validated_data))
+                results.append(None)
+            else:
+                results.append({"index": index, "status": "error", "errors": item.errors})
+
+        channel_ids = self._accessible_channel_ids(
+            {data["channel"] for _, data in items}
+        )
+        parent_channels = dict(Message.objects.filter(
+            pk__in={data["parent_message"] for _, data in items if data.get("parent_message")},
+            deleted_at__isnull=True,
+        ).values_list("id", "channel_id"))
+
+        pending: list[tuple[int, Message]] = []
+        for index, data in items:
+            channel_id = data["channel"]
+            parent_id = data.get("parent_message")
+            if channel_id not in channel_ids:
+                errors = {"channel": ["You have no access to this channel."]}
+            elif parent_id and parent_id not in parent_channels:
+                errors = {"parent_message": ["Parent message not found."]}
+            elif parent_id and parent_channels[parent_id] != channel_id:
+                errors = {"parent_message": ["Parent message must be in the same channel."]}
+            else:
+                pending.append((index, Message(
+                    author=user,
+                    channel_id=channel_id,
+                    parent_message_id=parent_id,
+                    content=data["content"],
+                )))
+                continue
+            results[index] = {"index": index, "status": "error", "errors": errors}
+
+        messages = [message for _, message in pending]
+        if messages:
+            with transaction.atomic():
+                Message.objects.bulk_create(messages)
+                # bulk_create skips Message.save(): one UPDATE per distinct count
+                per_count: dict[int, list[int]] = {}
+                replies = Counter(m.parent_message_id for m in messages if m.parent_message_id)
+                for parent_id, amount in replies.items():
+                    per_count.setdefault(amount, []).append(parent_id)
+                for amount, parent_ids in per_count.items():
+                    Message.objects.filter(pk__in=parent_ids).update(
+                        reply_count=F("reply_count") + amount,
+                        updated_at=timezone.now(),
+                    )
+                hooks.messages_created(messages)
+
+        for index, message in pending:
+            results[index] = {"index": index, "status": "created", "id": message.id}
+
+        logger.info(
+            "messages bulk created: author=%s created=%s failed=%s channels=%s",
+            user.id, len(messages), len(results) - len(messages), len(channel_ids)
+        )
+        return results
+
+
 class UpdateMessageSerializer(ModelSerializer):
     """
     UPDATE serializer (PATCH/PUT)
@@ -147,7 +384,9 @@ class UpdateMessageSerializer(ModelSerializer):
 
     def update(self, instance: Message, validated_data: dict) -> Message:
         instance.content = validated_data.get("content", instance.content)
-        instance.save(update_fields=["content", "updated_at"])
+        with transaction.atomic():
+            instance.save(update_fields=["content", "updated_at"])
+            hooks.message_updated(instance)
 
         logger.info(
             "Message updated: id=%s author=%s",
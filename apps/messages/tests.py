@@ -1,3 +1,711 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.channels.models import Channel, ChannelMembership
+from apps.team.models import Team, TeamMembership
+from apps.users.models import CustomUser
+from . import search
+from .search.fallback import ScanSearchBackend
+from . import unread
+from .models import ArchivedMessage, ChannelReadState, Message
+from .realtime import WEBSOCKET_PATH, broker, websocket_application
+from .realtime.broker import Broker, LocalBackend, Subscription
+
+
+def make_user(name: str) -> CustomUser:
+    return CustomUser.objects.create_user(
+        email=f"{name}@example.com",
+        password="password123",
+        first_name=name,
+        last_name="Test",
+    )
+
+
+class MessageTestCase(TestCase):
+
+    def setUp(self):
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.team = Team.objects.create(name="Core", owner=self.alice)
+        for user in (self.alice, self.bob):
+            TeamMembership.objects.create(team=self.team, user=user)
+        self.channel = Channel.objects.create(team=self.team, name="general")
+        unread.seed_channel(self.channel)
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def post(self, content: str, author: CustomUser | None = None, parent: Message | None = None) -> Message:
+        return Message.objects.create(
+            content=content,
+            author=author or self.alice,
+            channel=self.channel,
+            parent_message=parent,
+        )
+
+
+class MessageWriteTests(MessageTestCase):
+
+    def test_update_ignores_fields_param(self):
+        message = self.post("hello")
+        response = self.client.patch(
+            f"/api/messages/{message.id}/?fields=bogus", {"content": "edited"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["content"], "edited")
+
+    def test_delete_ignores_fields_param(self):
+        message = self.post("hello")
+        response = self.client.delete(f"/api/messages/{message.id}/?fields=bogus")
+        self.assertEqual(response.status_code, 204)
+        message.refresh_from_db()
+        self.assertIsNotNone(message.deleted_at)
+
+
+@override_settings(DB_ENGINE="django.db.backends.mysql")
+class FallbackSearchTests(MessageTestCase):
+    """Engines without a full-text backend post and search through a scan"""
+
+    def setUp(self):
+        super().setUp()
+        search._backend = None
+        self.addCleanup(setattr, search, "_backend", None)
+
+    def test_post_and_search(self):
+        response = self.client.post(
+            "/api/messages/",
+            {"channel": self.channel.id, "content": "Deploy the Release today"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.post("unrelated")
+        self.assertIsInstance(search.get_search_backend(), ScanSearchBackend)
+
+        response = self.client.get("/api/messages/search/?q=release")
+        self.assertEqual(response.status_code, 200)
+        hits = response.json()["data"]
+        self.assertEqual(len(hits), 1)
+        self.assertIn("<mark>Release</mark>", hits[0]["snippet"])
+
+
+class SearchTests(MessageTestCase):
+
+    def test_search_scoped_to_channel(self):
+        self.client.post(
+            "/api/messages/", {"channel": self.channel.id, "content": "release notes"}, format="json"
+        )
+        response = self.client.get(f"/api/messages/search/?q=release&channel={self.channel.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]), 1)
+
+    def test_non_integer_channel_is_rejected(self):
+        response = self.client.get("/api/messages/search/?q=hello&channel=abc")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "channel must be a valid integer."})
+
+
+class ReplyCountTests(MessageTestCase):
+
+    def reply(self, parent: Message, content: str) -> int:
+        response = self.client.post(
+            "/api/messages/",
+            {"channel": self.channel.id, "content": content, "parent_message": parent.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["data"]["id"]
+
+    def replies_count(self, message: Message) -> int:
+        response = self.client.get(f"/api/messages/{message.id}/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]["replies_count"]
+
+    def test_replies_bump_parent_and_soft_deletes_undo_it(self):
+        root = self.post("root")
+        first = self.reply(root, "first")
+        self.reply(root, "second")
+        self.assertEqual(self.replies_count(root), 2)
+
+        response = self.client.delete(f"/api/messages/{first}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.replies_count(root), 1)
+
+        # deleting a tombstone again must not decrement twice
+        Message.objects.get(pk=first).delete()
+        self.assertEqual(self.replies_count(root), 1)
+
+    def test_nested_reply_counts_on_its_direct_parent_only(self):
+        root = self.post("root")
+        child = self.post("child", parent=root)
+        self.reply(child, "grandchild")
+        root.refresh_from_db()
+        child.refresh_from_db()
+        self.assertEqual((root.reply_count, child.reply_count), (1, 1))
+
+
+class BulkCreateTests(MessageTestCase):
+
+    def bulk(self, items: list[dict]):
+        return self.client.post("/api/messages/bulk/", {"messages": items}, format="json")
+
+    def test_partial_errors_and_side_effects(self):
+        root = self.post("root")
+        other = Channel.objects.create(team=self.team, name="random")
+        elsewhere = Message.objects.create(content="elsewhere", author=self.bob, channel=other)
+        hidden = Channel.objects.create(team=self.team, name="secret", is_private=True)
+
+        response = self.bulk([
+            {"channel": self.channel.id, "content": "bulkimport first"},
+            {"channel": self.channel.id, "content": ""},
+            {"channel": self.channel.id, "content": "bulkimport reply", "parent_message": root.id},
+            {"channel": hidden.id, "content": "bulkimport hidden"},
+            {"channel": self.channel.id, "content": "bulkimport wrong", "parent_message": elsewhere.id},
+            {"channel": self.channel.id, "content": "bulkimport again", "parent_message": root.id},
+        ])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body["created"], body["failed"]), (3, 3))
+        results = body["data"]
+        self.assertEqual([item["index"] for item in results], list(range(6)))
+        self.assertEqual(
+            [item["status"] for item in results],
+            ["created", "error", "created", "error", "error", "created"],
+        )
+        self.assertIn("content", results[1]["errors"])
+        self.assertEqual(results[3]["errors"], {"channel": ["You have no access to this channel."]})
+        self.assertEqual(
+            results[4]["errors"], {"parent_message": ["Parent message must be in the same channel."]}
+        )
+
+        root.refresh_from_db()
+        self.assertEqual(root.reply_count, 2)
+        self.assertEqual(
+            ChannelReadState.objects.get(user=self.bob, channel=self.channel).unread_count, 3
+        )
+        self.assertEqual(
+            ChannelReadState.objects.get(user=self.alice, channel=self.channel).unread_count, 0
+        )
+
+        response = self.client.get("/api/messages/search/?q=bulkimport")
+        self.assertEqual(response.status_code, 200)
+        found = sorted(hit["message"]["id"] for hit in response.json()["data"])
+        created = sorted(results[index]["id"] for index in (0, 2, 5))
+        self.assertEqual(found, created)
+
+    def test_all_items_failing_is_a_bad_request(self):
+        response = self.bulk([{"channel": self.channel.id, "content": ""}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["created"], 0)
+        self.assertFalse(Message.objects.exists())
+
+    @override_settings(MESSAGES_BULK_MAX_ITEMS=2)
+    def test_batch_size_limit(self):
+        response = self.bulk([{"channel": self.channel.id, "content": f"m{n}"} for n in range(3)])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("messages", response.json()["error"])
+        self.assertFalse(Message.objects.exists())
+
+
+class ThreadTests(MessageTestCase):
+
+    def test_nested_thread_pages_follow_cursor(self):
+        root = self.post("root")
+        first = self.post("first", parent=root)
+        nested = self.post("nested", author=self.bob, parent=first)
+        second = self.post("second", parent=root)
+        deeper = self.post("deeper", parent=nested)
+        expected = [first.id, nested.id, second.id, deeper.id]
+
+        seen, after = [], None
+        while True:
+            url = f"/api/messages/{root.id}/thread/?depth=3&limit=3"
+            response = self.client.get(url + (f"&after={after}" if after else ""))
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen += [message["id"] for message in body["data"]]
+            if not body["pagination"]["has_more"]:
+                break
+            after = body["pagination"]["after"]
+
+        self.assertEqual(seen, expected)
+        depths = {message["id"]: message["depth"] for message in body["data"]}
+        self.assertEqual(depths[deeper.id], 3)
+
+
+class SyncTests(MessageTestCase):
+    """Delta sync returns edits and tombstones; the watermark waits for late commits"""
+
+    def sync(self, since: str | None = None) -> dict:
+        url = f"/api/messages/sync/?channel={self.channel.id}"
+        response = self.client.get(url + (f"&since={since}" if since else ""))
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def set_updated_at(self, message: Message, seconds_ago: float) -> None:
+        # update() skips auto_now
+        moment = timezone.now() - datetime.timedelta(seconds=seconds_ago)
+        Message.objects.filter(pk=message.pk).update(updated_at=moment)
+
+    @override_settings(MESSAGES_SYNC_SETTLE_SECONDS=0)
+    def test_edits_and_soft_deletes_after_watermark(self):
+        edited, deleted, untouched = self.post("edit me"), self.post("delete me"), self.post("keep")
+        watermark = self.sync()["watermark"]
+
+        response = self.client.patch(f"/api/messages/{edited.id}/", {"content": "edited"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete(f"/api/messages/{deleted.id}/")
+        self.assertEqual(response.status_code, 204)
+
+        body = self.sync(watermark)
+        changes = {message["id"]: message for message in body["data"]}
+        self.assertEqual(sorted(changes), sorted([edited.id, deleted.id]))
+        self.assertNotIn(untouched.id, changes)
+        self.assertEqual(changes[edited.id]["content"], "edited")
+        self.assertIsNone(changes[edited.id]["deleted_at"])
+        self.assertIsNotNone(changes[deleted.id]["deleted_at"])
+        self.assertNotIn("content", changes[deleted.id])
+        self.assertEqual(self.sync(body["watermark"])["data"], [])
+
+    def test_watermark_stays_behind_unsettled_rows(self):
+        settled, fresh = self.post("settled"), self.post("fresh")
+        self.set_updated_at(settled, seconds_ago=60)
+
+        body = self.sync()
+        self.assertEqual([message["id"] for message in body["data"]], [settled.id, fresh.id])
+        self.assertFalse(body["has_more"])
+
+        # a write that commits now with an updated_at from before `fresh`
+        late = self.post("late commit")
+        self.set_updated_at(late, seconds_ago=30)
+
+        body = self.sync(body["watermark"])
+        self.assertEqual([message["id"] for message in body["data"]], [late.id, fresh.id])
+
+
+class UnreadCounterTests(MessageTestCase):
+
+    def send(self, content: str) -> int:
+        response = self.client.post(
+            "/api/messages/", {"channel": self.channel.id, "content": content}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["data"]["id"]
+
+    def unread_count(self, user: CustomUser) -> int:
+        return ChannelReadState.objects.get(user=user, channel=self.channel).unread_count
+
+    def delete(self, message_id: int) -> None:
+        response = self.client.delete(f"/api/messages/{message_id}/")
+        self.assertEqual(response.status_code, 204)
+
+    def test_create_counts_for_audience_but_not_author(self):
+        self.send("one")
+        self.send("two")
+        self.assertEqual(self.unread_count(self.bob), 2)
+        self.assertEqual(self.unread_count(self.alice), 0)
+
+    def test_delete_of_unread_message_decrements(self):
+        self.send("one")
+        second = self.send("two")
+        self.delete(second)
+        self.assertEqual(self.unread_count(self.bob), 1)
+        self.assertEqual(unread.mark_read(self.bob.id, self.channel.id).unread_count, 0)
+
+    def test_delete_of_read_message_keeps_count(self):
+        first = self.send("one")
+        self.send("two")
+        unread.mark_read(self.bob.id, self.channel.id, first)
+        self.assertEqual(self.unread_count(self.bob), 1)
+
+        self.delete(first)
+        self.assertEqual(self.unread_count(self.bob), 1)
+
+    def test_counter_matches_recount_after_deletes(self):
+        ids = [self.send(f"message {n}") for n in range(4)]
+        unread.mark_read(self.bob.id, self.channel.id, ids[1])
+        for message_id in (ids[0], ids[2]):
+            self.delete(message_id)
+
+        counted = self.unread_count(self.bob)
+        self.assertEqual(counted, 1)
+        self.assertEqual(unread.mark_read(self.bob.id, self.channel.id, ids[1]).unread_count, counted)
+
+    def test_owner_without_membership_gets_badges(self):
+        TeamMembership.objects.filter(team=self.team, user=self.alice).delete()
+        unread.drop_team_member(self.team.id, self.alice.id)
+        other = Channel.objects.create(team=self.team, name="random")
+        unread.seed_channel(other)
+
+        self.client.force_authenticate(self.bob)
+        self.send("one")
+        response = self.client.post(
+            "/api/messages/", {"channel": other.id, "content": "two"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        self.client.force_authenticate(self.alice)
+        response = self.client.get("/api/messages/unread/")
+        self.assertEqual(response.status_code, 200)
+        counts = {item["channel_id"]: item["unread_count"] for item in response.json()["data"]}
+        self.assertEqual(counts, {self.channel.id: 1, other.id: 1})
+
+
+class MessageListTests(MessageTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ids = [self.post(f"message {n}").id for n in range(7)]
+
+    def page(self, query: str) -> dict:
+        response = self.client.get(f"/api/messages/?channel={self.channel.id}&limit=3{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def ids_of(self, body: dict) -> list[int]:
+        return [message["id"] for message in body["data"]]
+
+    def walk_back(self) -> list[int]:
+        """All ids by following `before` from the newest page"""
+        body = self.page("")
+        seen = self.ids_of(body)
+        while body["pagination"]["has_more"]:
+            body = self.page(f"&before={body['pagination']['before']}")
+            seen = self.ids_of(body) + seen
+        return seen
+
+    def test_newest_page_first(self):
+        body = self.page("")
+        self.assertEqual(self.ids_of(body), self.ids[-3:])
+        self.assertTrue(body["pagination"]["has_more"])
+        self.assertNotIn("count", body["pagination"])
+
+    def test_before_walks_back_through_history(self):
+        self.assertEqual(self.walk_back(), self.ids)
+
+    def test_after_walks_forward(self):
+        body = self.page("")
+        while body["pagination"]["has_more"]:
+            body = self.page(f"&before={body['pagination']['before']}")
+        self.assertEqual(self.ids_of(body), self.ids[:1])
+
+        body = self.page(f"&after={body['pagination']['after']}")
+        self.assertEqual(self.ids_of(body), self.ids[1:4])
+        self.assertTrue(body["pagination"]["has_more"])
+
+    def test_equal_timestamps_are_ordered_by_id(self):
+        Message.objects.filter(id__in=self.ids).update(created_at=timezone.now())
+        self.assertEqual(self.walk_back(), self.ids)
+
+    def test_new_message_does_not_shift_older_pages(self):
+        cursor = self.page("")["pagination"]["before"]
+        self.post("newest")
+        self.assertEqual(self.ids_of(self.page(f"&before={cursor}")), self.ids[1:4])
+
+    def test_count_on_request(self):
+        self.assertEqual(self.page("&count=true")["pagination"]["count"], 7)
+
+    def test_deleted_and_inaccessible_messages_are_skipped(self):
+        Message.objects.get(id=self.ids[-1]).delete()
+        other_team = Team.objects.create(name="Other", owner=self.bob)
+        Message.objects.create(
+            content="elsewhere",
+            author=self.bob,
+            channel=Channel.objects.create(team=other_team, name="random"),
+        )
+        response = self.client.get("/api/messages/?limit=50")
+        self.assertEqual(self.ids_of(response.json()), self.ids[:-1])
+
+    def test_bad_cursors(self):
+        response = self.client.get(f"/api/messages/?channel={self.channel.id}&before=bogus")
+        self.assertEqual(response.status_code, 400)
+        cursor = self.page("")["pagination"]["before"]
+        response = self.client.get(
+            f"/api/messages/?channel={self.channel.id}&before={cursor}&after={cursor}"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class IncludedTests(MessageTestCase):
+    """Channels and authors side-loaded once per page in `included`"""
+
+    def setUp(self):
+        super().setUp()
+        self.private = Channel.objects.create(team=self.team, name="secret", is_private=True)
+        for user in (self.alice, self.bob):
+            ChannelMembership.objects.create(channel=self.private, user=user)
+        for author in (self.alice, self.bob, self.alice):
+            Message.objects.create(content="hi", author=author, channel=self.private)
+
+    def included(self, query: str = "") -> dict:
+        response = self.client.get(f"/api/messages/?channel={self.private.id}{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["included"]
+
+    def test_deduplicated_authors_and_channel_summary(self):
+        included = self.included()
+        self.assertEqual(set(included), {"authors", "channels"})
+        self.assertEqual(set(included["authors"]), {str(self.alice.id), str(self.bob.id)})
+        self.assertEqual(included["authors"][str(self.bob.id)]["email"], "bob@example.com")
+        channel = included["channels"][str(self.private.id)]
+        self.assertEqual(channel["name"], "secret")
+        self.assertNotIn("members", channel)
+
+    def test_include_members(self):
+        channel = self.included("&include=members")["channels"][str(self.private.id)]
+        self.assertEqual(
+            sorted(member["id"] for member in channel["members"]), [self.alice.id, self.bob.id]
+        )
+        self.assertEqual(channel["members_count"], 2)
+
+    def test_expand_picks_sections(self):
+        self.assertEqual(set(self.included("&expand=author")), {"authors"})
+        included = self.included("&expand=channel&include=members")
+        self.assertEqual(set(included), {"channels"})
+        self.assertIn("members", included["channels"][str(self.private.id)])
+
+
+class MessageAccessTests(MessageTestCase):
+    """Message endpoints follow membership changes on the next request"""
+
+    def setUp(self):
+        super().setUp()
+        self.message = self.post("hello")
+        self.client.force_authenticate(self.bob)
+
+    def send(self, channel: Channel) -> int:
+        return self.client.post(
+            "/api/messages/", {"channel": channel.id, "content": "hi"}, format="json"
+        ).status_code
+
+    def test_leaving_team_revokes_read_and_write(self):
+        self.assertEqual(self.client.get(f"/api/messages/{self.message.id}/").status_code, 200)
+        self.assertEqual(self.send(self.channel), 201)
+
+        TeamMembership.objects.get(team=self.team, user=self.bob).delete()
+        self.assertEqual(self.client.get(f"/api/messages/{self.message.id}/").status_code, 404)
+        response = self.client.get(f"/api/messages/?channel={self.channel.id}")
+        self.assertEqual(response.json()["data"], [])
+        self.assertEqual(self.send(self.channel), 400)
+
+    def test_private_channel_needs_channel_membership(self):
+        private = Channel.objects.create(team=self.team, name="secret", is_private=True)
+        secret = Message.objects.create(content="psst", author=self.alice, channel=private)
+        self.assertEqual(self.client.get(f"/api/messages/{secret.id}/").status_code, 404)
+        self.assertEqual(self.send(private), 400)
+
+        ChannelMembership.objects.create(channel=private, user=self.bob)
+        self.assertEqual(self.client.get(f"/api/messages/{secret.id}/").status_code, 200)
+        self.assertEqual(self.send(private), 201)
+
+
+class ArchiveTests(MessageTestCase):
+    """Aged threads move to ArchivedMessage; history reads both tables"""
+
+    def age(self, messages: list[Message], days: int) -> None:
+        # update() skips auto_now; minutes keep the original order
+        start = timezone.now() - datetime.timedelta(days=days)
+        for n, message in enumerate(messages):
+            moment = start + datetime.timedelta(minutes=n)
+            Message.objects.filter(pk=message.pk).update(created_at=moment, updated_at=moment)
+
+    def archive(self, *args: str) -> str:
+        out = StringIO()
+        call_command("purge_archive", *args, stdout=out)
+        return out.getvalue()
+
+    def test_stale_thread_moves_whole(self):
+        root = self.post("root")
+        reply = self.post("reply", author=self.bob, parent=root)
+        self.age([root, reply], days=400)
+
+        self.assertIn("Archived 2 messages", self.archive())
+        self.assertFalse(Message.objects.exists())
+        archived = ArchivedMessage.objects.get(pk=reply.pk)
+        self.assertEqual(archived.parent_message_id, root.pk)
+        self.assertEqual(archived.author_id, self.bob.pk)
+
+    def test_late_reply_keeps_thread_hot(self):
+        root = self.post("root")
+        self.age([root], days=400)
+        self.post("late reply", parent=root)
+
+        self.assertIn("Archived 0 messages", self.archive())
+        self.assertEqual(Message.objects.count(), 2)
+
+    def test_team_retention_and_dry_run(self):
+        message = self.post("old")
+        self.age([message], days=40)
+        self.assertIn("Archived 0 messages", self.archive())
+
+        Team.objects.filter(pk=self.team.pk).update(message_retention_days=30)
+        self.assertIn("Would archive 1 messages", self.archive("--dry-run"))
+        self.assertTrue(Message.objects.filter(pk=message.pk).exists())
+        self.assertIn("Archived 1 messages", self.archive())
+        self.assertTrue(ArchivedMessage.objects.filter(pk=message.pk).exists())
+
+    def test_history_is_continuous_across_live_and_archive(self):
+        old = [self.post(f"old {n}") for n in range(5)]
+        self.age(old, days=400)
+        self.archive()
+        live = [self.post(f"live {n}") for n in range(4)]
+        self.assertEqual(ArchivedMessage.objects.count(), 5)
+        expected = [message.id for message in old + live]
+        url = f"/api/messages/?channel={self.channel.id}&limit=3"
+
+        body = self.client.get(url).json()
+        seen = [message["id"] for message in body["data"]]
+        while body["pagination"]["has_more"]:
+            body = self.client.get(f"{url}&before={body['pagination']['before']}").json()
+            seen = [message["id"] for message in body["data"]] + seen
+        self.assertEqual(seen, expected)
+
+        # and forward again from the oldest (archived) page
+        seen = [message["id"] for message in body["data"]]
+        while True:
+            body = self.client.get(f"{url}&after={body['pagination']['after']}").json()
+            seen += [message["id"] for message in body["data"]]
+            if not body["pagination"]["has_more"]:
+                break
+        self.assertEqual(seen, expected)
+
+        count = self.client.get(f"{url}&count=true").json()["pagination"]["count"]
+        self.assertEqual(count, 9)
+
+    def test_archived_message_is_retrievable(self):
+        message = self.post("old")
+        self.age([message], days=400)
+        self.archive()
+
+        response = self.client.get(f"/api/messages/{message.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["content"], "old")
+
+
+class BrokerTests(SimpleTestCase):
+    """Fan-out between brokers sharing a backend, and the lagged flag"""
+
+    async def test_publish_reaches_every_broker_subscribed_to_the_channel(self):
+        backend = LocalBackend()
+        first, second = Broker(backend), Broker(backend)
+        on_first, on_second, elsewhere = Subscription(), Subscription(), Subscription()
+        first.subscribe(1, on_first)
+        second.subscribe(1, on_second)
+        second.subscribe(2, elsewhere)
+
+        first.publish(1, {"type": "message.created"})
+        await asyncio.sleep(0)  # put() hands over through call_soon_threadsafe
+        self.assertEqual(on_first.queue.get_nowait(), {"type": "message.created"})
+        self.assertEqual(on_second.queue.get_nowait(), {"type": "message.created"})
+        self.assertTrue(elsewhere.queue.empty())
+
+        second.unsubscribe_all(on_second)
+        first.publish(1, {"type": "message.deleted"})
+        await asyncio.sleep(0)
+        self.assertTrue(on_second.queue.empty())
+        self.assertEqual(on_first.queue.get_nowait(), {"type": "message.deleted"})
+
+    async def test_full_outbox_drops_events_and_flags_lag(self):
+        local = Broker(LocalBackend())
+        subscription = Subscription(maxsize=1)
+        local.subscribe(1, subscription)
+
+        local.publish(1, {"n": 1})
+        local.publish(1, {"n": 2})
+        await asyncio.sleep(0)
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(subscription.queue.get_nowait(), {"n": 1})
+        self.assertTrue(subscription.lagged)
+
+
+class WebsocketTests(TransactionTestCase):
+    """
+    The consumer end to end. TransactionTestCase: the consumer closes
+    stale connections around its queries, which a TestCase transaction
+    would not survive.
+    """
+
+    def setUp(self):
+        broker._broker = None
+        self.addCleanup(setattr, broker, "_broker", None)
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.team = Team.objects.create(name="Core", owner=self.alice)
+        for user in (self.alice, self.bob):
+            TeamMembership.objects.create(team=self.team, user=user)
+        self.channel = Channel.objects.create(team=self.team, name="general")
+        self.private = Channel.objects.create(team=self.team, name="secret", is_private=True)
+        ChannelMembership.objects.create(channel=self.private, user=self.alice)
+
+    async def connect(self, user: CustomUser) -> ApplicationCommunicator:
+        token = await sync_to_async(AccessToken.for_user)(user)
+        socket = ApplicationCommunicator(websocket_application, {
+            "type": "websocket",
+            "path": WEBSOCKET_PATH,
+            "query_string": f"token={token}".encode(),
+            "headers": [],
+        })
+        await socket.send_input({"type": "websocket.connect"})
+        self.assertEqual(await socket.receive_output(), {"type": "websocket.accept"})
+        return socket
+
+    async def frame(self, socket: ApplicationCommunicator, payload: dict | None = None) -> dict:
+        if payload is not None:
+            await socket.send_input({"type": "websocket.receive", "text": json.dumps(payload)})
+        output = await socket.receive_output(timeout=2)
+        self.assertEqual(output["type"], "websocket.send")
+        return json.loads(output["text"])
+
+    async def disconnect(self, socket: ApplicationCommunicator) -> None:
+        await socket.send_input({"type": "websocket.disconnect", "code": 1000})
+        await socket.wait(timeout=2)
+
+    def send_message(self, user: CustomUser, content: str) -> int:
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(
+            "/api/messages/", {"channel": self.channel.id, "content": content}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["data"]["id"]
+
+    async def test_non_member_cannot_subscribe_to_private_channel(self):
+        socket = await self.connect(self.bob)
+        reply = await self.frame(socket, {"action": "subscribe", "channel": self.private.id})
+        self.assertEqual(reply["type"], "error")
+        self.assertEqual(reply["channel"], self.private.id)
+        self.assertNotIn(self.private.id, broker.get_broker()._subscribers)
+        await self.disconnect(socket)
+
+    async def test_subscriber_receives_created_message(self):
+        socket = await self.connect(self.bob)
+        reply = await self.frame(socket, {"action": "subscribe", "channel": self.channel.id})
+        self.assertEqual(reply, {"type": "subscribed", "channel": self.channel.id})
+
+        message_id = await sync_to_async(self.send_message)(self.alice, "hello")
+        event = await self.frame(socket)
+        self.assertEqual(event["type"], "message.created")
+        self.assertEqual(event["channel"], self.channel.id)
+        self.assertEqual(event["data"]["id"], message_id)
+
+        await self.disconnect(socket)
+        self.assertEqual(dict(broker.get_broker()._subscribers), {})
+
+    async def test_lagged_client_is_told_to_resync(self):
+        socket = await self.connect(self.bob)
+        await self.frame(socket, {"action": "subscribe", "channel": self.channel.id})
+        subscription = next(iter(broker.get_broker()._subscribers[self.channel.id]))
+        subscription.lagged = True  # as if its outbox had overflowed
+
+        broker.get_broker().publish(self.channel.id, {"type": "message.created"})
+        self.assertEqual(await self.frame(socket), {"type": "message.created"})
+        self.assertEqual(await self.frame(socket), {"type": "resync"})
+        await self.disconnect(socket)
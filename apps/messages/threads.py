@@ -0,0 +1,51 @@
+# Python modules
+from datetime import datetime
+
+# Django modules
+from django.db import connection
+
+# Project modules
+from .models import Message
+
+MAX_THREAD_DEPTH = 10
+
+
+def thread_tree(
+    root_id: int,
+    max_depth: int,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+) -> list[Message]:
+    """
+    Replies of `root_id` down to `max_depth` levels in one recursive CTE,
+    walking the parent_message index level by level.
+    Returns up to `limit` live messages ordered by (created_at, id),
+    each with a `depth` attribute (direct replies are depth 1).
+
+    Every page re-walks the whole subtree (ids only, bounded by max_depth):
+    a later reply can hang under an earlier one, so the `after` cursor
+    cannot prune the walk and is applied by the outer query. A page costs
+    O(subtree size), not O(limit).
+    """
+    table = connection.ops.quote_name(Message._meta.db_table)
+    sql = (
+        f"WITH RECURSIVE thread (id, depth) AS ("
+        f"  SELECT id, 0 FROM {table} WHERE id = %s"
+        f"  UNION ALL"
+        f"  SELECT m.id, thread.depth + 1 FROM {table} m"
+        f"  JOIN thread ON m.parent_message_id = thread.id"
+        f"  WHERE thread.depth < %s"
+        f") "
+        f"SELECT m.*, thread.depth FROM thread "
+        f"JOIN {table} m ON m.id = thread.id "
+        f"WHERE thread.depth > 0 AND m.deleted_at IS NULL"
+    )
+    params: list = [root_id, max_depth]
+    if after is not None:
+        sql += " AND (m.created_at > %s OR (m.created_at = %s AND m.id > %s))"
+        created_at = connection.ops.adapt_datetimefield_value(after[0])
+        params += [created_at, created_at, after[1]]
+    sql += " ORDER BY m.created_at, m.id LIMIT %s"
+    params.append(limit)
+
+    return list(Message.objects.raw(sql, params))
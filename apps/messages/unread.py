@@ -0,0 +1,188 @@
+# Materialized unread counters (ChannelReadState).
+#
+# Audience of a channel: team members and the team owner for public
+# channels, channel members for private ones. Rows are seeded when someone joins
+# the audience and dropped when they leave, so a new message costs
+# one UPDATE over the audience and the badge query is one SELECT.
+
+# Python modules
+import logging
+from typing import Iterable
+
+# Django modules
+from django.db.models import F, Max, Q
+
+# Project modules
+from apps.channels.models import Channel, ChannelMembership
+from apps.team.models import Team, TeamMembership
+from .models import Message, ChannelReadState
+
+logger = logging.getLogger(__name__)
+
+
+def _last_message_id(channel_id: int) -> int | None:
+    return Message.objects.filter(
+        channel_id=channel_id
+    ).aggregate(last_id=Max("id"))["last_id"]
+
+
+def audience_user_ids(channel: Channel) -> list[int]:
+    if channel.is_private:
+        return list(ChannelMembership.objects.filter(
+            channel_id=channel.id
+        ).values_list("user_id", flat=True))
+    # the owner sees public channels without a membership
+    user_ids = set(TeamMembership.objects.filter(
+        team_id=channel.team_id
+    ).values_list("user_id", flat=True))
+    user_ids.update(Team.objects.filter(
+        pk=channel.team_id
+    ).values_list("owner_id", flat=True))
+    return list(user_ids)
+
+
+def seed_read_states(channel_id: int, user_ids: Iterable[int]) -> None:
+    """Add audience rows; joiners start with the channel fully read"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    last_id = _last_message_id(channel_id)
+    ChannelReadState.objects.bulk_create(
+        [
+            ChannelReadState(
+                user_id=user_id,
+                channel_id=channel_id,
+                last_read_message_id=last_id,
+            )
+            for user_id in user_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def seed_channel(channel: Channel) -> None:
+    """New channel (or privacy switch): make rows match the audience"""
+    audience = audience_user_ids(channel)
+    ChannelReadState.objects.filter(
+        channel_id=channel.id
+    ).exclude(user_id__in=audience).delete()
+    seed_read_states(channel.id, audience)
+
+
+def seed_team_member(team_id: int, user_id: int) -> None:
+    """User joined a team: rows for all its public channels"""
+    channel_ids = list(Channel.objects.filter(
+        team_id=team_id,
+        is_private=False,
+    ).values_list("id", flat=True))
+    last_ids = dict(
+        Message.objects.filter(
+            channel_id__in=channel_ids
+        ).order_by().values("channel_id").annotate(
+            last_id=Max("id")
+        ).values_list("channel_id", "last_id")
+    )
+    ChannelReadState.objects.bulk_create(
+        [
+            ChannelReadState(
+                user_id=user_id,
+                channel_id=channel_id,
+                last_read_message_id=last_ids.get(channel_id),
+            )
+            for channel_id in channel_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def drop_team_member(team_id: int, user_id: int) -> None:
+    queryset = ChannelReadState.objects.filter(
+        user_id=user_id,
+        channel__team_id=team_id,
+    )
+    if Team.objects.filter(pk=team_id, owner_id=user_id).exists():
+        # still the owner: public channels stay in the audience
+        queryset = queryset.filter(channel__is_private=True)
+    queryset.delete()
+
+
+def seed_channel_member(channel_id: int, user_id: int) -> None:
+    seed_read_states(channel_id, [user_id])
+
+
+def drop_channel_member(channel_id: int, user_id: int) -> None:
+    ChannelReadState.objects.filter(
+        user_id=user_id,
+        channel_id=channel_id,
+    ).delete()
+
+
+def increment_unread(channel_id: int, author_id: int, amount: int = 1) -> int:
+    """One UPDATE over the channel audience, the author excluded"""
+    return ChannelReadState.objects.filter(
+        channel_id=channel_id
+    ).exclude(
+        user_id=author_id
+    ).update(unread_count=F("unread_count") + amount)
+
+
+def decrement_unread(channel_id: int, message_id: int, author_id: int) -> int:
+    """
+    A message was deleted: one UPDATE over the audience rows that counted it
+    (read position before it), the author excluded
+    """
+    return ChannelReadState.objects.filter(
+        Q(last_read_message_id__isnull=True) | Q(last_read_message_id__lt=message_id),
+        channel_id=channel_id,
+        unread_count__gt=0,
+    ).exclude(
+        user_id=author_id
+    ).update(unread_count=F("unread_count") - 1)
+
+
+def mark_read(user_id: int, channel_id: int, message_id: int | None = None) -> ChannelReadState:
+    """
+    Move the read position to message_id (latest message by default)
+    and recount what is left after it.
+    """
+    if message_id is None:
+        message_id = _last_message_id(channel_id)
+
+    unread = Message.objects.filter(
+        channel_id=channel_id,
+        deleted_at__isnull=True,
+    ).exclude(author_id=user_id)
+    if message_id is not None:
+        unread = unread.filter(id__gt=message_id)
+
+    state, _ = ChannelReadState.objects.update_or_create(
+        user_id=user_id,
+        channel_id=channel_id,
+        defaults={
+            "last_read_message_id": message_id,
+            "unread_count": unread.count(),
+        },
+    )
+    logger.debug(
+        "Channel read: user=%s channel=%s last_read=%s unread=%s",
+        user_id, channel_id, message_id, state.unread_count
+    )
+    return state
+
+
+def unread_counts(user_id: int, team_id: int | None = None) -> list[dict]:
+    """All badges of a user (optionally one team) in a single query"""
+    queryset = ChannelReadState.objects.filter(
+        user_id=user_id,
+        channel__delete_at__isnull=True,
+    )
+    if team_id is not None:
+        queryset = queryset.filter(channel__team_id=team_id)
+    return list(
+        queryset.order_by("channel_id").values(
+            "channel_id",
+            "unread_count",
+            "last_read_message_id",
+            team_id=F("channel__team_id"),
+        )
+    )
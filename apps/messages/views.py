@@ -3,6 +3,8 @@ import logging
 
 #Rest modules
 from django.shortcuts import render
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.status import (
@@ -13,12 +15,31 @@ from rest_framework.status import (
     HTTP_204_NO_CONTENT,
 )
 from rest_framework.viewsets import ViewSet
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 
-from .models import Message
+from .models import Message, ArchivedMessage
+from . import hooks
+from apps.channels.models import Channel
+from apps.channels.access import get_access
+from apps.abstract.fieldsets import Fieldset
+from .pagination import (
+    MessageCursorPagination,
+    MessageSyncPagination,
+    ThreadPagination,
+)
+from .threads import thread_tree, MAX_THREAD_DEPTH
+from .search import get_search_backend
+from . import unread
 from .serializers import (
+    INCLUDED_SECTIONS,
     MessageSerializer,
+    MessageListSerializer,
+    MessageSyncSerializer,
+    ThreadMessageSerializer,
+    build_included,
     CreateMessageSerializer,
+    BulkCreateMessageSerializer,
     UpdateMessageSerializer,
 )
 
@@ -27,14 +48,28 @@ logger = logging.getLogger(__name__)
 class MessageViewSet(ViewSet):
     """
     Message endpoints:
-        GET    api/messages/           - list messages (optionally ?channel=<id>)
+        GET    api/messages/           - list messages (optionally ?channel=<id>, cursor paginated,
+                                         ?fields=, ?expand=author,channel for `included`;
+                                         channel history falls back to the archive)
         POST   api/messages/           - create message
-        GET    api/messages/{id}/      - retrieve message
+        GET    api/messages/{id}/      - retrieve message, archived ones too
+                                         (?fields=, ?expand=author,channel)
         PATCH  api/messages/{id}/      - update message
         DELETE api/messages/{id}/      - delete message
+        GET    api/messages/sync/      - changes since a watermark (?channel=&since=)
+        GET    api/messages/search/    - full-text search (?q=&channel=&limit=&offset=)
+        GET    api/messages/unread/    - unread counters of all my channels (?team=)
+        POST   api/messages/read/      - mark channel read up to a message
+        GET    api/messages/{id}/thread/ - thread root and replies (?depth= for nested)
+        POST   api/messages/bulk/      - create many messages, per-item results
     """
 
+    search_page_size = 20
+    search_max_page_size = 100
+
     permission_classes = [IsAuthenticated]
+    # read actions that only need the user id and staff flags (AUTH_STATELESS_READS)
+    stateless_auth_actions = ("list", "retrieve", "sync", "search", "unread", "thread")
 
     def get_message_or_404(
         self,
@@ -46,7 +81,7 @@ class MessageViewSet(ViewSet):
                 "author",
                 "channel",
                 "channel__team",
-            ).get(pk=pk)
+            ).get(pk=pk, deleted_at__isnull=True)
             return message, None
         except Message.DoesNotExist:
             logger.warning("Message not found: id=%s", pk)
@@ -55,64 +90,395 @@ class MessageViewSet(ViewSet):
                 status=HTTP_404_NOT_FOUND
             )
         
+    def get_archived_message(self, pk: int) -> ArchivedMessage | None:
+        """Helper: fallback for messages moved to the archive (apps.messages.archive)"""
+        return ArchivedMessage.objects.select_related(
+            "author",
+            "channel",
+            "channel__team",
+        ).filter(pk=pk, deleted_at__isnull=True).first()
+
     def _user_has_channel_access(
         self,
-        user,
-        channel
+        request: Request,
+        channel: Channel,
     ) -> bool:
         """
-        True если user состоит в team канала.
-        Ожидается: channel.team.members (ManyToMany на users)
+        True если user состоит в team канала
+        (и в самом канале, если он приватный).
+        Uses the access resolved once per request (apps.channels.access).
         """
-        try:
-            return channel.team.members.filter(id=user.id).exists()
-        except Exception:
-            return False
+        return get_access(request).can_access_channel(channel)
         
 
 
     def list(self, request: Request) -> Response:
         """
-        GET api/messages/ — list messages
+        GET api/messages/ — list messages (cursor paginated)
         Optional filter: ?channel=<id>
+        Paging: ?before=<cursor> (older), ?after=<cursor> (newer), ?limit=<n>
+        Total count only on ?count=true
+        Channel member lists in `included` only on ?include=members
         """
         user = request.user
         channel_id = request.query_params.get("channel")
 
-        queryset = Message.objects.select_related(
-            "author",
-            "channel",
-            "channel__team",
-        ).prefetch_related(
-            "replies"
-        ).filter(
-            channel__team__members__id=user.id
-        ).order_by("created_at")
+        # ?expand= picks the `included` sections (default: all)
+        fieldset = Fieldset.from_request(
+            request, MessageListSerializer, expandable=tuple(INCLUDED_SECTIONS)
+        )
+
+        queryset = Message.objects.filter(
+            get_access(request).channel_q("channel__"),
+            deleted_at__isnull=True,
+        )
 
         if channel_id:
             queryset = queryset.filter(channel_id = channel_id)
 
-        serializer = MessageSerializer(queryset, many = True)
+        paginator = MessageCursorPagination()
+        related = []
+        if fieldset.expands("author"):
+            related.append("author")
+        if fieldset.expands("channel"):
+            related.append("channel__team")
+        queryset = MessageListSerializer.optimize_queryset(
+            queryset,
+            fieldset,
+            keep=paginator.get_ordering(request, queryset),
+            related=tuple(related),
+        )
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        if channel_id:
+            # history past the retention horizon lives in the archive
+            archived = ArchivedMessage.objects.filter(
+                get_access(request).channel_q("channel__"),
+                channel_id=channel_id,
+                deleted_at__isnull=True,
+            )
+            if paginator.may_reach_archive():
+                archived = MessageListSerializer.optimize_queryset(
+                    archived,
+                    fieldset,
+                    keep=paginator.get_ordering(request, archived),
+                    related=tuple(related),
+                )
+                page = paginator.merge_queryset(archived)
+            elif paginator.total is not None:
+                # the count covers the whole history, this page or not
+                paginator.total += archived.count()
+
+        include_members = "members" in request.query_params.get("include", "").split(",")
+
+        serializer = MessageListSerializer(page, many = True, fieldset=fieldset)
         logger.debug("Message list requested by user=%s channel=%s", user.id, channel_id)
 
         return Response(
             {
                 "message": "List of messages",
-                "count": queryset.count(),
+                "pagination": paginator.get_pagination_data(),
                 "data": serializer.data,
+                "included": build_included(
+                    page,
+                    include_members=include_members,
+                    expand=fieldset.expand,
+                ),
             },
             status=HTTP_200_OK,
         )
     
+    @action(detail=False, methods=["get"], url_path="sync")
+    def sync(self, request: Request) -> Response:
+        """
+        GET api/messages/sync/?channel=<id>&since=<watermark>
+        Messages created, edited or deleted after the watermark,
+        oldest change first. Pass the returned watermark as `since` next time;
+        keep calling while has_more is true.
+        """
+        user = request.user
+        channel_id = request.query_params.get("channel")
+
+        if not channel_id:
+            return Response(
+                {"error": "channel query parameter is required."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            channel = Channel.objects.select_related("team").get(pk=int(channel_id))
+        except (ValueError, TypeError, Channel.DoesNotExist):
+            return Response(
+                {"error": "Channel not found"},
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        if not self._user_has_channel_access(request, channel):
+            logger.warning(
+                "Message sync denied (not team member): user=%s channel=%s",
+                user.id, channel.id
+            )
+            return Response(
+                {"error": "You have no access to this channel."},
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        # includes soft-deleted rows: they are the tombstones
+        queryset = Message.objects.filter(channel_id=channel.id)
+
+        paginator = MessageSyncPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+
+        logger.debug(
+            "Message sync: user=%s channel=%s changes=%s",
+            user.id, channel.id, len(page)
+        )
+
+        return Response(
+            {
+                "message": "Message changes",
+                "watermark": paginator.get_watermark(),
+                "has_more": paginator.has_more,
+                "data": MessageSyncSerializer(page, many=True).data,
+            },
+            status=HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request: Request) -> Response:
+        """
+        GET api/messages/search/?q=<text>&channel=<id>&limit=<n>&offset=<n>
+        Ranked full-text search over channels the user can access,
+        with highlighted snippets (<mark>...</mark>).
+        """
+        user = request.user
+        query = request.query_params.get("q", "").strip()
+        channel_id = request.query_params.get("channel")
+
+        if not query:
+            return Response(
+                {"error": "q query parameter is required."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(
+                max(int(request.query_params.get("limit", self.search_page_size)), 1),
+                self.search_max_page_size,
+            )
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "limit and offset must be integers."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        channels = Channel.objects.filter(get_access(request).channel_q())
+        if channel_id:
+            try:
+                channel_id = int(channel_id)
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "channel must be a valid integer."},
+                    status=HTTP_400_BAD_REQUEST,
+                )
+            channels = channels.filter(pk=channel_id)
+        channel_ids = list(channels.values_list("id", flat=True))
+
+        hits = get_search_backend().search(query, channel_ids, limit + 1, offset)
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+
+        messages = Message.objects.select_related(
+            "author",
+            "channel",
+            "channel__team",
+        ).in_bulk([hit.message_id for hit in hits])
+
+        # index and table may briefly disagree; skip hits without a live row
+        results = []
+        page = []
+        for hit in hits:
+            message = messages.get(hit.message_id)
+            if message is None or message.deleted_at is not None:
+                continue
+            page.append(message)
+            results.append({
+                "rank": hit.rank,
+                "snippet": hit.snippet,
+                "message": MessageListSerializer(message).data,
+            })
+
+        logger.debug(
+            "Message search: user=%s channels=%s hits=%s",
+            user.id, len(channel_ids), len(results)
+        )
+
+        return Response(
+            {
+                "message": "Search results",
+                "pagination": {
+                    "limit": limit,
+                    "offset": offset,
+                    "has_more": has_more,
+                },
+                "data": results,
+                "included": build_included(page),
+            },
+            status=HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="unread")
+    def unread(self, request: Request) -> Response:
+        """
+        GET api/messages/unread/?team=<id>
+        Unread badges for every channel of the user's teams, one query.
+        """
+        team_id = request.query_params.get("team")
+        try:
+            team_id = int(team_id) if team_id else None
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "team must be a valid integer."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        counts = unread.unread_counts(request.user.id, team_id=team_id)
+
+        return Response(
+            {
+                "message": "Unread counters",
+                "total": sum(item["unread_count"] for item in counts),
+                "data": counts,
+            },
+            status=HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="read")
+    def read(self, request: Request) -> Response:
+        """
+        POST api/messages/read/  {"channel": <id>, "message": <id, optional>}
+        Move the read position (latest message if omitted).
+        """
+        user = request.user
+        try:
+            channel_id = int(request.data.get("channel"))
+            message_id = request.data.get("message")
+            message_id = int(message_id) if message_id is not None else None
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "channel (and message) must be valid integers."},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        channel = Channel.objects.select_related("team").filter(pk=channel_id).first()
+        if channel is None or not self._user_has_channel_access(request, channel):
+            return Response(
+                {"error": "You have no access to this channel."},
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        state = unread.mark_read(user.id, channel.id, message_id)
+
+        return Response(
+            {
+                "message": "Channel marked as read",
+                "data": {
+                    "channel_id": channel.id,
+                    "last_read_message_id": state.last_read_message_id,
+                    "unread_count": state.unread_count,
+                },
+            },
+            status=HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=["get"], url_path="thread")
+    def thread(self, request: Request, pk: int = None) -> Response:
+        """
+        GET api/messages/{id}/thread/ — root message and its replies
+        Replies are paged oldest first: ?after=<cursor>&limit=<n>
+        ?depth=<n> (1..10) also walks nested replies with a recursive query
+        """
+        user = request.user
+        root, error = self.get_message_or_404(pk)
+        if error:
+            return error
+
+        if not self._user_has_channel_access(request, root.channel):
+            logger.warning(
+                "Thread view denied (not team member): user=%s msg=%s channel=%s",
+                user.id, root.id, root.channel_id
+            )
+            return Response(
+                {"error": "You have no access to this channel."},
+                status=HTTP_404_NOT_FOUND,
+            )
+
+        depth = request.query_params.get("depth")
+        paginator = ThreadPagination()
+
+        if depth is None:
+            replies = Message.objects.select_related(
+                "author",
+                "channel",
+                "channel__team",
+            ).filter(
+                parent_message_id=root.id,
+                deleted_at__isnull=True,
+            )
+            page = paginator.paginate_queryset(replies, request, view=self)
+            pagination = paginator.get_pagination_data()
+        else:
+            try:
+                depth = min(max(int(depth), 1), MAX_THREAD_DEPTH)
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "depth must be an integer."},
+                    status=HTTP_400_BAD_REQUEST,
+                )
+            paginator.use_ordering(paginator.ordering)
+            limit = paginator.get_limit(request)
+            after = request.query_params.get(paginator.after_query_param)
+            if after:
+                after = paginator.decode_cursor(after, Message, paginator.after_query_param)
+
+            page = thread_tree(root.id, depth, limit + 1, after=after)
+            has_more = len(page) > limit
+            page = page[:limit]
+            prefetch_related_objects(page, "author", "channel__team")
+            pagination = {
+                "limit": limit,
+                "has_more": has_more,
+                "after": paginator.encode_cursor(page[-1]) if page else None,
+            }
+
+        logger.debug(
+            "Thread requested: root=%s user=%s depth=%s replies=%s",
+            root.id, user.id, depth, len(page)
+        )
+
+        return Response(
+            {
+                "message": "Message thread",
+                "root": MessageListSerializer(root).data,
+                "pagination": pagination,
+                "data": ThreadMessageSerializer(page, many=True).data,
+                "included": build_included([root, *page]),
+            },
+            status=HTTP_200_OK,
+        )
+
     def retrieve(self, request: Request, pk: int = None) -> Response:
         """GET api/messages/{id}/ — retrieve one message"""
         user = request.user
+        fieldset = Fieldset.from_request(request, MessageSerializer)
         message, error = self.get_message_or_404(pk)
         if error:
-            return error
+            message = self.get_archived_message(pk)
+            if message is None:
+                return error
 
         # access check
-        if not self._user_has_channel_access(user, message.channel):
+        if not self._user_has_channel_access(request, message.channel):
             logger.warning(
                 "Message retrieve denied (not team member): user=%s msg=%s channel=%s team=%s",
                 user.id, message.id, message.channel_id, message.channel.team_id
@@ -122,7 +488,7 @@ class MessageViewSet(ViewSet):
                 status=HTTP_404_NOT_FOUND,  # часто отдают 404 чтобы не палить существование
             )
 
-        serializer = MessageSerializer(message)
+        serializer = MessageSerializer(message, fieldset=fieldset)
         logger.info("Message retrieved: id=%s by user=%s", message.id, user.id)
 
         return Response(
@@ -161,6 +527,42 @@ class MessageViewSet(ViewSet):
             status=HTTP_201_CREATED,
         )
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request: Request) -> Response:
+        """
+        POST api/messages/bulk/ — create up to MESSAGES_BULK_MAX_ITEMS messages
+        body: {"messages": [{"content", "channel", "parent_message"?}, ...]}
+        Invalid items are reported per index, the rest is created.
+        """
+        serializer = BulkCreateMessageSerializer(
+            data=request.data,
+            context={"request": request},
+        )
+
+        if not serializer.is_valid():
+            logger.warning(
+                "Bulk message creation failed: user=%s errors=%s",
+                request.user.id,
+                serializer.errors,
+            )
+            return Response(
+                {"error": serializer.errors},
+                status=HTTP_400_BAD_REQUEST,
+            )
+
+        results = serializer.save()
+        created = sum(1 for item in results if item["status"] == "created")
+
+        return Response(
+            {
+                "message": "Messages processed",
+                "created": created,
+                "failed": len(results) - created,
+                "data": results,
+            },
+            status=HTTP_201_CREATED if created else HTTP_400_BAD_REQUEST,
+        )
+
     def partial_update(self, request: Request, pk: int = None) -> Response:
         """PATCH api/messages/{id}/ — update message (content only)"""
         user = request.user
@@ -169,7 +571,7 @@ class MessageViewSet(ViewSet):
             return error
 
         # доступ к каналу (на всякий)
-        if not self._user_has_channel_access(user, message.channel):
+        if not self._user_has_channel_access(request, message.channel):
             logger.warning(
                 "Message update denied (not team member): user=%s msg=%s channel=%s",
                 user.id, message.id, message.channel_id
@@ -215,7 +617,7 @@ class MessageViewSet(ViewSet):
             return error
 
         # доступ к каналу
-        if not self._user_has_channel_access(user, message.channel):
+        if not self._user_has_channel_access(request, message.channel):
             logger.warning(
                 "Message delete denied (not team member): user=%s msg=%s channel=%s",
                 user.id, message.id, message.channel_id
@@ -237,7 +639,9 @@ class MessageViewSet(ViewSet):
             )
 
         msg_id = message.id
-        message.delete()
+        with transaction.atomic():
+            message.delete()
+            hooks.message_deleted(message)
 
         logger.info("Message deleted: id=%s by user=%s", msg_id, user.id)
 
@@ -5,18 +5,18 @@ from django.contrib.admin import(
 
 #Project imports
 from apps.team.models import Team,TeamMembership
+from apps.abstract.search import DirectorySearchAdminMixin
 
 
 @register(Team)
-class TeamAdmin(ModelAdmin):
+class TeamAdmin(DirectorySearchAdminMixin, ModelAdmin):
     list_display = (
         'id',
         'name', 
         'owner',
     )
     search_fields = (
-        'name', 
-        'owner__username',
+        'name',
     )
     list_filter = ('owner',)
 
@@ -30,7 +30,7 @@ class TeamMembershipAdmin(ModelAdmin):
     )
     search_fields = (
         'team__name', 
-        'user__username', 
+        'user__email', 
         'role',
     )
     list_filter = ('role',)
@@ -1,35 +1,59 @@
-from django.db.models import Q
+from django.db.models import Q, Exists, OuterRef
+from django.db.models.functions import Lower
+
+from .models import TeamMembership
+from apps.abstract.search import directory_search, prefix_q
+
+
+#lowercased user columns of a membership, backed by the Lower() indexes on CustomUser
+MEMBER_SEARCH_ALIASES = {
+    'user_email_lower': Lower('user__email'),
+    'user_first_name_lower': Lower('user__first_name'),
+    'user_last_name_lower': Lower('user__last_name'),
+}
 
 
 def build_team_q(request):
-    q_name = request.query_params.get('name')
+    """?owner=, ?members= (name and q search: see search_teams)"""
     q_owner = request.query_params.get('owner')
     q_member = request.query_params.get('members')
-    q_search = request.query_params.get('q')
 
     conds = Q()
-    if q_name:
-        conds &= Q(name__icontains = q_name)
     if q_owner:
         conds &= Q(owner_id = q_owner)
     if q_member:
-        conds &= (Q(members__id = q_member) | Q(owner_id = q_member))
-    if q_search:
+        #EXISTS instead of a members join: no duplicate rows, no DISTINCT
         conds &= (
-            Q(name__icontains = q_name) |
-            Q(description__icontains = q_search) |
-            Q(owner__first_name__icontains = q_search) |
-            Q(owner__last_name__icontains = q_search)
+            Exists(TeamMembership.objects.filter(team_id=OuterRef('pk'), user_id=q_member))
+            | Q(owner_id = q_member)
         )
     return conds
 
+
+def search_teams(queryset, request):
+    """?q= (or ?name=) through the indexed directory search on team name"""
+    term = request.query_params.get('q') or request.query_params.get('name')
+    if term:
+        queryset = directory_search(queryset, term)
+    return queryset
+
 def build_membership_q(request,team):
+    """
+    Member directory filters; expects the queryset to be
+    aliased with MEMBER_SEARCH_ALIASES when searching.
+    ?role=admin|member, ?q= (or ?user=) prefix of email, first or last name
+    """
     role = request.query_params.get('role')
-    user_q = request.query_params.get('user')
+    user_q = (request.query_params.get('q') or request.query_params.get('user') or '').strip()
 
     conds = Q(team=team)
     if role:
         conds &= Q(role = role)
     if user_q:
-        conds &= Q(user_first_name = user_q)
+        #any of the lowercased columns starts with the term (index range + exact check)
+        user_q = user_q.lower()
+        user_conds = Q()
+        for alias in MEMBER_SEARCH_ALIASES:
+            user_conds |= prefix_q(alias, user_q)
+        conds &= user_conds
     return conds
\ No newline at end of file
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:34
+
+from django.db import migrations, models
+
+
+def backfill_member_count(apps, schema_editor):
+    Team = apps.get_model('team', 'Team')
+    TeamMembership = apps.get_model('team', 'TeamMembership')
+    members = TeamMembership.objects.filter(
+        team=models.OuterRef('pk')
+    ).order_by().values('team').annotate(
+        total=models.Count('id')
+    ).values('total')
+    Team.objects.update(
+        member_count=models.functions.Coalesce(models.Subquery(members), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_member_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0003_member_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='teammembership',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Admin'), ('member', 'Member')], default='member', max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name='teammembership',
+            index=models.Index(fields=['team', 'id'], name='team_teamme_team_id_639664_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammembership',
+            index=models.Index(fields=['team', 'role', 'id'], name='team_teamme_team_id_84b307_idx'),
+        ),
+    ]
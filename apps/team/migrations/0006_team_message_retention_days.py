@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0005_search_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='message_retention_days',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -9,16 +9,22 @@ from django.db.models import (
     CASCADE,
     Index,
     DateTimeField,
-    ManyToManyField
+    ManyToManyField,
+    PositiveIntegerField,
+    F,
 )
+from django.db import transaction
 
 #Project imports
 from apps.users.models import CustomUser
+from apps.abstract.search import SearchKeyMixin, search_key_field
 
 
-class Team(Model):
+class Team(SearchKeyMixin, Model):
     """Model representing a team."""
 
+    search_key_sources = ('name',)
+
     id = AutoField(
         primary_key=True
     )
@@ -40,6 +46,17 @@ class Team(Model):
         through='TeamMembership',
         related_name='members'
     )
+    #denormalized number of TeamMembership rows, kept in sync by TeamMembership
+    member_count = PositiveIntegerField(
+        default=0
+    )
+    #messages untouched for this many days are archived (purge_archive);
+    #NULL - settings.MESSAGES_ARCHIVE_AFTER_DAYS, 0 - never
+    message_retention_days = PositiveIntegerField(
+        null=True,
+        blank=True
+    )
+    search_key = search_key_field()
 
     def __str__(self):
         """String representation of the Team model."""
@@ -88,11 +105,32 @@ class TeamMembership(Model):
         max_length=150,
         default='member',
         choices=[
-            {'admin', 'Admin'},
-            {'member', 'Member'},
+            ('admin', 'Admin'),
+            ('member', 'Member'),
         ]
     )
 
+    def save(self, *args, **kwargs):
+        """Save membership; a new one bumps team's member_count atomically"""
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Team.objects.filter(pk=self.team_id).update(
+                member_count=F('member_count') + 1
+            )
+
+    def delete(self, *args, **kwargs):
+        """Delete membership and decrement team's member_count in one transaction"""
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Team.objects.filter(
+                pk=self.team_id,
+                member_count__gt=0,
+            ).update(member_count=F('member_count') - 1)
+        return result
+
     def __str__(self):
         """String representation of the TeamMembership model."""
         return f"TeamMembership: {self.user.first_name} in {self.team.name}"
@@ -103,4 +141,7 @@ class TeamMembership(Model):
         unique_together = ('team', 'user')
         indexes = [
             Index(fields=['team','user']),
+            #member directory: keyset on id, optionally within a role
+            Index(fields=['team','id']),
+            Index(fields=['team','role','id']),
         ]
\ No newline at end of file
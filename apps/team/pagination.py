@@ -0,0 +1,20 @@
+# Project modules
+from apps.abstract.pagination import KeysetPagination
+
+
+class TeamMemberPagination(KeysetPagination):
+    """Member directory of a team, keyset on membership id (team, id) index"""
+
+    ordering = ('id',)
+    page_size = 50
+    max_page_size = 200
+    default_position = 'first'
+
+
+class TeamPagination(KeysetPagination):
+    """Team directory, keyset on id"""
+
+    ordering = ('id',)
+    page_size = 50
+    max_page_size = 200
+    default_position = 'first'
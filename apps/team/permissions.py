@@ -1,6 +1,17 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
-from .models import Team, TeamMembership
+from apps.channels.access import get_access
+
+from .models import Team
+
+
+def _team_id(obj):
+	"""Team id of a `Team` or of a model with a `team` FK, else None"""
+	if isinstance(obj, Team):
+		return obj.id
+	if hasattr(obj, 'team'):
+		return obj.team_id
+	return None
 
 
 class IsTeamOwnerOrAdmin(BasePermission):
@@ -20,20 +31,11 @@ class IsTeamOwnerOrAdmin(BasePermission):
 			return True
 
 		# resolve team for object
-		if isinstance(obj, Team):
-			team = obj
-		elif hasattr(obj, 'team'):
-			team = getattr(obj, 'team')
-		else:
+		team_id = _team_id(obj)
+		if team_id is None:
 			return False
 
-		if team.owner == user:
-			return True
-
-		return TeamMembership.objects.filter(
-			team=team, 
-			user=user, 
-			role='admin').exists()
+		return get_access(request).is_team_admin(team_id)
 
 
 class IsTeamMember(BasePermission):
@@ -51,18 +53,10 @@ class IsTeamMember(BasePermission):
 		if user.is_staff or user.is_superuser:
 			return True
 
-		if isinstance(obj, Team):
-			team = obj
-		elif hasattr(obj, 'team'):
-			team = getattr(obj, 'team')
-		else:
+		team_id = _team_id(obj)
+		if team_id is None:
 			return False
 
-		if team.owner == user:
-			return True
-
-		return TeamMembership.objects.filter(
-			team=team,  
-			user=user).exists()
+		return get_access(request).is_team_member_or_owner(team_id)
 
 
@@ -1,27 +1,51 @@
 # Python modules
 import logging
 
+# Django modules
+from django.db import transaction
+from django.db.models import Prefetch
+
 # Rest modules
 from rest_framework.serializers import (
     ModelSerializer,
     SerializerMethodField,
     ValidationError,
     CharField,
-    IntegerField
+    IntegerField,
+    PrimaryKeyRelatedField,
 )
 
 # Project modules
 from .models import Team, TeamMembership
+from apps.users.models import CustomUser
 from apps.users.serializers import UserListSerializer
+from apps.messages import unread
+from apps.abstract.fieldsets import Collapsed, Requires, SparseFieldsMixin
 
 logger = logging.getLogger(__name__)
 
 
-class TeamSerializer(ModelSerializer):
+class TeamSerializer(SparseFieldsMixin, ModelSerializer):
     """
-    Read-only serializer for Team
+    Read-only serializer for Team, supports ?fields= / ?expand=members
     Used in: list, retrieve
     """
+    field_requirements = {
+        'owner_info': Requires(
+            select_related=('owner',),
+            only=('owner__first_name', 'owner__last_name'),
+        ),
+        'members_count': Requires(only=('member_count',)),
+    }
+    expandable_fields = {
+        'members': Collapsed(
+            lambda: PrimaryKeyRelatedField(many=True, read_only=True),
+            Requires(prefetch_related=(
+                Prefetch('members', queryset=CustomUser.objects.only('id')),
+            )),
+        ),
+    }
+
     owner_info = SerializerMethodField()
     members = UserListSerializer(
         many=True, 
@@ -55,7 +79,25 @@ class TeamSerializer(ModelSerializer):
             self, 
             obj: Team
         ) -> int:
-        return obj.members.count()
+        # denormalized counter, no COUNT per row
+        return obj.member_count
+
+
+class TeamListSerializer(TeamSerializer):
+    """
+    Team directory row: owner (select_related) and the member counter,
+    no member list.
+    Used in: list
+    """
+
+    class Meta(TeamSerializer.Meta):
+        fields = [
+            'id',
+            'name',
+            'description',
+            'owner_info',
+            'members_count',
+        ]
 
 
 class CreateTeamSerializer(ModelSerializer):
@@ -160,12 +202,26 @@ class UpdateTeamSerializer(ModelSerializer):
         return instance
 
 
+class TeamBriefSerializer(ModelSerializer):
+    """
+    Team reference without members; the roster is GET api/teams/{id}/members/
+    Used in: membership responses
+    """
+
+    class Meta:
+        model = Team
+        fields = [
+            'id',
+            'name',
+        ]
+
+
 class TeamMembershipSerializer(ModelSerializer):
     """
     Read-only serializer for TeamMembership
-    Used in: list, retrieve
+    Used in: list, retrieve, members (POST)
     """
-    team = TeamSerializer(read_only=True)
+    team = TeamBriefSerializer(read_only=True)
     user = UserListSerializer(read_only=True)
     role_display = SerializerMethodField()
 
@@ -188,6 +244,29 @@ class TeamMembershipSerializer(ModelSerializer):
         return obj.get_role_display()
 
 
+class TeamMemberRowSerializer(ModelSerializer):
+    """
+    Slim member directory row: user columns are flat, no nested team.
+    Used in: members (GET)
+    """
+    user_id = IntegerField(read_only=True)
+    email = CharField(source='user.email', read_only=True)
+    first_name = CharField(source='user.first_name', read_only=True)
+    last_name = CharField(source='user.last_name', read_only=True)
+
+    class Meta:
+        model = TeamMembership
+        fields = [
+            'id',
+            'user_id',
+            'email',
+            'first_name',
+            'last_name',
+            'role',
+            'joined_at',
+        ]
+
+
 class CreateTeamMembershipSerializer(ModelSerializer):
     """
     Serializer for adding a member to a Team
@@ -225,7 +304,9 @@ class CreateTeamMembershipSerializer(ModelSerializer):
         validated_data: dict
     ) -> TeamMembership:
         """Create team member"""
-        membership = TeamMembership.objects.create(**validated_data)
+        with transaction.atomic():
+            membership = TeamMembership.objects.create(**validated_data)
+            unread.seed_team_member(membership.team_id, membership.user_id)
         logger.info(
             'Membership created: user=%s team=%s role=%s',
             membership.user.id,
@@ -1,3 +1,92 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.users.models import CustomUser
+from .models import Team, TeamMembership
+
+
+def make_user(name: str, first_name: str = "", last_name: str = "Test") -> CustomUser:
+    return CustomUser.objects.create_user(
+        email=f"{name}@example.com",
+        password="password123",
+        first_name=first_name or name,
+        last_name=last_name,
+    )
+
+
+class TeamTestCase(TestCase):
+
+    def setUp(self):
+        self.owner = make_user("owner")
+        self.team = Team.objects.create(name="Core", owner=self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def members(self, query: str = "") -> dict:
+        response = self.client.get(f"/api/teams/{self.team.id}/members/{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+
+class MemberDirectoryTests(TeamTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for user in (
+            make_user("anna", "Anna", "Zimmer"),
+            make_user("bert", "Bert", "Anders"),
+            make_user("carl", "Carl", "Brown"),
+        ):
+            TeamMembership.objects.create(team=self.team, user=user)
+
+    def test_prefix_of_any_name_or_email_case_insensitive(self):
+        emails = [row["email"] for row in self.members("?q=AN")["data"]]
+        self.assertEqual(emails, ["anna@example.com", "bert@example.com"])
+
+    def test_prefix_does_not_match_inside_words(self):
+        self.assertEqual(self.members("?q=rown")["data"], [])
+
+
+class MemberCountTests(TeamTestCase):
+
+    def member_count(self) -> int:
+        self.team.refresh_from_db()
+        return self.team.member_count
+
+    def test_add_and_remove_through_api(self):
+        bob, carl = make_user("bob"), make_user("carl")
+        for user in (bob, carl):
+            response = self.client.post(
+                f"/api/teams/{self.team.id}/members/", {"user": user.id}, format="json"
+            )
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.member_count(), 2)
+
+        response = self.client.delete(
+            f"/api/teams/{self.team.id}/members/", {"user_id": bob.id}, format="json"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.member_count(), 1)
+
+        response = self.client.get(f"/api/teams/{self.team.id}/")
+        self.assertEqual(response.json()["data"]["members_count"], 1)
+
+    def test_counter_never_goes_negative(self):
+        membership = TeamMembership.objects.create(team=self.team, user=make_user("bob"))
+        Team.objects.filter(pk=self.team.pk).update(member_count=0)
+        membership.delete()
+        self.assertEqual(self.member_count(), 0)
+
+    def test_team_list_reads_counters_without_count_queries(self):
+        for n in range(3):
+            team = Team.objects.create(name=f"Team {n}", owner=self.owner)
+            TeamMembership.objects.create(team=team, user=make_user(f"member{n}"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/teams/")
+        self.assertEqual(response.status_code, 200)
+        counts = {team["name"]: team["members_count"] for team in response.json()["data"]}
+        self.assertEqual(counts, {"Core": 0, "Team 0": 1, "Team 1": 1, "Team 2": 1})
+        self.assertFalse([q["sql"] for q in queries if "COUNT(" in q["sql"].upper()])
@@ -1,6 +1,10 @@
 # Python modules
 import logging
 
+# Django modules
+from django.db import transaction
+from django.db.models import Q
+
 # Rest modules
 from rest_framework.response import Response
 from rest_framework.request import Request
@@ -8,6 +12,7 @@ from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_400_BAD_REQUEST,
+    HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
     HTTP_204_NO_CONTENT,
 )
@@ -30,9 +35,11 @@ from .permissions import IsTeamOwnerOrAdmin, IsTeamMember
 # Project modules
 from .serializers import (
     TeamSerializer,
+    TeamListSerializer,
     CreateTeamSerializer,
     UpdateTeamSerializer,
     TeamMembershipSerializer,
+    TeamMemberRowSerializer,
     CreateTeamMembershipSerializer,
 )
 from apps.assigments.serializers import (
@@ -41,30 +48,43 @@ from apps.assigments.serializers import (
 )
 from .models import Team, TeamMembership
 from apps.assigments.models import Assignments
+from apps.messages import unread
 from .permissions import (
     IsTeamOwnerOrAdmin,
     IsTeamMember
 )
-from .filters import build_team_q,build_membership_q
+from .filters import build_team_q,build_membership_q,search_teams,MEMBER_SEARCH_ALIASES
+from .pagination import TeamMemberPagination, TeamPagination
+from apps.channels.access import get_access
+from apps.abstract.fieldsets import Fieldset, fieldset_parameters
 
 logger = logging.getLogger(__name__)
 
 
 @extend_schema_view(
     list=extend_schema(
-        summary='List all teams',
-        description='Supports filtering.',
+        summary='List my teams',
+        description='Owned or member teams, keyset paginated. Supports filtering; staff can pass scope=all.',
         tags=['Teams'],
+        parameters=[
+            OpenApiParameter('scope', OpenApiTypes.STR, enum=['mine', 'all']),
+            OpenApiParameter('q', OpenApiTypes.STR, description='Team name search'),
+            OpenApiParameter('after', OpenApiTypes.STR, description='Cursor of the next page'),
+            OpenApiParameter('limit', OpenApiTypes.INT),
+            *fieldset_parameters(),
+        ],
         responses={
             200: OpenApiResponse(
-                response=TeamSerializer(many=True),
+                response=TeamListSerializer(many=True),
                 description='Teams list returned successfully',
-            )
+            ),
+            403: OpenApiResponse(description='scope=all without staff rights'),
         },
     ),
     retrieve=extend_schema(
         summary='Retrieve a team',
         tags=['Teams'],
+        parameters=fieldset_parameters(tuple(TeamSerializer.expandable_fields)),
         responses={
             200: OpenApiResponse(response=TeamSerializer, description='Team found'),
             404: OpenApiResponse(description='Team not found'),
@@ -103,7 +123,7 @@ logger = logging.getLogger(__name__)
 class TeamViewSet(ViewSet):
     """
     Team endpoints:
-        GET    api/teams/              - list all teams
+        GET    api/teams/              - list my teams (?scope=all for staff)
         POST   api/teams/              - create team
         GET    api/teams/{id}/         - retrieve team
         PATCH  api/teams/{id}/         - update team
@@ -111,7 +131,9 @@ class TeamViewSet(ViewSet):
         GET    api/teams/{id}/members/ - list members of team
         POST   api/teams/{id}/members/ - add member to team
     """
-    
+
+    # read actions that only need the user id and staff flags (AUTH_STATELESS_READS)
+    stateless_auth_actions = ('list', 'retrieve')
 
     def get_permissions(self):
         """Return permission instances based on action and HTTP method."""
@@ -138,6 +160,8 @@ class TeamViewSet(ViewSet):
         """Helper: returns (team, None) or (None, 404 Response)"""
         try:
             team = Team.objects.get(pk=pk)
+            # object permissions (owner/admin/member) via apps.channels.access
+            self.check_object_permissions(self.request, team)
             return team, None
         except Team.DoesNotExist:
             logger.warning('Team not found: id=%s', pk)
@@ -150,19 +174,49 @@ class TeamViewSet(ViewSet):
         self, 
         request: Request    
     ) -> Response:
-        """GET api/teams/ — list all teams"""
+        """
+        GET api/teams/ — my teams (owned or member), keyset paginated
+        ?scope=all — global directory, staff only
+        """
+        user = request.user
+        scope = request.query_params.get('scope', 'mine')
+        if scope not in ('mine', 'all'):
+            return Response(
+                {'error': 'scope must be one of: mine, all.'},
+                status=HTTP_400_BAD_REQUEST,
+            )
+        if scope == 'all' and not (user.is_staff or user.is_superuser):
+            logger.warning('Global team directory denied: user=%s', user.id)
+            return Response(
+                {'error': 'Only staff can list all teams.'},
+                status=HTTP_403_FORBIDDEN,
+            )
 
+        fieldset = Fieldset.from_request(request, TeamListSerializer)
         conds = build_team_q(request)
-        queryset = Team.objects.filter(conds).order_by('id').distinct()
+        if scope == 'mine':
+            access = get_access(request)
+            conds &= Q(pk__in=access.team_ids | access.owned_team_ids)
+
+        paginator = TeamPagination()
+        queryset = TeamListSerializer.optimize_queryset(
+            search_teams(Team.objects.filter(conds), request),
+            fieldset,
+            keep=paginator.ordering,
+        )
 
-        serializer = TeamSerializer(queryset, many=True)
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = TeamListSerializer(page, many=True, fieldset=fieldset)
 
-        logger.debug('Team list requested by user: %s', request.user.id)
+        logger.debug(
+            'Team list requested by user=%s scope=%s page=%s',
+            user.id, scope, len(page)
+        )
 
         return Response(
             {
                 'message': 'List of teams',
-                'count': queryset.count(),
+                'pagination': paginator.get_pagination_data(),
                 'data': serializer.data,
             },
             status=HTTP_200_OK,
@@ -174,11 +228,12 @@ class TeamViewSet(ViewSet):
         pk: int = None
     ) -> Response:
         """GET api/teams/{id}/ — retrieve one team"""
+        fieldset = Fieldset.from_request(request, TeamSerializer)
         team, error = self.get_team_or_404(pk)
         if error:
             return error
 
-        serializer = TeamSerializer(team)
+        serializer = TeamSerializer(team, fieldset=fieldset)
         logger.info('Team retrieved: id=%s by user=%s', pk, request.user.id)
         return Response(
             {
@@ -290,9 +345,15 @@ class TeamViewSet(ViewSet):
         methods=['GET'],
         summary='List team members',
         tags=['Team Members'],
+        parameters=[
+            OpenApiParameter('role', OpenApiTypes.STR, enum=['admin', 'member']),
+            OpenApiParameter('q', OpenApiTypes.STR, description='Prefix of email, first or last name'),
+            OpenApiParameter('after', OpenApiTypes.STR, description='Cursor of the next page'),
+            OpenApiParameter('limit', OpenApiTypes.INT),
+        ],
         responses={
             200: OpenApiResponse(
-                response=TeamMembershipSerializer(many=True),
+                response=TeamMemberRowSerializer(many=True),
                 description='Members list returned successfully',
             ),
             404: OpenApiResponse(description='Team not found'),
@@ -427,7 +488,7 @@ class TeamViewSet(ViewSet):
     )
     def members(self, request: Request, pk: int = None) -> Response:
         """
-        GET    api/teams/{id}/members/ — list members
+        GET    api/teams/{id}/members/ — list members (paginated, ?role=, ?q=)
         POST   api/teams/{id}/members/ — add member
         DELETE api/teams/{id}/members/ — delete member
         """
@@ -453,30 +514,44 @@ class TeamViewSet(ViewSet):
         request: Request, 
         team: Team
     ) -> Response:
-        """List of members"""
+        """
+        List of members, keyset paginated (?after=<cursor>&limit=<n>)
+        ?role=admin|member, ?q=<prefix of email, first or last name>
+        """
+        role = request.query_params.get('role')
+        if role and role not in dict(TeamMembership._meta.get_field('role').choices):
+            return Response(
+                {'error': 'role must be one of: admin, member.'},
+                status=HTTP_400_BAD_REQUEST,
+            )
 
         filtering = build_membership_q(request,team)
-        memberships = TeamMembership.objects.filter(
+        memberships = TeamMembership.objects.alias(
+            **MEMBER_SEARCH_ALIASES
+        ).filter(
             filtering
         ).select_related(
             'user'
-        ).prefetch_related(
-            'members'
+        ).only(
+            'id', 'team_id', 'user_id', 'role', 'joined_at',
+            'user__email', 'user__first_name', 'user__last_name',
         )
 
-        serializer = TeamMembershipSerializer(
-            memberships, 
+        paginator = TeamMemberPagination()
+        page = paginator.paginate_queryset(memberships, request, view=self)
+        serializer = TeamMemberRowSerializer(
+            page, 
             many=True
         )
         logger.info(
-            'Listed members: team=%s count=%s', 
-            team.id, memberships.count()
+            'Listed members: team=%s page=%s', 
+            team.id, len(page)
         )
 
         return Response(
             {
                 'message': 'List of members',
-                'count': memberships.count(),
+                'pagination': paginator.get_pagination_data(),
                 'data': serializer.data,
             },
             status=HTTP_200_OK,
@@ -548,7 +623,9 @@ class TeamViewSet(ViewSet):
                 status=HTTP_404_NOT_FOUND,
             )
 
-        membership.delete()
+        with transaction.atomic():
+            membership.delete()
+            unread.drop_team_member(team.id, membership.user_id)
         logger.info('Member deleted: team=%s user=%s', team.id, user_id)
         return Response(
             {'message': 'Member deleted successfully'},
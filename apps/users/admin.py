@@ -3,9 +3,11 @@ from django.contrib.auth.admin import UserAdmin
 
 # Register your models here.
 from apps.users.models import CustomUser
+from apps.abstract.search import DirectorySearchAdminMixin
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(DirectorySearchAdminMixin, UserAdmin):
     model = CustomUser 
+    directory_search_extra_fields = ("last_name", "email")
     list_display = (
         "email",
         "first_name",
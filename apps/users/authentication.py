@@ -0,0 +1,150 @@
+# JWT authentication without a user query per request.
+#
+# CachedJWTAuthentication resolves the user from a short-TTL cache entry keyed
+# by user id and the token's `iat`. Every save/delete of a user (is_active,
+# is_staff, password, soft delete, ...) records a "changed at" marker; cache
+# entries loaded before it and tokens issued before it are not trusted.
+# The marker only reaches other workers through a shared cache backend, so
+# with the per-process default (no CACHES configured) the user is loaded from
+# the database on every request.
+#
+# Stateless mode (settings.AUTH_STATELESS_READS): on safe methods of actions a
+# view lists in `stateless_auth_actions`, the user is built from the signed
+# claims (user id, is_staff, is_superuser) without touching the user row.
+# Only the marker is read from the cache, so with the per-process default
+# cache a change made in another worker is seen at the latest when the
+# access token expires.
+
+# Python modules
+import logging
+import time
+from typing import Any
+
+# Django modules
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+# Rest modules
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+# Project modules
+from apps.abstract.cache import is_shared_cache
+from apps.users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+# claims trusted by the stateless mode, copied from the user at issue time
+USER_CLAIMS = ("is_staff", "is_superuser")
+
+
+class UserRefreshToken(RefreshToken):
+    """Refresh token carrying USER_CLAIMS (access tokens derived from it copy them)"""
+
+    @classmethod
+    def for_user(cls, user: CustomUser) -> 'UserRefreshToken':
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = bool(getattr(user, claim))
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """Stateless user from signed claims; integer id like CustomUser.id"""
+
+    @property
+    def id(self) -> int:
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+
+def _user_key(user_id: Any, issued_at: Any) -> str:
+    return f"auth:user:{user_id}:{issued_at}"
+
+
+def _changed_key(user_id: Any) -> str:
+    return f"auth:changed:{user_id}"
+
+
+def user_changed(user_id: int) -> None:
+    """
+    Distrust cached users and tokens of user_id issued before now;
+    kept until every such access token has expired
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()) + 60
+    cache.set(_changed_key(user_id), time.time(), timeout)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication with a cached user lookup and an opt-in stateless read mode"""
+
+    def authenticate(self, request: Request) -> tuple[Any, Token] | None:
+        self.request = request
+        return super().authenticate(request)
+
+    def get_user(self, validated_token: Token) -> Any:
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        issued_at = validated_token.get("iat")
+        if user_id is None or issued_at is None:
+            return super().get_user(validated_token)
+
+        if self.is_stateless(validated_token):
+            changed_at = cache.get(_changed_key(user_id))
+            if changed_at is None or changed_at < issued_at:
+                return ClaimsUser(validated_token)
+
+        if not is_shared_cache():
+            return super().get_user(validated_token)
+
+        key = _user_key(user_id, issued_at)
+        cached = cache.get_many([key, _changed_key(user_id)])
+        changed_at = cached.get(_changed_key(user_id))
+        if key in cached:
+            loaded_at, user = cached[key]
+            if changed_at is None or changed_at < loaded_at:
+                return user
+
+        loaded_at = time.time()
+        user = super().get_user(validated_token)
+        cache.set(key, (loaded_at, user), settings.AUTH_USER_CACHE_TIMEOUT)
+        logger.debug("Auth user loaded: user=%s iat=%s", user_id, issued_at)
+        return user
+
+    def is_stateless(self, validated_token: Token) -> bool:
+        """Safe method on an action its view allows, token carrying USER_CLAIMS"""
+        if not settings.AUTH_STATELESS_READS:
+            return False
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return False
+        view = (getattr(request, "parser_context", None) or {}).get("view")
+        action = getattr(view, "action", None)
+        if action is None or action not in getattr(view, "stateless_auth_actions", ()):
+            return False
+        return all(claim in validated_token for claim in USER_CLAIMS)
+
+
+# ── Invalidation ──────────────────────────────────────────────────────────────
+
+def _user_saved(sender, instance: CustomUser, update_fields=None, **kwargs) -> None:
+    # login bookkeeping changes nothing authentication depends on
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    user_changed(instance.pk)
+
+
+def _user_deleted(sender, instance: CustomUser, **kwargs) -> None:
+    user_changed(instance.pk)
+
+
+def connect_signals() -> None:
+    post_save.connect(_user_saved, sender=CustomUser, dispatch_uid="auth_user_save")
+    post_delete.connect(_user_deleted, sender=CustomUser, dispatch_uid="auth_user_delete")
@@ -0,0 +1,64 @@
+# Password hashing off the request thread.
+#
+# PBKDF2 is pure CPU (hashlib releases the GIL while it runs): a login storm
+# would otherwise keep every request thread hashing and starve regular API
+# traffic. Inside pooled_hashing() (the login/register views),
+# PooledPBKDF2PasswordHasher runs each hash on a small bounded pool
+# (PASSWORD_HASH_*); when its backlog is full PoolFull escapes and the view
+# answers 429 with Retry-After instead of queueing. Everywhere else (admin,
+# createsuperuser, changepassword, ...) it hashes inline like Django's
+# hasher. Only encode() is pooled: verify() and harden_runtime() hash
+# through it.
+
+# Python modules
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# Django modules
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+# Project modules
+from apps.abstract.pool import BoundedPool
+
+_pool: BoundedPool | None = None
+_pool_lock = threading.Lock()
+_pooled: ContextVar[bool] = ContextVar("pooled_hashing", default=False)
+
+
+def get_hashing_pool() -> BoundedPool:
+    """Process-wide pool, created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BoundedPool(
+                    "hash",
+                    workers=settings.PASSWORD_HASH_WORKERS,
+                    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+                    timeout=settings.PASSWORD_HASH_TIMEOUT,
+                    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+                )
+    return _pool
+
+
+@contextmanager
+def pooled_hashing() -> Iterator[None]:
+    """Hash on the pool inside the block; the caller handles PoolFull"""
+    token = _pooled.set(True)
+    try:
+        yield
+    finally:
+        _pooled.reset(token)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """pbkdf2_sha256, computed on the hashing pool (same algorithm and hashes)"""
+
+    def encode(self, password: str, salt: str, iterations: int | None = None) -> str:
+        parent = super().encode
+        if not _pooled.get():
+            return parent(password, salt, iterations)
+        return get_hashing_pool().run(parent, password, salt, iterations)
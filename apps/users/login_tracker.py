@@ -0,0 +1,75 @@
+# Coalesced last_login tracking.
+#
+# Logins are buffered in process memory (user id -> latest login time) and
+# written with one bulk UPDATE per flush, at most every
+# LOGIN_TRACKER_FLUSH_INTERVAL seconds: a user logging in repeatedly costs
+# one row write per interval instead of one per login. A daemon timer flushes
+# whatever is buffered; buffered logins of a worker that dies are lost, so
+# last_login may lag by up to one interval.
+
+# Python modules
+import datetime
+import logging
+import threading
+
+# Django modules
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+# Project modules
+from apps.users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending: dict[int, datetime.datetime] = {}
+_timer: threading.Timer | None = None
+
+
+def record_login(user_id: int, when: datetime.datetime | None = None) -> None:
+    """Buffer a login; the next flush writes it"""
+    global _timer
+    with _lock:
+        _pending[user_id] = when or timezone.now()
+        if len(_pending) >= settings.LOGIN_TRACKER_MAX_PENDING:
+            start_flush = True
+        else:
+            start_flush = False
+            if _timer is None:
+                _timer = threading.Timer(settings.LOGIN_TRACKER_FLUSH_INTERVAL, _flush_in_thread)
+                _timer.daemon = True
+                _timer.start()
+    if start_flush:
+        flush()
+
+
+def flush() -> int:
+    """Write buffered logins with one bulk UPDATE; returns the number of users"""
+    global _timer
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not pending:
+        return 0
+
+    CustomUser.all_objects.bulk_update(
+        [CustomUser(pk=user_id, last_login=when) for user_id, when in pending.items()],
+        ["last_login"],
+        batch_size=500,
+    )
+    logger.debug("Logins flushed: users=%s", len(pending))
+    return len(pending)
+
+
+def _flush_in_thread() -> None:
+    try:
+        flush()
+    except Exception:
+        logger.exception("Login flush failed")
+    finally:
+        # the timer thread's own connection
+        connection.close()
@@ -0,0 +1,126 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.abstract.benchmark import percentile
+from apps.users.authentication import UserRefreshToken
+from apps.users.hashing import get_hashing_pool
+from apps.users.models import CustomUser
+
+STORM_EMAIL = "bench-login@example.com"
+STORM_PASSWORD = "bench-login-password"
+UNPOOLED_HASHERS = ["django.contrib.auth.hashers.PBKDF2PasswordHasher"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure API latency while threads hammer POST /api/users/login/: "
+        "idle, login storm with hashing inline (Django's PBKDF2PasswordHasher) "
+        "and login storm on the bounded hashing pool. In-process, like a "
+        "threaded worker; run on a dataset from seed_scale."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            default="scale-000000@example.com",
+            help="Email of the user making the probe requests",
+        )
+        parser.add_argument("--probe-url", default="/api/teams/", help="Endpoint whose latency is measured")
+        parser.add_argument("--storm-threads", type=int, default=16, help="Concurrent login clients")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=None,
+            help="Fail when the pooled storm p99 exceeds idle p99 by this factor (0.5 = +50%%)",
+        )
+
+    def handle(self, *args, **options):
+        user = CustomUser.objects.filter(email=options["user"]).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} not found; run seed_scale first")
+        if not CustomUser.objects.filter(email=STORM_EMAIL).exists():
+            CustomUser.objects.create(
+                email=STORM_EMAIL,
+                first_name="Bench",
+                last_name="Login",
+                password=make_password(STORM_PASSWORD),
+            )
+        token = str(UserRefreshToken.for_user(user).access_token)
+
+        results = {}
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            RATELIMIT_ENABLE=False,
+        ):
+            results["idle"] = self.phase(options, token, storm=False)
+            with override_settings(PASSWORD_HASHERS=UNPOOLED_HASHERS):
+                results["storm inline"] = self.phase(options, token, storm=True)
+            results["storm pooled"] = self.phase(options, token, storm=True)
+
+        for name, (latencies, statuses) in results.items():
+            self.stdout.write(
+                f"{name:<14} probe p50={percentile(latencies, 50) * 1000:>7.1f}ms "
+                f"p95={percentile(latencies, 95) * 1000:>7.1f}ms "
+                f"p99={percentile(latencies, 99) * 1000:>7.1f}ms "
+                f"({len(latencies)} requests) logins={dict(sorted(statuses.items()))}"
+            )
+        self.stdout.write(f"hashing pool: {get_hashing_pool().stats()}")
+
+        if options["threshold"] is not None:
+            idle = percentile(results["idle"][0], 99)
+            pooled = percentile(results["storm pooled"][0], 99)
+            if pooled > idle * (1 + options["threshold"]):
+                raise CommandError(
+                    f"p99 under a login storm {pooled * 1000:.1f}ms > "
+                    f"idle {idle * 1000:.1f}ms +{options['threshold']:.0%}"
+                )
+
+    def phase(self, options, token: str, storm: bool) -> tuple[list[float], dict[int, int]]:
+        """Probe latencies and login status counts of one phase"""
+        stop = threading.Event()
+        statuses: dict[int, int] = {}
+        lock = threading.Lock()
+
+        def login() -> None:
+            client = APIClient()
+            try:
+                while not stop.is_set():
+                    response = client.post(
+                        "/api/users/login/",
+                        {"email": STORM_EMAIL, "password": STORM_PASSWORD},
+                        format="json",
+                    )
+                    with lock:
+                        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    if response.status_code == 429:
+                        time.sleep(0.05)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=login, daemon=True) for _ in range(options["storm_threads"] if storm else 0)]
+        for thread in threads:
+            thread.start()
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        latencies = []
+        deadline = time.perf_counter() + options["duration"]
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = client.get(options["probe_url"])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise CommandError(f"{options['probe_url']} -> {response.status_code}")
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return latencies, statuses
@@ -1,11 +1,24 @@
 from typing import Any, TYPE_CHECKING
 from django.contrib.auth.base_user import BaseUserManager
 
+from apps.abstract.models import SoftDeleteQuerySet
+
 if TYPE_CHECKING:
     from apps.users.models import CustomUser
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserManager(BaseUserManager.from_queryset(SoftDeleteQuerySet)):
+    """Live users only (login, JWT, lookups); include_deleted=True for all_objects"""
+
+    def __init__(self, include_deleted: bool = False) -> None:
+        super().__init__()
+        self.include_deleted = include_deleted
+
+    def get_queryset(self) -> SoftDeleteQuerySet:
+        queryset = super().get_queryset()
+        if self.include_deleted:
+            return queryset
+        return queryset.filter(delete_at__isnull=True)
 
     def create_user(
         self,
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-17 19:49
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_search_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='users_email_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='users_first_name_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='users_last_name_lower_idx',
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='search_key',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized search text, maintained on save', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('email'), condition=models.Q(('delete_at__isnull', True)), name='users_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('first_name'), condition=models.Q(('delete_at__isnull', True)), name='users_first_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(django.db.models.functions.text.Lower('last_name'), condition=models.Q(('delete_at__isnull', True)), name='users_last_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('delete_at__isnull', True)), fields=['search_key'], name='users_live_search_key_idx'),
+        ),
+    ]
@@ -1,11 +1,14 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 
-from apps.abstract.models import AbstractModel
+from apps.abstract.models import AbstractModel, LIVE
+from apps.abstract.search import SearchKeyMixin, search_key_field
 from apps.users.manager import CustomUserManager
 
 
 class CustomUser(
+    SearchKeyMixin,
     AbstractBaseUser,
     AbstractModel,
     PermissionsMixin,
@@ -38,12 +41,15 @@ class CustomUser(
         auto_now_add=True,
     )
 
+    # written by apps.users.login_tracker on login, not on every save
     last_login = models.DateTimeField(
-        auto_now=True,
         null=True,
         blank=True,
     )
 
+    search_key_sources = ("first_name", "last_name", "email")
+    search_key = search_key_field(db_index=False)
+
     USERNAME_FIELD = "email"
 
     EMAIL_FIELD = "email"
@@ -51,10 +57,18 @@ class CustomUser(
     REQUIRED_FIELDS = ["first_name", "last_name"]
 
     objects = CustomUserManager()
+    all_objects = CustomUserManager(include_deleted=True)
 
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # prefix search (lower(x) >= 'ab' AND lower(x) < 'ac') over live users
+            models.Index(Lower("email"), condition=LIVE, name="users_email_lower_idx"),
+            models.Index(Lower("first_name"), condition=LIVE, name="users_first_name_lower_idx"),
+            models.Index(Lower("last_name"), condition=LIVE, name="users_last_name_lower_idx"),
+            models.Index(fields=["search_key"], condition=LIVE, name="users_live_search_key_idx"),
+        ]
 
     def __str__(self):
         return f"{self.email}"
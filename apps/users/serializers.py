@@ -13,7 +13,8 @@ from rest_framework.serializers import (
     
 )
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.validators import UniqueValidator
+from apps.users.authentication import UserRefreshToken
 from apps.users.models import CustomUser
 from rest_framework import serializers
 
@@ -41,6 +42,18 @@ class CustomUserSerializer(ModelSerializer):
             "last_login",
         )
     
+    def update(self, instance: CustomUser, validated_data: dict[str, Any]) -> CustomUser:
+        """Write only the fields that changed; nothing changed - no UPDATE"""
+        changed = [
+            name for name, value in validated_data.items()
+            if getattr(instance, name) != value
+        ]
+        for name in changed:
+            setattr(instance, name, validated_data[name])
+        if changed:
+            instance.save(update_fields=[*changed, "update_at"])
+        return instance
+
     def to_representation(self, instance):
         logger.debug(f"Serializing user with email: {instance.email}")
 
@@ -68,6 +81,18 @@ class RegisterSerializer(ModelSerializer):
             "password2",
             "token",
         )
+        extra_kwargs = {
+            # the unique constraint covers soft-deleted users too
+            "email": {
+                "validators": [
+                    UniqueValidator(
+                        queryset=CustomUser.all_objects.all(),
+                        message="User with this email already exists.",
+                    ),
+                ],
+            },
+        }
+
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         email = attrs.get("email", "")
         logger.debug(f"Validating registration for email: {email}")
@@ -88,7 +113,7 @@ class RegisterSerializer(ModelSerializer):
     def get_token(self, obj: CustomUser) -> str:
         # Implement token generation logic here, e.g., using
         # JWT or any other token generation method
-        refresh = RefreshToken.for_user(obj)
+        refresh = UserRefreshToken.for_user(obj)
         return {
             "refresh": str(refresh),
             "access": str(refresh.access_token),
@@ -116,7 +141,7 @@ class LoginSerializer(Serializer):
             logger.warning(f"Login failed for email: {email}")
             raise ValidationError("Invalid credentials or inactive account")
         logger.info(f"Login successful for email: {email}")
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         logger.debug(f"Generated tokens for email: {email}")
         attrs["user"] = user  # ✅ ДОБАВЬ
         attrs["refresh"] = str(refresh)
@@ -1,3 +1,212 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import threading
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.abstract.pool import BoundedPool
+from . import hashing
+from .authentication import UserRefreshToken
+from .models import CustomUser
+
+
+def make_user(name: str, **kwargs) -> CustomUser:
+    return CustomUser.objects.create_user(
+        email=f"{name}@example.com",
+        password="password123",
+        first_name=name,
+        last_name="Test",
+        **kwargs,
+    )
+
+
+class RegisterTests(TestCase):
+
+    def register(self, email: str):
+        return APIClient().post(
+            "/api/users/register/",
+            {
+                "email": email,
+                "first_name": "New",
+                "last_name": "User",
+                "password": "password123",
+                "password2": "password123",
+            },
+            format="json",
+        )
+
+    def test_register(self):
+        response = self.register("new@example.com")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(CustomUser.objects.filter(email="new@example.com").exists())
+
+    def test_email_of_live_user_is_rejected(self):
+        make_user("taken")
+        response = self.register("taken@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json())
+
+    def test_email_of_soft_deleted_user_is_rejected(self):
+        make_user("gone").delete()
+        self.assertFalse(CustomUser.objects.filter(email="gone@example.com").exists())
+
+        response = self.register("gone@example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["email"], ["User with this email already exists."])
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class AuthenticationTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = make_user("alice")
+        self.client = APIClient()
+        token = UserRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def me(self) -> int:
+        return self.client.get("/api/users/me/").status_code
+
+    def deactivate_silently(self) -> None:
+        # no signals: only a cached user can still authenticate afterwards
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+
+
+class ProcessLocalCacheAuthenticationTests(AuthenticationTestCase):
+
+    def test_user_loaded_per_request(self):
+        self.assertEqual(self.me(), 200)
+        self.deactivate_silently()
+        self.assertEqual(self.me(), 401)
+
+
+class SharedCacheAuthenticationTests(AuthenticationTestCase):
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": location,
+        }})
+        shared.enable()
+        self.addCleanup(shared.disable)
+        super().setUp()
+
+    def test_user_served_from_cache(self):
+        self.assertEqual(self.me(), 200)
+        self.deactivate_silently()
+        self.assertEqual(self.me(), 200)
+
+    def test_deactivation_invalidates(self):
+        self.assertEqual(self.me(), 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.me(), 401)
+
+    def test_soft_delete_invalidates(self):
+        self.assertEqual(self.me(), 200)
+        self.user.delete()
+        self.assertEqual(self.me(), 401)
+
+    def test_password_change_invalidates(self):
+        self.assertEqual(self.me(), 200)
+        self.user.set_password("another-password")
+        self.user.save()
+        self.deactivate_silently()
+        self.assertEqual(self.me(), 401)
+
+    def test_last_login_update_keeps_cache(self):
+        self.assertEqual(self.me(), 200)
+        self.user.save(update_fields=["last_login"])
+        self.deactivate_silently()
+        self.assertEqual(self.me(), 200)
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class ProfileUpdateTests(TestCase):
+
+    def setUp(self):
+        self.user = make_user("alice")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_update_bumps_update_at(self):
+        before = self.user.update_at
+        response = self.client.patch("/api/users/me/", {"first_name": "Alicia"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Alicia")
+        self.assertGreater(self.user.update_at, before)
+
+    def test_unchanged_update_keeps_update_at(self):
+        before = self.user.update_at
+        response = self.client.patch("/api/users/me/", {"first_name": "alice"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.update_at, before)
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class HashingPoolTests(TestCase):
+    """Login/register hash on the pool; a full pool is a 429, not an error elsewhere"""
+
+    def setUp(self):
+        self.user = make_user("alice")
+        self.client = APIClient()
+        # one slot, taken until the test releases it
+        pool = BoundedPool("hash", workers=1, max_queue=0, timeout=5)
+        self.release = threading.Event()
+        started = threading.Event()
+        self.holder = threading.Thread(target=pool.run, args=(lambda: (started.set(), self.release.wait(5)),))
+        self.holder.start()
+        started.wait(5)
+        previous, hashing._pool = hashing._pool, pool
+        self.addCleanup(setattr, hashing, "_pool", previous)
+        self.addCleanup(self.holder.join)
+        self.addCleanup(self.release.set)
+
+    def test_login_answers_429_when_pool_is_full(self):
+        response = self.client.post(
+            "/api/users/login/",
+            {"email": "alice@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_register_answers_429_and_creates_nobody(self):
+        response = self.client.post(
+            "/api/users/register/",
+            {
+                "email": "new@example.com",
+                "first_name": "New",
+                "last_name": "User",
+                "password": "password123",
+                "password2": "password123",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(CustomUser.all_objects.filter(email="new@example.com").exists())
+
+    def test_hashing_outside_the_views_is_inline(self):
+        # admin login, createsuperuser, changepassword
+        encoded = make_password("secret-password")
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$"))
+        self.assertTrue(check_password("secret-password", encoded))
+        self.assertEqual(hashing._pool.stats()["rejected"], 0)
+
+    def test_login_after_pool_frees_up(self):
+        self.release.set()
+        self.holder.join()
+        response = self.client.post(
+            "/api/users/login/",
+            {"email": "alice@example.com", "password": "password123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
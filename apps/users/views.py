@@ -1,4 +1,5 @@
 
+from functools import wraps
 from typing import Any
 import logging
 # Create your views here.
@@ -6,7 +7,7 @@ from rest_framework.viewsets import ViewSet
 
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_429_TOO_MANY_REQUESTS
 from rest_framework.request import Request
 from apps.users.serializers import (
     CustomUserSerializer,
@@ -18,12 +19,16 @@ from apps.users.serializers import (
     MessageResponseSerializer,
 )
 from apps.users.models import CustomUser
+from apps.abstract.search import directory_search
 from rest_framework_simplejwt.tokens import RefreshToken
+from apps.users.authentication import UserRefreshToken
+from apps.users.login_tracker import record_login
+from apps.users.hashing import pooled_hashing
+from apps.abstract.pool import PoolFull
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
-from django.db.models import Q
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from .permissions import IsOwnerOrAdmin
 from rest_framework import status
@@ -39,6 +44,23 @@ from rest_framework import serializers
 logger = logging.getLogger(__name__)
 
 
+def hashing_on_pool(view):
+    """Hash passwords on the bounded pool; a full pool answers 429 + Retry-After"""
+    @wraps(view)
+    def wrapper(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            with pooled_hashing():
+                return view(self, request, *args, **kwargs)
+        except PoolFull as error:
+            logger.warning("Password hashing busy: path=%s pool=%s", request.path, error.pool)
+            return Response(
+                {"error": "Server is busy, retry later."},
+                status=HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(error.retry_after)},
+            )
+    return wrapper
+
+
 
   
     
@@ -99,7 +121,7 @@ class AuthViewSet(ViewSet):
 
     @action(detail=False, methods=["post"], url_path="login")
     @method_decorator(ratelimit(key="ip", rate="5/m", block=True))
-
+    @hashing_on_pool
     def login(
         self,
         request: Request,
@@ -116,7 +138,8 @@ class AuthViewSet(ViewSet):
 
         if serializer.is_valid():
             user = serializer.validated_data["user"]
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
+            record_login(user.pk)
             logger.info(f"User logged in successfully with email: {user.email}")
             return Response(
                 {
@@ -161,6 +184,7 @@ class AuthViewSet(ViewSet):
 
     @action(detail=False, methods=["post"], url_path="register")
     @method_decorator(ratelimit(key="ip", rate="5/m", block=True))
+    @hashing_on_pool
     def register(
         self,
         request: Request,
@@ -343,11 +367,10 @@ class AuthViewSet(ViewSet):
             search = request.query_params.get("search")
             queryset = CustomUser.objects.all().order_by("id")
             if search:
-                queryset = queryset.filter(
-                    Q(email__icontains=search) |
-                    Q(first_name__icontains=search) |
-                    Q(last_name__icontains=search)
-                )   
+                # indexed directory search (apps.abstract.search)
+                queryset = directory_search(
+                    queryset, search, extra_fields=("last_name", "email")
+                )
             logger.info(f"User list requested by id {request.user.id} with email {request.user.email}")
             return Response(
                 CustomUserSerializer(queryset, many=True).data,
@@ -2,4 +2,14 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.env.local")
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# needs the app registry, so import after get_asgi_application()
+from apps.messages.realtime import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """HTTP goes to Django, WebSocket goes to the realtime message consumer"""
+    if scope["type"] == "websocket":
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -29,7 +29,18 @@ INSTALLED_APPS = [
 
 ]
 AUTH_USER_MODEL = "users.CustomUser"
+# pbkdf2_sha256 on a bounded pool (apps.users.hashing); it replaces Django's
+# PBKDF2PasswordHasher, which would otherwise win the algorithm lookup
+PASSWORD_HASHERS = [
+    "apps.users.hashing.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
 MIDDLEWARE = [
+    # first, so queries of the other middleware are counted too
+    "apps.abstract.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -102,6 +113,11 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": False,
         },
+        "apps.requests": {
+            "handlers": ["console", "file"],
+            "level": "INFO",
+            "propagate": False,
+        },
         "django.request": {
             "handlers": ["file", "debug_only"],
             "level": "WARNING",
@@ -169,7 +185,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # ── DRF ───────────────────────────────────────────────────────────────────────
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -179,6 +195,16 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
+    # orjson when installed, stdlib json otherwise (apps/abstract/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.abstract.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.abstract.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -16,3 +16,72 @@ DB_PORT = config("DB_PORT", default="")
 # ── JWT ───────────────────────────────────────────────────────────────────────
 JWT_ACCESS_TOKEN_LIFETIME_MINUTES = config("JWT_ACCESS_TOKEN_LIFETIME_MINUTES", default=60, cast=int)
 JWT_REFRESH_TOKEN_LIFETIME_DAYS = config("JWT_REFRESH_TOKEN_LIFETIME_DAYS", default=7, cast=int)
+# Seconds a resolved user stays cached per (user, token iat); any user save
+# invalidates it (apps.users.authentication). Only used with a shared cache
+# backend: without CACHES every request loads the user
+AUTH_USER_CACHE_TIMEOUT = config("AUTH_USER_CACHE_TIMEOUT", default=300, cast=int)
+# Trust signed token claims instead of loading the user on read-only actions
+# views opt into (stateless_auth_actions); user changes made in another
+# worker may take up to the access token lifetime to apply
+AUTH_STATELESS_READS = config("AUTH_STATELESS_READS", default=False, cast=bool)
+
+# ── Login tracking ────────────────────────────────────────────────────────────
+# last_login writes are buffered per worker and flushed in one bulk UPDATE
+# at most this often (seconds)...
+LOGIN_TRACKER_FLUSH_INTERVAL = config("LOGIN_TRACKER_FLUSH_INTERVAL", default=60, cast=int)
+# ...or as soon as this many users are pending
+LOGIN_TRACKER_MAX_PENDING = config("LOGIN_TRACKER_MAX_PENDING", default=1000, cast=int)
+
+# ── Password hashing ──────────────────────────────────────────────────────────
+# Threads per worker process that run password hashes (login/register)...
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+# ...hashes allowed to wait for one; past that login/register answer 429
+PASSWORD_HASH_MAX_QUEUE = config("PASSWORD_HASH_MAX_QUEUE", default=8, cast=int)
+# Seconds a request waits for its hash before giving up with 429
+PASSWORD_HASH_TIMEOUT = config("PASSWORD_HASH_TIMEOUT", default=10.0, cast=float)
+# Retry-After of those 429s (seconds)
+PASSWORD_HASH_RETRY_AFTER = config("PASSWORD_HASH_RETRY_AFTER", default=1, cast=int)
+
+# ── Request metrics ───────────────────────────────────────────────────────────
+# Server-Timing header with db/app/render/total durations on every response
+REQUEST_METRICS_SERVER_TIMING = config("REQUEST_METRICS_SERVER_TIMING", default=True, cast=bool)
+# Log a "Possible N+1" warning above this many queries per request...
+REQUEST_METRICS_QUERY_THRESHOLD = config("REQUEST_METRICS_QUERY_THRESHOLD", default=30, cast=int)
+# ...or when one parametrized statement runs more often than this
+REQUEST_METRICS_DUPLICATE_THRESHOLD = config("REQUEST_METRICS_DUPLICATE_THRESHOLD", default=10, cast=int)
+
+# ── Access cache ──────────────────────────────────────────────────────────────
+# Seconds a user's resolved team/channel access stays cached. Changes bump a
+# per-user version in the cache, so this is only an upper bound. Only used
+# with a shared cache backend: without CACHES access is loaded per request
+ACCESS_CACHE_TIMEOUT = config("ACCESS_CACHE_TIMEOUT", default=60, cast=int)
+
+# ── Realtime ──────────────────────────────────────────────────────────────────
+# Pub/sub transport between workers for WebSocket message events
+MESSAGES_BROKER_BACKEND = config(
+    "MESSAGES_BROKER_BACKEND",
+    default="apps.messages.realtime.broker.LocalBackend",
+)
+
+# ── Delta sync ────────────────────────────────────────────────────────────────
+# /api/messages/sync/ keeps its watermark this many seconds behind now: changes
+# younger than that are re-sent next time, so writes committing late (with an
+# older updated_at) are not skipped
+MESSAGES_SYNC_SETTLE_SECONDS = config("MESSAGES_SYNC_SETTLE_SECONDS", default=5, cast=int)
+
+# ── Bulk ingest ───────────────────────────────────────────────────────────────
+# Max messages accepted by POST /api/messages/bulk/
+MESSAGES_BULK_MAX_ITEMS = config("MESSAGES_BULK_MAX_ITEMS", default=500, cast=int)
+
+# ── Search ────────────────────────────────────────────────────────────────────
+# PostgreSQL text search configuration for message search (ignored on SQLite)
+MESSAGES_SEARCH_CONFIG = config("MESSAGES_SEARCH_CONFIG", default="english")
+
+# ── Archive ───────────────────────────────────────────────────────────────────
+# purge_archive: soft-deleted rows older than this are moved to archive tables
+ARCHIVE_SOFT_DELETED_AFTER_DAYS = config("ARCHIVE_SOFT_DELETED_AFTER_DAYS", default=30, cast=int)
+# Threads untouched for this many days are moved to the message archive
+# (Team.message_retention_days overrides it per team; 0 - never)
+MESSAGES_ARCHIVE_AFTER_DAYS = config("MESSAGES_ARCHIVE_AFTER_DAYS", default=365, cast=int)
+# Rows archived per transaction
+ARCHIVE_BATCH_SIZE = config("ARCHIVE_BATCH_SIZE", default=500, cast=int)
@@ -26,10 +26,12 @@ urlpatterns = [
 ]
 # Добавь это в конец файла:
 if settings.DEBUG:
-    import debug_toolbar
-    urlpatterns = [
-        path('__debug__/', include(debug_toolbar.urls)),
-    ] + urlpatterns
+    # debug_toolbar is optional (see the commented block in settings/base.py)
+    if "debug_toolbar" in settings.INSTALLED_APPS:
+        import debug_toolbar
+        urlpatterns = [
+            path('__debug__/', include(debug_toolbar.urls)),
+        ] + urlpatterns
     
     urlpatterns += static(
         settings.MEDIA_URL,